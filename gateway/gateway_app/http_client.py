@@ -1,5 +1,19 @@
 """Re-export from backend_common for backwards compatibility."""
 
-from backend_common.http_client import ServiceClient, ServiceResponse
+from backend_common.http_client import (
+    ServiceClient,
+    ServiceResponse,
+    borrow_http_client,
+    close_http_clients,
+    get_http_client,
+    get_http_client_for_url,
+)
 
-__all__ = ["ServiceClient", "ServiceResponse"]
+__all__ = [
+    "ServiceClient",
+    "ServiceResponse",
+    "borrow_http_client",
+    "close_http_clients",
+    "get_http_client",
+    "get_http_client_for_url",
+]
@@ -1,5 +1,6 @@
 import asyncio
 import base64
+import hashlib
 import json
 import os
 import time
@@ -14,8 +15,11 @@ from backend_common.fastapi_app import (
     configure_cors_from_env,
     instrument_with_metrics,
 )
+from backend_common.http_client import close_http_clients, get_http_client_for_url
+from backend_common.singleflight import SingleFlight
 from fastapi import FastAPI, HTTPException, Request, Response, status
 from fastapi.responses import HTMLResponse, JSONResponse
+from prometheus_client import Counter
 from redis.asyncio import Redis
 from sentry_sdk import set_tag, set_user
 from starlette.middleware.base import BaseHTTPMiddleware
@@ -171,21 +175,23 @@ def _forward_headers(request: Request) -> dict[str, str]:
 async def _proxy_request(request: Request, target_url: str, headers: dict[str, str]) -> Response:
     """Proxy HTTP request to a backend service and return the response."""
     timeout = httpx.Timeout(connect=_DEFAULT_CONNECT_TIMEOUT, read=_DEFAULT_PROXY_TIMEOUT, write=30.0, pool=30.0)
-    async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
-        body = await request.body()
-        response = await client.request(
-            method=request.method,
-            url=target_url,
-            headers=headers,
-            content=body if body else None,
-            params=request.query_params,
-        )
-        return Response(
-            content=response.content,
-            status_code=response.status_code,
-            headers=dict(response.headers),
-            media_type=response.headers.get("content-type"),
-        )
+    client = get_http_client_for_url(target_url)
+    body = await request.body()
+    response = await client.request(
+        method=request.method,
+        url=target_url,
+        headers=headers,
+        content=body if body else None,
+        params=request.query_params,
+        timeout=timeout,
+        follow_redirects=True,
+    )
+    return Response(
+        content=response.content,
+        status_code=response.status_code,
+        headers=dict(response.headers),
+        media_type=response.headers.get("content-type"),
+    )
 
 
 def _forward_messenger_headers(request: Request) -> dict[str, str]:
@@ -225,6 +231,101 @@ _PUBLIC_PATHS = {
 }
 _INTERNAL_GATEWAY_SECRET = (os.getenv("INTERNAL_GATEWAY_SECRET") or "").strip()
 
+_TOKEN_CACHE_MAX_KEYS = int(os.getenv("GATEWAY_TOKEN_CACHE_MAX_KEYS", "10000"))
+_TOKEN_CACHE_TTL_SECONDS = float(os.getenv("GATEWAY_TOKEN_CACHE_TTL_SECONDS", "3600"))
+_TOKEN_REVOCATION_CHECK_SECONDS = float(os.getenv("GATEWAY_TOKEN_REVOCATION_CHECK_SECONDS", "300"))
+
+TOKEN_CACHE_HITS_TOTAL = Counter(
+    "gateway_auth_token_cache_hits_total",
+    "Authenticated requests served from the verified ID token cache",
+)
+TOKEN_CACHE_MISSES_TOTAL = Counter(
+    "gateway_auth_token_cache_misses_total",
+    "Authenticated requests that verified the ID token with Firebase",
+)
+
+
+class _VerifiedTokenCache:
+    """
+    Decoded Firebase ID tokens keyed by a hash of the token.
+
+    An entry lives until the token's ``exp`` (capped by ``ttl_seconds``). When revocation checks are
+    on, it is also dropped ``revocation_check_seconds`` after the last verification so that revoked
+    sessions are re-checked against Firebase within that interval.
+    """
+
+    def __init__(self, max_keys: int, ttl_seconds: float, revocation_check_seconds: float) -> None:
+        self._data: OrderedDict[str, tuple[dict, float]] = OrderedDict()
+        self._max_keys = max_keys
+        self._ttl_seconds = ttl_seconds
+        self._revocation_check_seconds = revocation_check_seconds
+
+    @staticmethod
+    def key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, now: float) -> dict | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        decoded, expires_at = entry
+        if expires_at <= now:
+            self._data.pop(key, None)
+            return None
+        self._data.move_to_end(key)
+        return decoded
+
+    def set(self, key: str, decoded: dict, now: float, check_revoked: bool) -> None:
+        expires_at = now + self._ttl_seconds
+        if check_revoked:
+            expires_at = min(expires_at, now + self._revocation_check_seconds)
+        exp = decoded.get("exp")
+        if isinstance(exp, int | float):
+            expires_at = min(expires_at, float(exp))
+        if expires_at <= now or self._max_keys <= 0:
+            return
+        self._data[key] = (decoded, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self._max_keys:
+            self._data.popitem(last=False)
+
+    def pop(self, key: str) -> None:
+        """Evict a token that failed verification or whose claims were rejected."""
+        self._data.pop(key, None)
+
+
+_token_cache = _VerifiedTokenCache(_TOKEN_CACHE_MAX_KEYS, _TOKEN_CACHE_TTL_SECONDS, _TOKEN_REVOCATION_CHECK_SECONDS)
+# Concurrent requests carrying the same uncached token share one verification.
+_token_verify_flight = SingleFlight()
+
+
+async def _verify_id_token(token: str) -> dict:
+    key = _token_cache.key(token)
+    decoded = _token_cache.get(key, time.time())
+    if decoded is not None:
+        TOKEN_CACHE_HITS_TOTAL.inc()
+        return decoded
+    TOKEN_CACHE_MISSES_TOTAL.inc()
+
+    async def verify() -> dict:
+        if _FIREBASE_APP is None:
+            _initialize_firebase_app()
+        check_revoked = _FIREBASE_CHECK_REVOKED
+        # verify_id_token blocks (key fetch, revocation lookup), so it runs off the event loop.
+        try:
+            result = await asyncio.to_thread(
+                auth.verify_id_token, token, check_revoked=check_revoked, app=_FIREBASE_APP
+            )
+        except Exception:
+            # Revoked, expired or otherwise rejected: make sure no earlier decode of this token survives.
+            _token_cache.pop(key)
+            raise
+        _token_cache.set(key, result, time.time(), check_revoked)
+        return result
+
+    return await _token_verify_flight.do(key, verify)
+
+
 _RATE_LIMIT_ENABLED = (os.getenv("GATEWAY_RATE_LIMIT_ENABLED") or "true").strip().lower() in {
     "1",
     "true",
@@ -410,10 +511,7 @@ class FirebaseAuthMiddleware(BaseHTTPMiddleware):
             logger.info("empty_bearer_token", path=path, method=method)
             return JSONResponse(status_code=status.HTTP_401_UNAUTHORIZED, content={"detail": "Not authenticated"})
         try:
-            if _FIREBASE_APP is None:
-                _initialize_firebase_app()
-            check_revoked = _FIREBASE_CHECK_REVOKED
-            decoded = auth.verify_id_token(token, check_revoked=check_revoked, app=_FIREBASE_APP)
+            decoded = await _verify_id_token(token)
         except auth.RevokedIdTokenError:  # type: ignore[attr-defined]
             logger.info("firebase_token_revoked", path=path, method=method)
             return JSONResponse(status_code=status.HTTP_403_FORBIDDEN, content={"detail": "Token revoked"})
@@ -443,6 +541,7 @@ class FirebaseAuthMiddleware(BaseHTTPMiddleware):
             )
         if not decoded.get("uid"):
             logger.info("missing_uid_in_token", path=path, method=method)
+            _token_cache.pop(_token_cache.key(token))
             return JSONResponse(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 content={"detail": "Invalid authentication credentials"},
@@ -452,12 +551,14 @@ class FirebaseAuthMiddleware(BaseHTTPMiddleware):
             f"project-{_FIREBASE_AUDIENCE}",
         }:
             logger.info("firebase_token_audience_mismatch", path=path, method=method)
+            _token_cache.pop(_token_cache.key(token))
             return JSONResponse(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 content={"detail": "Invalid authentication credentials"},
             )
         if _FIREBASE_ISSUER and decoded.get("iss") != _FIREBASE_ISSUER:
             logger.info("firebase_token_issuer_mismatch", path=path, method=method)
+            _token_cache.pop(_token_cache.key(token))
             return JSONResponse(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 content={"detail": "Invalid authentication credentials"},
@@ -502,23 +603,23 @@ async def upstreams_health(request: Request) -> dict:
     }
     timeout = httpx.Timeout(connect=5.0, read=5.0, write=5.0, pool=5.0)
     results: dict[str, dict] = {}
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        for name, base in services.items():
-            if not base:
-                results[name] = {"ok": False, "error": "not_configured"}
-                continue
-            url = f"{base}/health"
-            try:
-                r = await client.get(url, headers=headers, follow_redirects=True)
-                ok = 200 <= r.status_code < 300
-                results[name] = {
-                    "ok": ok,
-                    "status": r.status_code,
-                    "body": (r.text[:200] if not ok else "ok"),
-                    "url": url,
-                }
-            except Exception as exc:
-                results[name] = {"ok": False, "error": type(exc).__name__, "url": url}
+    for name, base in services.items():
+        if not base:
+            results[name] = {"ok": False, "error": "not_configured"}
+            continue
+        url = f"{base}/health"
+        try:
+            client = get_http_client_for_url(url)
+            r = await client.get(url, headers=headers, timeout=timeout, follow_redirects=True)
+            ok = 200 <= r.status_code < 300
+            results[name] = {
+                "ok": ok,
+                "status": r.status_code,
+                "body": (r.text[:200] if not ok else "ok"),
+                "url": url,
+            }
+        except Exception as exc:
+            results[name] = {"ok": False, "error": type(exc).__name__, "url": url}
     return {"services": results}
 
 
@@ -646,30 +747,33 @@ async def stripe_connect_refresh_page() -> HTMLResponse:
 
 async def fetch_service_spec(url: str) -> dict:
     timeout = httpx.Timeout(connect=5.0, read=10.0, write=10.0, pool=10.0)
-    async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
-        for attempt in range(10):
-            try:
-                r = await client.get(f"{url}/openapi.json", headers={"Accept": "application/json"})
-                if r.status_code == 200:
-                    return r.json()
-                body_preview = r.text[:200] if r.text else ""
-                logger.warning(
-                    "openapi_fetch_non_200",
-                    attempt=attempt + 1,
-                    url=url,
-                    status_code=r.status_code,
-                    body_preview=body_preview,
-                )
-            except Exception as exc:
-                logger.warning(
-                    "openapi_fetch_error",
-                    attempt=attempt + 1,
-                    url=url,
-                    error=str(exc),
-                )
-            await asyncio.sleep(2)
-        logger.error("openapi_fetch_failed", url=url, attempts=attempt + 1)
-        return {}
+    spec_url = f"{url}/openapi.json"
+    client = get_http_client_for_url(spec_url)
+    for attempt in range(10):
+        try:
+            r = await client.get(
+                spec_url, headers={"Accept": "application/json"}, timeout=timeout, follow_redirects=True
+            )
+            if r.status_code == 200:
+                return r.json()
+            body_preview = r.text[:200] if r.text else ""
+            logger.warning(
+                "openapi_fetch_non_200",
+                attempt=attempt + 1,
+                url=url,
+                status_code=r.status_code,
+                body_preview=body_preview,
+            )
+        except Exception as exc:
+            logger.warning(
+                "openapi_fetch_error",
+                attempt=attempt + 1,
+                url=url,
+                error=str(exc),
+            )
+        await asyncio.sleep(2)
+    logger.error("openapi_fetch_failed", url=url, attempts=attempt + 1)
+    return {}
 
 
 def merge_openapi_schemas(specs: list[dict], services: dict) -> dict:
@@ -713,6 +817,11 @@ def merge_openapi_schemas(specs: list[dict], services: dict) -> dict:
     return merged
 
 
+@app.on_event("shutdown")
+async def close_downstream_clients() -> None:
+    await close_http_clients()
+
+
 @app.on_event("startup")
 async def aggregate_openapi():
     fetch_on_start = os.getenv("FETCH_OPENAPI_ON_STARTUP", "false").strip().lower() in {
@@ -795,8 +904,8 @@ async def apply_profile_photo(request: Request) -> JSONResponse:
             write=_DEFAULT_PROXY_TIMEOUT,
             pool=_DEFAULT_PROXY_TIMEOUT,
         )
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            r = await client.post(target_url, headers=headers, content=data, follow_redirects=True)
+        client = get_http_client_for_url(target_url)
+        r = await client.post(target_url, headers=headers, content=data, timeout=timeout, follow_redirects=True)
     except httpx.RequestError:
         raise HTTPException(status_code=502, detail="Failed to store avatar")
     if r.status_code >= 400:
@@ -820,8 +929,10 @@ async def apply_profile_photo(request: Request) -> JSONResponse:
             profile_headers = dict(headers)
             profile_headers["Content-Type"] = "application/json"
             payload = json.dumps({"photo_url": photo_url})
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                await client.patch(profile_url, headers=profile_headers, content=payload, follow_redirects=True)
+            client = get_http_client_for_url(profile_url)
+            await client.patch(
+                profile_url, headers=profile_headers, content=payload, timeout=timeout, follow_redirects=True
+            )
     except Exception as e:
         logger.warning("avatar_update_profile_patch_failed", error=str(e))
 
@@ -863,8 +974,8 @@ async def _fetch_target_profile(user_id: str) -> dict:
     if not ACCOUNTS_SERVICE_URL:
         raise HTTPException(status_code=503, detail="Accounts service unavailable")
     target_url = f"{ACCOUNTS_SERVICE_URL}/profile/{user_id}"
-    async with httpx.AsyncClient(timeout=_DEFAULT_PROXY_TIMEOUT, follow_redirects=True) as client:
-        resp = await client.get(target_url)
+    client = get_http_client_for_url(target_url)
+    resp = await client.get(target_url, timeout=_DEFAULT_PROXY_TIMEOUT, follow_redirects=True)
     if resp.status_code == 404:
         raise HTTPException(status_code=404, detail="User profile not found")
     if resp.status_code >= 400:
@@ -54,7 +54,7 @@ async def get_profile_aggregates(
     headers_for_analytics["X-User-Id"] = target_uid
     params = {"weeks": weeks, "limit": limit}
 
-    async with ServiceClient(timeout=45.0) as client:
+    async with ServiceClient(timeout=45.0, service="workouts") as client:
         resp = await client.get(
             analytics_url,
             headers=headers_for_analytics,
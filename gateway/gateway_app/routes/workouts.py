@@ -10,7 +10,7 @@ from fastapi.responses import JSONResponse
 
 from gateway_app import main as gateway_main  # type: ignore
 from gateway_app import schemas
-from gateway_app.http_client import ServiceClient
+from gateway_app.http_client import ServiceClient, borrow_http_client
 
 workouts_router = APIRouter(prefix="/api/v1/workouts")
 workout_metrics_router = APIRouter(prefix="/api/v1")
@@ -62,7 +62,7 @@ async def _derive_exercise_instances_from_plan(
         return []
 
     plan_url = f"{gateway_main.PLANS_SERVICE_URL}/plans/applied-plans/{applied_plan_id}"
-    async with ServiceClient() as client:
+    async with ServiceClient(service="plans") as client:
         plan = await client.get_json(
             plan_url,
             headers=headers,
@@ -144,7 +144,7 @@ async def _assemble_workout_for_client(
 ) -> dict:
     instances_url = f"{gateway_main.EXERCISES_SERVICE_URL}/exercises/instances/workouts/{workout_id}/instances"
     gateway_main.logger.debug("instances_fetch_start", url=instances_url)
-    async with ServiceClient() as client:
+    async with ServiceClient(service="exercises") as client:
         instances_data = await client.get_json(
             instances_url,
             headers=headers,
@@ -211,7 +211,7 @@ async def _assemble_workout_for_client(
         if ids:
             q = ",".join(str(i) for i in sorted(set(ids)))
             defs_url = f"{gateway_main.EXERCISES_SERVICE_URL}/exercises/definitions"
-            async with ServiceClient() as client:
+            async with ServiceClient(service="exercises") as client:
                 defs_list = await client.get_json(
                     defs_url,
                     headers=headers,
@@ -234,7 +234,7 @@ async def create_workout(workout_data: schemas.WorkoutCreateWithExercises, reque
 
     try:
         workout_url = f"{gateway_main.WORKOUTS_SERVICE_URL}/workouts/"
-        async with httpx.AsyncClient() as client:
+        async with borrow_http_client("workouts") as client:
             workout_payload = workout_data.model_dump_json(exclude={"exercise_instances"})
             workout_resp = await client.post(workout_url, content=workout_payload, headers=headers)
             workout_resp.raise_for_status()
@@ -270,7 +270,7 @@ async def create_workout(workout_data: schemas.WorkoutCreateWithExercises, reque
         return JSONResponse(content=workout, status_code=201)
     except httpx.HTTPStatusError as e:
         if "workout_id" in locals():
-            async with httpx.AsyncClient() as cleanup_client:
+            async with borrow_http_client("workouts") as cleanup_client:
                 await cleanup_client.delete(f"{workout_url}{workout_id}/", headers=headers)
         return JSONResponse(content={"detail": str(e)}, status_code=e.response.status_code)
 
@@ -287,7 +287,7 @@ async def get_workout(workout_id: int, request: Request):
     headers = gateway_main._forward_headers(request)
 
     workout_url = f"{gateway_main.WORKOUTS_SERVICE_URL}/workouts/{workout_id}"
-    async with httpx.AsyncClient() as client:
+    async with borrow_http_client("workouts") as client:
         workout_res = await client.get(workout_url, headers=headers)
         gateway_main.logger.debug(
             "workout_fetch_response",
@@ -363,7 +363,7 @@ async def get_next_workout_in_plan(workout_id: int, request: Request):
     headers = gateway_main._forward_headers(request)
 
     next_url = f"{gateway_main.WORKOUTS_SERVICE_URL}/workouts/{workout_id}/next"
-    async with httpx.AsyncClient() as client:
+    async with borrow_http_client("workouts") as client:
         next_res = await client.get(next_url, headers=headers)
         gateway_main.logger.debug(
             "next_workout_fetch_response",
@@ -378,7 +378,7 @@ async def get_next_workout_in_plan(workout_id: int, request: Request):
 
     instances_data = []
     instances_url = f"{gateway_main.EXERCISES_SERVICE_URL}/exercises/instances/workouts/{next_id}/instances"
-    async with httpx.AsyncClient() as client:
+    async with borrow_http_client("exercises") as client:
         instances_res = await client.get(instances_url, headers=headers, follow_redirects=True)
         gateway_main.logger.debug(
             "next_instances_fetch_response",
@@ -464,7 +464,7 @@ async def update_workout(workout_id: int, request: Request):
     target_url = f"{gateway_main.WORKOUTS_SERVICE_URL}/workouts/{workout_id}"
     body = await request.body()
 
-    async with httpx.AsyncClient() as client:
+    async with borrow_http_client("workouts") as client:
         workout_res = await client.put(target_url, headers=headers, content=body)
         gateway_main.logger.debug(
             "workout_update_response",
@@ -496,7 +496,7 @@ async def start_workout(workout_id: int, request: Request):
 
     body = await request.body()
     session_url = f"{gateway_main.WORKOUTS_SERVICE_URL}/workouts/sessions/{workout_id}/start"
-    async with httpx.AsyncClient() as client:
+    async with borrow_http_client("workouts") as client:
         session_res = await client.post(session_url, headers=headers, content=body)
         gateway_main.logger.debug("session_start_response", workout_id=workout_id, status_code=session_res.status_code)
         if session_res.status_code not in (200, 201):
@@ -508,7 +508,7 @@ async def start_workout(workout_id: int, request: Request):
         if isinstance(session_data, dict) and session_data.get("started_at"):
             put_payload["started_at"] = session_data["started_at"]
         workout_put_url = f"{gateway_main.WORKOUTS_SERVICE_URL}/workouts/{workout_id}"
-        async with httpx.AsyncClient() as client:
+        async with borrow_http_client("workouts") as client:
             put_res = await client.put(workout_put_url, headers=headers, json=put_payload)
             gateway_main.logger.debug(
                 "workout_update_after_start",
@@ -519,7 +519,7 @@ async def start_workout(workout_id: int, request: Request):
     except httpx.HTTPError:
         gateway_main.logger.error("Failed to update workout status after start", exc_info=True, workout_id=workout_id)
 
-    async with httpx.AsyncClient() as client:
+    async with borrow_http_client("workouts") as client:
         workout_res = await client.get(f"{gateway_main.WORKOUTS_SERVICE_URL}/workouts/{workout_id}", headers=headers)
         if workout_res.status_code != 200:
             return JSONResponse(content=workout_res.json(), status_code=workout_res.status_code)
@@ -546,7 +546,7 @@ async def finish_workout(workout_id: int, request: Request):
     headers = gateway_main._forward_headers(request)
     include = _parse_include_expand(request)
 
-    async with httpx.AsyncClient() as client:
+    async with borrow_http_client("workouts") as client:
         active_res = await client.get(
             f"{gateway_main.WORKOUTS_SERVICE_URL}/workouts/sessions/{workout_id}/active",
             headers=headers,
@@ -572,7 +572,7 @@ async def finish_workout(workout_id: int, request: Request):
         session_id = active.get("id")
 
     body = await request.body()
-    async with httpx.AsyncClient() as client:
+    async with borrow_http_client("workouts") as client:
         finish_res = await client.post(
             f"{gateway_main.WORKOUTS_SERVICE_URL}/workouts/sessions/{session_id}/finish",
             headers=headers,
@@ -592,7 +592,7 @@ async def finish_workout(workout_id: int, request: Request):
             if finish_data.get("duration_seconds") is not None:
                 put_payload["duration_seconds"] = finish_data["duration_seconds"]
         workout_put_url = f"{gateway_main.WORKOUTS_SERVICE_URL}/workouts/{workout_id}"
-        async with httpx.AsyncClient() as client:
+        async with borrow_http_client("workouts") as client:
             put_res = await client.put(workout_put_url, headers=headers, json=put_payload)
             gateway_main.logger.debug(
                 "workout_update_after_finish",
@@ -609,7 +609,7 @@ async def finish_workout(workout_id: int, request: Request):
     except Exception:
         gateway_main.logger.error("Failed to invalidate profile cache for user", exc_info=True)
 
-    async with httpx.AsyncClient() as client:
+    async with borrow_http_client("workouts") as client:
         workout_res = await client.get(f"{gateway_main.WORKOUTS_SERVICE_URL}/workouts/{workout_id}", headers=headers)
         if workout_res.status_code != 200:
             return JSONResponse(content=workout_res.json(), status_code=workout_res.status_code)
@@ -694,7 +694,7 @@ async def get_workout_metrics(
     if isinstance(plan_id, int):
         list_params["applied_plan_id"] = plan_id
 
-    async with ServiceClient(timeout=20.0) as client:
+    async with ServiceClient(timeout=20.0, service="workouts") as client:
         workouts_summary = await client.get_json(
             f"{gateway_main.WORKOUTS_SERVICE_URL}/workouts/",
             headers=headers,
@@ -717,30 +717,45 @@ async def get_workout_metrics(
     details: dict[int, dict] = {}
     instances_by_workout: dict[int, list[dict]] = {}
 
-    async def fetch_detail(wid: int) -> None:
-        async with ServiceClient(timeout=20.0) as client:
-            data = await client.get_json(
-                f"{gateway_main.WORKOUTS_SERVICE_URL}/workouts/{wid}",
+    async def fetch_details() -> None:
+        if not workout_ids:
+            return
+        async with ServiceClient(timeout=20.0, service="workouts") as client:
+            resp = await client.post(
+                f"{gateway_main.WORKOUTS_SERVICE_URL}/workouts/by-ids",
                 headers=headers,
-                default=None,
-                workout_id=wid,
+                json={
+                    "ids": workout_ids,
+                    "fields": ["exercises", "completed_at", "started_at", "scheduled_for", "rpe_session"],
+                },
+                expected_status=200,
+                workouts_count=len(workout_ids),
             )
-        if data is not None:
-            details[wid] = data
-
-    async def fetch_instances(wid: int) -> None:
-        async with ServiceClient(timeout=20.0) as client:
-            data = await client.get_json(
-                f"{gateway_main.EXERCISES_SERVICE_URL}/exercises/instances/workouts/{wid}/instances",
+        data = resp.json_or([])
+        if not isinstance(data, list):
+            return
+        for item in data:
+            if isinstance(item, dict) and isinstance(item.get("id"), int):
+                details[item["id"]] = item
+
+    async def fetch_instances() -> None:
+        if not workout_ids:
+            return
+        async with ServiceClient(timeout=20.0, service="exercises") as client:
+            resp = await client.post(
+                f"{gateway_main.EXERCISES_SERVICE_URL}/exercises/instances/by-workouts",
                 headers=headers,
-                default=None,
-                workout_id=wid,
+                json={"workout_ids": workout_ids},
+                expected_status=200,
             )
-        if isinstance(data, list):
-            instances_by_workout[wid] = data
+        grouped = resp.json_or({})
+        if not isinstance(grouped, dict):
+            return
+        for wid, data in grouped.items():
+            if isinstance(data, list):
+                instances_by_workout[int(wid)] = data
 
-    await asyncio.gather(*[fetch_detail(wid) for wid in workout_ids])
-    await asyncio.gather(*[fetch_instances(wid) for wid in workout_ids])
+    await asyncio.gather(fetch_details(), fetch_instances())
 
     exercise_ids: set[int] = set()
     for d in details.values():
@@ -758,7 +773,7 @@ async def get_workout_metrics(
     equipment_by_ex_id: dict[int, str] = {}
     if exercise_ids:
         ids_query = ",".join(str(i) for i in sorted(exercise_ids))
-        async with ServiceClient(timeout=20.0) as client:
+        async with ServiceClient(timeout=20.0, service="exercises") as client:
             defs = await client.get_json(
                 f"{gateway_main.EXERCISES_SERVICE_URL}/exercises/definitions",
                 headers=headers,
@@ -856,7 +871,7 @@ async def get_workout_metrics(
 
     one_rm_series: list[dict] = []
     if mx == "1rm" or my == "1rm":
-        async with ServiceClient(timeout=20.0) as client:
+        async with ServiceClient(timeout=20.0, service="user-max") as client:
             data = await client.get_json(
                 f"{gateway_main.USER_MAX_SERVICE_URL}/user-max/",
                 headers=headers,
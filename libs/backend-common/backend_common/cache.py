@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import json
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Mapping, Sequence
 from dataclasses import dataclass
 from typing import Any
 
@@ -81,3 +81,48 @@ class CacheHelper:
         except Exception:
             self._metrics.inc_error()
             logger.warning("cache_set_failed", key=key, exc_info=True)
+
+    async def get_many(self, keys: Sequence[str]) -> list[dict | list | None]:
+        """Get several values with one MGET. Misses and errors yield None at their position."""
+        if not keys:
+            return []
+        redis = await self._get_redis()
+        if not redis:
+            return [None] * len(keys)
+        try:
+            raw_values = await redis.mget(list(keys))
+        except Exception:
+            self._metrics.inc_error()
+            logger.warning("cache_mget_failed", keys_count=len(keys), exc_info=True)
+            return [None] * len(keys)
+
+        results: list[dict | list | None] = []
+        for key, raw in zip(keys, raw_values, strict=True):
+            if raw is None:
+                self._metrics.inc_miss()
+                results.append(None)
+                continue
+            try:
+                results.append(json.loads(raw))
+                self._metrics.inc_hit()
+            except ValueError:
+                self._metrics.inc_error()
+                logger.warning("cache_decode_failed", key=key)
+                results.append(None)
+        return results
+
+    async def set_many(self, items: Mapping[str, dict | list], ttl: int | None = None) -> None:
+        """Set several values with TTL in one pipelined round trip."""
+        if not items:
+            return
+        redis = await self._get_redis()
+        if not redis:
+            return
+        try:
+            pipe = redis.pipeline(transaction=False)
+            for key, data in items.items():
+                pipe.set(key, json.dumps(data), ex=ttl or self._default_ttl)
+            await pipe.execute()
+        except Exception:
+            self._metrics.inc_error()
+            logger.warning("cache_set_many_failed", keys_count=len(items), exc_info=True)
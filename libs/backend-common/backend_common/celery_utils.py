@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import asyncio
+import threading
+from collections.abc import Coroutine
 from typing import Any, TypeVar
 
 import structlog
@@ -10,6 +13,23 @@ TStatusModel = TypeVar("TStatusModel")
 
 logger = structlog.get_logger(__name__)
 
+_task_loops = threading.local()
+
+
+def run_async[T](coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run ``coro`` on the calling worker thread's long-lived event loop.
+
+    ``asyncio.run`` creates and closes a loop per task, so loop-bound resources such as the pooled
+    HTTP clients could never be reused by the next task; one loop per thread keeps them alive.
+    """
+    loop = getattr(_task_loops, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        _task_loops.loop = loop
+    asyncio.set_event_loop(loop)
+    return loop.run_until_complete(coro)
+
 
 def enqueue_task(
     task_fn,
@@ -0,0 +1,184 @@
+"""
+Shared, versioned replica of the exercise catalog (exercise definitions).
+
+exercises-service is the only writer: it keeps every definition in one Redis hash
+(``id -> JSON``), bumps a version key on each change and publishes a notification. Consumers
+hold an in-memory copy indexed by id and reload it only when the version moves, so name and
+metadata lookups are plain dict reads.
+
+Usage (publisher):
+    await publish_catalog(redis, [definition.model_dump(mode="json") for definition in definitions])
+    await publish_catalog_changes(redis, upserts=[updated], deleted_ids=[removed_id])
+
+Usage (consumer):
+    catalog = ExerciseCatalogReplica(get_redis)
+    await catalog.start()          # on startup: initial load + change listener
+    catalog.name(exercise_id)      # sync, O(1)
+    await catalog.stop()           # on shutdown
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import uuid
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+CATALOG_ITEMS_KEY = "exercises:catalog:items"
+CATALOG_VERSION_KEY = "exercises:catalog:version"
+CATALOG_CHANNEL = "exercises:catalog:changed"
+
+
+async def publish_catalog(redis: Any, definitions: Iterable[Mapping[str, Any]]) -> int:
+    """Replace the whole catalog atomically and notify consumers; returns the new version."""
+    mapping = {str(d["id"]): json.dumps(dict(d)) for d in definitions if d.get("id") is not None}
+    staging_key = f"{CATALOG_ITEMS_KEY}:staging:{uuid.uuid4().hex}"
+    if mapping:
+        await redis.hset(staging_key, mapping=mapping)
+    async with redis.pipeline(transaction=True) as pipe:
+        if mapping:
+            pipe.rename(staging_key, CATALOG_ITEMS_KEY)
+        else:
+            pipe.delete(CATALOG_ITEMS_KEY)
+        pipe.incr(CATALOG_VERSION_KEY)
+        _, version = await pipe.execute()
+    await redis.publish(CATALOG_CHANNEL, str(version))
+    logger.info("exercise_catalog_published", version=version, definitions=len(mapping))
+    return int(version)
+
+
+async def publish_catalog_changes(
+    redis: Any,
+    upserts: Iterable[Mapping[str, Any]] = (),
+    deleted_ids: Iterable[int] = (),
+) -> int | None:
+    """Apply changed/removed definitions to the catalog and notify consumers."""
+    mapping = {str(d["id"]): json.dumps(dict(d)) for d in upserts if d.get("id") is not None}
+    removed = [str(int(i)) for i in deleted_ids if i is not None]
+    if not mapping and not removed:
+        return None
+    async with redis.pipeline(transaction=True) as pipe:
+        if mapping:
+            pipe.hset(CATALOG_ITEMS_KEY, mapping=mapping)
+        if removed:
+            pipe.hdel(CATALOG_ITEMS_KEY, *removed)
+        pipe.incr(CATALOG_VERSION_KEY)
+        results = await pipe.execute()
+    version = int(results[-1])
+    await redis.publish(CATALOG_CHANNEL, str(version))
+    return version
+
+
+class ExerciseCatalogReplica:
+    """
+    In-process copy of the exercise catalog, refreshed only when the published version changes.
+
+    Lookups never touch Redis. ``refresh`` costs one ``GET`` when nothing changed; the background
+    listener started by ``start`` reacts to change notifications and re-checks the version every
+    ``poll_interval`` seconds in case a notification was missed.
+    """
+
+    def __init__(
+        self,
+        get_redis: Callable[[], Awaitable[Any]],
+        poll_interval: float = 30.0,
+    ) -> None:
+        self._get_redis = get_redis
+        self._poll_interval = poll_interval
+        self._items: dict[int, dict[str, Any]] = {}
+        self._values: list[dict[str, Any]] = []
+        self._version: int | None = None
+        self._task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._version is not None
+
+    @property
+    def version(self) -> int | None:
+        return self._version
+
+    def get(self, exercise_id: int) -> dict[str, Any] | None:
+        return self._items.get(exercise_id)
+
+    def name(self, exercise_id: int) -> str | None:
+        item = self._items.get(exercise_id)
+        return item.get("name") if item else None
+
+    def values(self) -> list[dict[str, Any]]:
+        return self._values
+
+    async def refresh(self) -> bool:
+        """Reload the snapshot if the published version differs; returns True when it reloaded."""
+        redis = await self._get_redis()
+        if redis is None:
+            return False
+        async with self._lock:
+            try:
+                raw_version = await redis.get(CATALOG_VERSION_KEY)
+                if raw_version is None or int(raw_version) == self._version:
+                    return False
+                async with redis.pipeline(transaction=True) as pipe:
+                    pipe.get(CATALOG_VERSION_KEY)
+                    pipe.hgetall(CATALOG_ITEMS_KEY)
+                    raw_version, raw_items = await pipe.execute()
+            except Exception:
+                logger.warning("exercise_catalog_refresh_failed", exc_info=True)
+                return False
+            items: dict[int, dict[str, Any]] = {}
+            for key, value in (raw_items or {}).items():
+                try:
+                    items[int(key)] = json.loads(value)
+                except (TypeError, ValueError):
+                    continue
+            self._items = items
+            self._values = list(items.values())
+            self._version = int(raw_version) if raw_version is not None else None
+        logger.info("exercise_catalog_reloaded", version=self._version, definitions=len(items))
+        return True
+
+    async def start(self) -> None:
+        await self.refresh()
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _listen(self) -> None:
+        while True:
+            redis = await self._get_redis()
+            if redis is None:
+                await asyncio.sleep(self._poll_interval)
+                continue
+            pubsub = redis.pubsub()
+            try:
+                await pubsub.subscribe(CATALOG_CHANNEL)
+                # A change may have been published before the subscription became active.
+                await self.refresh()
+                while True:
+                    await pubsub.get_message(ignore_subscribe_messages=True, timeout=self._poll_interval)
+                    await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("exercise_catalog_listener_failed", exc_info=True)
+                await asyncio.sleep(self._poll_interval)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
@@ -1,23 +1,244 @@
 """
 Service HTTP client with safe JSON parsing and structured logging.
 
+Connections are pooled: every downstream service gets one long-lived
+``httpx.AsyncClient`` (keep-alive, configurable limits, HTTP/2 when ``h2`` is
+installed) that is shared across requests and closed on app shutdown.
+
 Usage:
-    async with ServiceClient() as client:
+    async with ServiceClient(service="workouts") as client:
         data = await client.get_json(url, headers=headers, default=[])
+
+    client = get_http_client_for_url(target_url)
+    response = await client.get(target_url, timeout=10.0)
+
+    @app.on_event("shutdown")
+    async def shutdown_event():
+        await close_http_clients()
 """
 
 from __future__ import annotations
 
+import asyncio
+import importlib.util
+import os
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from typing import Any, TypeVar
 
 import httpx
 import structlog
 
+try:
+    from prometheus_client import REGISTRY, Counter
+    from prometheus_client.core import GaugeMetricFamily
+except ImportError:  # pragma: no cover - metrics are optional
+    REGISTRY = None
+    Counter = None
+    GaugeMetricFamily = None
+
 logger = structlog.get_logger(__name__)
 
 T = TypeVar("T")
 
+_DEFAULT_SERVICE = "default"
+
+# exercises-service rejects ``/exercises/instances/by-workouts`` requests with more workout ids than this.
+INSTANCES_BY_WORKOUTS_BATCH_SIZE = 1000
+
+if Counter is not None:
+    HTTP_POOL_CONNECTIONS_CREATED = Counter(
+        "http_client_pool_connections_created_total",
+        "TCP connections opened by pooled HTTP clients",
+        ["service"],
+    )
+else:  # pragma: no cover
+    HTTP_POOL_CONNECTIONS_CREATED = None
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() in {"1", "true", "yes", "on"}
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    """Connection pool settings shared by every client in a registry."""
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    # httpx's own default, which callers of ``httpx.AsyncClient()`` had before pooling.
+    # ServiceClient still sends its per-client timeout with every request.
+    timeout: float = 5.0
+    http2: bool = True
+
+    @classmethod
+    def from_env(cls) -> PoolConfig:
+        return cls(
+            max_connections=int(os.getenv("HTTP_POOL_MAX_CONNECTIONS", cls.max_connections)),
+            max_keepalive_connections=int(os.getenv("HTTP_POOL_MAX_KEEPALIVE", cls.max_keepalive_connections)),
+            keepalive_expiry=float(os.getenv("HTTP_POOL_KEEPALIVE_EXPIRY", cls.keepalive_expiry)),
+            timeout=float(os.getenv("HTTP_CLIENT_TIMEOUT", cls.timeout)),
+            http2=_env_bool("HTTP_CLIENT_HTTP2", cls.http2),
+        )
+
+
+class HttpClientRegistry:
+    """
+    One pooled ``httpx.AsyncClient`` per downstream service and event loop.
+
+    Clients are bound to the event loop that created them, so each loop (the app's, or a Celery
+    worker thread's, see ``celery_utils.run_async``) gets its own pool instead of one whose sockets
+    belong to another loop. Clients of loops that have since been closed are dropped.
+    """
+
+    def __init__(self, config: PoolConfig | None = None) -> None:
+        self.config = config or PoolConfig.from_env()
+        self._http2 = self.config.http2 and importlib.util.find_spec("h2") is not None
+        self._clients: dict[tuple[str, asyncio.AbstractEventLoop], httpx.AsyncClient] = {}
+
+    def get(self, service: str = _DEFAULT_SERVICE) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get((service, loop))
+        if client is not None and not client.is_closed:
+            return client
+        self._prune_closed_loops()
+        client = self._create(service)
+        self._clients[(service, loop)] = client
+        return client
+
+    def _prune_closed_loops(self) -> None:
+        for key in [key for key in self._clients if key[1].is_closed()]:
+            client = self._clients.pop(key)
+            if not client.is_closed:
+                # A closed loop cannot run aclose(); its sockets go with the client object.
+                logger.warning("http_client_abandoned_with_closed_loop", service=key[0])
+
+    def for_url(self, url: str | httpx.URL) -> httpx.AsyncClient:
+        """Client for the service hosting ``url``, keyed by host:port."""
+        parsed = httpx.URL(url)
+        service = f"{parsed.host}:{parsed.port}" if parsed.port else parsed.host
+        return self.get(service or _DEFAULT_SERVICE)
+
+    def _create(self, service: str) -> httpx.AsyncClient:
+        cfg = self.config
+        event_hooks: dict[str, list] = {}
+        if HTTP_POOL_CONNECTIONS_CREATED is not None:
+            created = HTTP_POOL_CONNECTIONS_CREATED.labels(service=service)
+
+            async def trace(event_name: str, info: dict[str, Any]) -> None:
+                if event_name.endswith("connect_tcp.complete"):
+                    created.inc()
+
+            async def attach_trace(request: httpx.Request) -> None:
+                request.extensions.setdefault("trace", trace)
+
+            event_hooks["request"] = [attach_trace]
+
+        logger.info("http_client_created", service=service, http2=self._http2)
+        return httpx.AsyncClient(
+            timeout=cfg.timeout,
+            http2=self._http2,
+            limits=httpx.Limits(
+                max_connections=cfg.max_connections,
+                max_keepalive_connections=cfg.max_keepalive_connections,
+                keepalive_expiry=cfg.keepalive_expiry,
+            ),
+            event_hooks=event_hooks,
+        )
+
+    def pool_stats(self) -> Iterator[tuple[str, dict[str, int]]]:
+        """
+        Best-effort connection counts per service.
+
+        httpx exposes no pool API, so this peeks at httpcore internals; a service whose pool does not
+        have the expected shape (another transport, a changed httpcore) is skipped instead of failing
+        the metrics scrape.
+        """
+        totals: dict[str, dict[str, int]] = {}
+        for (service, _), client in list(self._clients.items()):
+            if client.is_closed:
+                continue
+            pool = getattr(getattr(client, "_transport", None), "_pool", None)
+            if pool is None:
+                continue
+            try:
+                connections = list(getattr(pool, "connections", None) or [])
+                in_use = sum(1 for conn in connections if not getattr(conn, "is_idle", lambda: True)())
+                queued = list(getattr(pool, "_requests", None) or [])
+                waiting = sum(1 for req in queued if getattr(req, "is_queued", lambda: False)())
+            except Exception:
+                logger.debug("http_client_pool_stats_unavailable", service=service, exc_info=True)
+                continue
+            stats = totals.setdefault(service, {"in_use": 0, "idle": 0, "waiting": 0})
+            stats["in_use"] += in_use
+            stats["idle"] += len(connections) - in_use
+            stats["waiting"] += waiting
+        yield from totals.items()
+
+    async def aclose(self) -> None:
+        """Close the clients of the running event loop."""
+        loop = asyncio.get_running_loop()
+        for key in [key for key in self._clients if key[1] is loop]:
+            client = self._clients.pop(key)
+            try:
+                await client.aclose()
+            except Exception:
+                logger.warning("http_client_close_failed", service=key[0], exc_info=True)
+        self._prune_closed_loops()
+
+
+class _PoolCollector:
+    def __init__(self, registry: HttpClientRegistry) -> None:
+        self._registry = registry
+
+    def collect(self):
+        in_use = GaugeMetricFamily(
+            "http_client_pool_connections_in_use", "Pooled connections serving a request", labels=["service"]
+        )
+        idle = GaugeMetricFamily("http_client_pool_connections_idle", "Idle keep-alive connections", labels=["service"])
+        waiting = GaugeMetricFamily(
+            "http_client_pool_requests_waiting", "Requests queued for a pooled connection", labels=["service"]
+        )
+        for service, stats in self._registry.pool_stats():
+            in_use.add_metric([service], stats["in_use"])
+            idle.add_metric([service], stats["idle"])
+            waiting.add_metric([service], stats["waiting"])
+        yield in_use
+        yield idle
+        yield waiting
+
+
+_registry = HttpClientRegistry()
+if REGISTRY is not None:
+    REGISTRY.register(_PoolCollector(_registry))
+
+
+def get_client_registry() -> HttpClientRegistry:
+    return _registry
+
+
+def get_http_client(service: str = _DEFAULT_SERVICE) -> httpx.AsyncClient:
+    return _registry.get(service)
+
+
+def get_http_client_for_url(url: str | httpx.URL) -> httpx.AsyncClient:
+    return _registry.for_url(url)
+
+
+@asynccontextmanager
+async def borrow_http_client(service: str = _DEFAULT_SERVICE) -> AsyncIterator[httpx.AsyncClient]:
+    """Drop-in for ``async with httpx.AsyncClient() as client`` that reuses the pooled client."""
+    yield _registry.get(service)
+
+
+async def close_http_clients() -> None:
+    await _registry.aclose()
+
 
 @dataclass
 class ServiceResponse:
@@ -40,31 +261,30 @@ class ServiceClient:
     - Safe JSON parsing (no more try/except ValueError scattered everywhere)
     - Structured logging on errors
     - Configurable timeouts
+    - Pooled connections borrowed from the per-service registry
     """
 
     def __init__(
         self,
         timeout: float | httpx.Timeout = 20.0,
         follow_redirects: bool = True,
+        service: str = _DEFAULT_SERVICE,
     ) -> None:
         if isinstance(timeout, int | float):
             self._timeout = httpx.Timeout(timeout)
         else:
             self._timeout = timeout
         self._follow_redirects = follow_redirects
+        self._service = service
         self._client: httpx.AsyncClient | None = None
 
     async def __aenter__(self) -> ServiceClient:
-        self._client = httpx.AsyncClient(
-            timeout=self._timeout,
-            follow_redirects=self._follow_redirects,
-        )
+        self._client = get_http_client(self._service)
         return self
 
     async def __aexit__(self, *args: Any) -> None:
-        if self._client:
-            await self._client.aclose()
-            self._client = None
+        # The pooled client outlives this context; it is closed on app shutdown.
+        self._client = None
 
     def _parse_json(self, response: httpx.Response, url: str, **log_context: Any) -> Any | None:
         """Parse JSON from response, log and return None on failure."""
@@ -95,7 +315,13 @@ class ServiceClient:
 
         try:
             assert self._client is not None, "Client not initialized"
-            response = await self._client.get(url, headers=headers, params=params)
+            response = await self._client.get(
+                url,
+                headers=headers,
+                params=params,
+                timeout=self._timeout,
+                follow_redirects=self._follow_redirects,
+            )
         except httpx.HTTPError as exc:
             logger.error("http_request_failed", url=url, error=str(exc), **log_context)
             return ServiceResponse(success=False, error=str(exc))
@@ -142,7 +368,14 @@ class ServiceClient:
 
         try:
             assert self._client is not None
-            response = await self._client.post(url, headers=headers, json=json, content=content)
+            response = await self._client.post(
+                url,
+                headers=headers,
+                json=json,
+                content=content,
+                timeout=self._timeout,
+                follow_redirects=self._follow_redirects,
+            )
         except httpx.HTTPError as exc:
             logger.error("http_request_failed", url=url, error=str(exc), **log_context)
             return ServiceResponse(success=False, error=str(exc))
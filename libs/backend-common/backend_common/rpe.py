@@ -0,0 +1,177 @@
+"""
+In-process RPE table engine shared by all backend services.
+
+The table is loaded once per process and indexed in both directions, so
+filling the missing value of an (intensity, effort, volume) triple is a dict
+lookup instead of an HTTP round trip to rpe-service. Nearest-match fallbacks
+mirror ``rpe_service.main.compute_rpe_set`` exactly, including tie-breaking
+by table order.
+
+Usage:
+    engine = get_rpe_engine()
+    filled = engine.compute(intensity=80, effort=8)
+    filled.volume  # -> 6
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+from bisect import bisect_left
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_RPE_TABLE_PATH = Path(__file__).with_name("rpe_table.json")
+
+RpeTable = dict[int, dict[int, int]]
+
+
+@dataclass(frozen=True, slots=True)
+class RpeSet:
+    """A (possibly partially) resolved intensity / effort / volume triple."""
+
+    intensity: int | None = None
+    effort: int | None = None
+    volume: int | None = None
+
+
+def round_to_step(value: float, step: float, mode: str) -> float:
+    if step <= 0:
+        return value
+    ratio = value / step
+    if mode == "floor":
+        return math.floor(ratio) * step
+    if mode == "ceil":
+        return math.ceil(ratio) * step
+    return round(ratio) * step
+
+
+def normalize_rpe_table(raw: Mapping[Any, Mapping[Any, Any]]) -> RpeTable:
+    """Convert a JSON-shaped table (string keys) into int keys, preserving order."""
+    table: RpeTable = {}
+    for intensity, efforts in raw.items():
+        if not isinstance(efforts, Mapping):
+            raise ValueError(f"RPE table row for intensity {intensity!r} must be a mapping")
+        table[int(intensity)] = {int(effort): int(reps) for effort, reps in efforts.items()}
+    return table
+
+
+def load_rpe_table() -> RpeTable:
+    """Load the table from ``RPE_TABLE_JSON``, ``RPE_TABLE_PATH`` or the bundled copy."""
+    json_str = os.getenv("RPE_TABLE_JSON")
+    if json_str:
+        try:
+            return normalize_rpe_table(json.loads(json_str))
+        except (ValueError, TypeError) as exc:
+            raise RuntimeError("Invalid JSON in RPE_TABLE_JSON environment variable") from exc
+
+    path = Path(os.getenv("RPE_TABLE_PATH") or DEFAULT_RPE_TABLE_PATH)
+    if not path.exists():
+        path = DEFAULT_RPE_TABLE_PATH
+    try:
+        with path.open() as f:
+            return normalize_rpe_table(json.load(f))
+    except (OSError, ValueError, TypeError) as exc:
+        raise RuntimeError(f"Error reading RPE table from {path}") from exc
+
+
+class RpeEngine:
+    """
+    Indexed view over an RPE table.
+
+    Forward index: (intensity, effort) -> volume (the table itself).
+    Inverse indexes: (effort, volume) -> intensity and (intensity, volume) -> effort.
+    Sorted key arrays back the nearest-neighbour fallbacks via bisection.
+    """
+
+    def __init__(self, table: RpeTable) -> None:
+        if not table:
+            raise ValueError("RPE table is empty")
+        self.table = table
+        # Position in table order; min() over the raw table picks the earliest row on ties.
+        self._intensity_rank = {intensity: rank for rank, intensity in enumerate(table)}
+        self._intensities = sorted(table)
+
+        self._intensity_by_effort_volume: dict[tuple[int, int], int] = {}
+        self._effort_by_intensity_volume: dict[tuple[int, int], int] = {}
+        reps_by_effort: dict[int, set[int]] = {}
+        for intensity, efforts in table.items():
+            for effort, reps in efforts.items():
+                self._intensity_by_effort_volume.setdefault((effort, reps), intensity)
+                self._effort_by_intensity_volume.setdefault((intensity, reps), effort)
+                reps_by_effort.setdefault(effort, set()).add(reps)
+        self._reps_by_effort = {effort: sorted(reps) for effort, reps in reps_by_effort.items()}
+
+    @staticmethod
+    def _nearest(values: list[int], target: float, rank: Callable[[int], int]) -> int:
+        pos = bisect_left(values, target)
+        candidates = values[max(pos - 1, 0) : pos + 1]
+        return min(candidates, key=lambda v: (abs(v - target), rank(v)))
+
+    def nearest_intensity(self, intensity: float) -> int:
+        return self._nearest(self._intensities, int(intensity), self._intensity_rank.__getitem__)
+
+    def lookup_volume(self, intensity: float, effort: float) -> int | None:
+        return self.table.get(intensity, {}).get(math.floor(effort))
+
+    def lookup_intensity(self, volume: int, effort: float) -> int | None:
+        return self._intensity_by_effort_volume.get((math.floor(effort), volume))
+
+    def lookup_effort(self, volume: int, intensity: float) -> int | None:
+        return self._effort_by_intensity_volume.get((intensity, volume))
+
+    def compute(
+        self,
+        *,
+        intensity: float | None = None,
+        effort: float | None = None,
+        volume: int | None = None,
+    ) -> RpeSet:
+        """Fill the single missing value of the triple, falling back to the nearest table entry."""
+        if intensity is not None and effort is not None and volume is None:
+            volume = self.lookup_volume(intensity, effort)
+            if volume is None:
+                intensity = self.nearest_intensity(intensity)
+                mapping = self.table[intensity]
+                effort = min(mapping, key=lambda k: abs(k - int(effort)))
+                volume = mapping[effort]
+                logger.debug("rpe_nearest_volume", intensity=intensity, effort=effort, volume=volume)
+
+        elif volume is not None and effort is not None and intensity is None:
+            intensity = self.lookup_intensity(volume, effort)
+            if intensity is None:
+                ekey = int(effort)
+                reps = self._reps_by_effort.get(ekey)
+                if reps:
+                    volume = self._nearest(
+                        reps,
+                        int(volume),
+                        lambda r: self._intensity_rank[self._intensity_by_effort_volume[(ekey, r)]],
+                    )
+                    intensity = self._intensity_by_effort_volume[(ekey, volume)]
+                    logger.debug("rpe_nearest_intensity", intensity=intensity, effort=ekey, volume=volume)
+
+        elif volume is not None and intensity is not None and effort is None:
+            effort = self.lookup_effort(volume, intensity)
+            if effort is None:
+                intensity = self.nearest_intensity(intensity)
+                mapping = self.table[intensity]
+                effort, volume = min(mapping.items(), key=lambda kv: abs(kv[1] - int(volume)))
+                logger.debug("rpe_nearest_effort", intensity=intensity, effort=effort, volume=volume)
+
+        return RpeSet(intensity=intensity, effort=effort, volume=volume)
+
+
+@lru_cache(maxsize=1)
+def get_rpe_engine() -> RpeEngine:
+    engine = RpeEngine(load_rpe_table())
+    logger.info("rpe_engine_loaded", intensities=len(engine.table))
+    return engine
@@ -0,0 +1,164 @@
+"""
+Vectorized RPE / 1RM evaluation over whole plans.
+
+Every (intensity, effort) -> volume, (volume, effort) -> intensity and
+(volume, intensity) -> effort answer of :class:`backend_common.rpe.RpeEngine`
+is precomputed into dense 2D grids, so filling thousands of sets is a few
+fancy-indexing operations. Rows outside the grid domain (non-integral or
+out-of-range inputs) are delegated to the scalar engine, and weights use the
+same float operations as ``round_to_step``, so results are bit-identical to
+the per-set path.
+
+Usage:
+    grid = get_rpe_grid()
+    result = grid.evaluate(intensity, effort, volume, one_rm=maxes, exercise_index=idx)
+    result.weight  # numpy array, NaN where no weight could be computed
+
+Missing values are represented as NaN in all input and output arrays.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+
+from .rpe import RpeEngine, get_rpe_engine
+
+
+def as_float_array(values: Iterable[Any]) -> np.ndarray:
+    return np.array([np.nan if v is None else float(v) for v in values], dtype=np.float64)
+
+
+def to_python(value: float) -> int | float | None:
+    """Convert one array element back to the JSON-friendly value the scalar path would produce."""
+    if np.isnan(value):
+        return None
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+def round_to_step_array(values: np.ndarray, step: float, mode: str) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    if step <= 0:
+        return values.copy()
+    ratio = values / step
+    if mode == "floor":
+        return np.floor(ratio) * step
+    if mode == "ceil":
+        return np.ceil(ratio) * step
+    # np.rint rounds half to even, like the builtin round() used by the scalar path.
+    return np.rint(ratio) * step
+
+
+def _integral_in(values: np.ndarray, upper: int) -> np.ndarray:
+    with np.errstate(invalid="ignore"):
+        return np.isfinite(values) & (values == np.floor(values)) & (values >= 0) & (values <= upper)
+
+
+@dataclass(frozen=True)
+class RpeGridResult:
+    intensity: np.ndarray
+    effort: np.ndarray
+    volume: np.ndarray
+    weight: np.ndarray
+
+
+class RpeGrid:
+    """Dense lookup grids derived from an :class:`RpeEngine`."""
+
+    def __init__(self, engine: RpeEngine) -> None:
+        self.engine = engine
+        self.max_intensity = max(engine.table)
+        self.max_effort = max(effort for efforts in engine.table.values() for effort in efforts)
+        self.max_volume = max(reps for efforts in engine.table.values() for reps in efforts.values())
+
+        intensities = range(self.max_intensity + 1)
+        efforts = range(self.max_effort + 1)
+        volumes = range(self.max_volume + 1)
+        self._from_intensity_effort = self._build(
+            intensities, efforts, lambda i, e: engine.compute(intensity=i, effort=e)
+        )
+        self._from_volume_effort = self._build(volumes, efforts, lambda v, e: engine.compute(volume=v, effort=e))
+        self._from_volume_intensity = self._build(
+            volumes, intensities, lambda v, i: engine.compute(volume=v, intensity=i)
+        )
+
+    @staticmethod
+    def _build(rows: range, cols: range, compute) -> np.ndarray:
+        grid = np.full((len(rows), len(cols), 3), np.nan, dtype=np.float64)
+        for r in rows:
+            for c in cols:
+                res = compute(r, c)
+                grid[r, c] = [np.nan if x is None else x for x in (res.intensity, res.effort, res.volume)]
+        return grid
+
+    def fill(
+        self,
+        intensity: np.ndarray,
+        effort: np.ndarray,
+        volume: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized ``RpeEngine.compute``: fill rows with exactly one missing value."""
+        intensity = np.asarray(intensity, dtype=np.float64)
+        effort = np.asarray(effort, dtype=np.float64)
+        volume = np.asarray(volume, dtype=np.float64)
+        out = np.stack([intensity, effort, volume], axis=-1)
+
+        has_i, has_e, has_v = ~np.isnan(intensity), ~np.isnan(effort), ~np.isnan(volume)
+        modes = (
+            (has_i & has_e & ~has_v, intensity, self.max_intensity, effort, self.max_effort),
+            (has_v & has_e & ~has_i, volume, self.max_volume, effort, self.max_effort),
+            (has_v & has_i & ~has_e, volume, self.max_volume, intensity, self.max_intensity),
+        )
+        grids = (self._from_intensity_effort, self._from_volume_effort, self._from_volume_intensity)
+        for (mask, row_vals, row_max, col_vals, col_max), grid in zip(modes, grids, strict=True):
+            in_grid = mask & _integral_in(row_vals, row_max) & _integral_in(col_vals, col_max)
+            out[in_grid] = grid[row_vals[in_grid].astype(np.intp), col_vals[in_grid].astype(np.intp)]
+            for idx in np.flatnonzero(mask & ~in_grid):
+                res = self.engine.compute(
+                    intensity=to_python(intensity[idx]),
+                    effort=to_python(effort[idx]),
+                    volume=to_python(volume[idx]),
+                )
+                out[idx] = [np.nan if x is None else x for x in (res.intensity, res.effort, res.volume)]
+
+        return out[..., 0], out[..., 1], out[..., 2]
+
+    @staticmethod
+    def weights(intensity: np.ndarray, one_rm: np.ndarray, rounding_step: float, rounding_mode: str) -> np.ndarray:
+        """``round_to_step(one_rm * (intensity / 100.0))`` per row; NaN where either input is missing."""
+        raw = np.asarray(one_rm, dtype=np.float64) * (np.asarray(intensity, dtype=np.float64) / 100.0)
+        return round_to_step_array(raw, rounding_step, rounding_mode)
+
+    def evaluate(
+        self,
+        intensity: np.ndarray,
+        effort: np.ndarray,
+        volume: np.ndarray,
+        *,
+        one_rm: np.ndarray,
+        exercise_index: np.ndarray | None = None,
+        rounding_step: float = 2.5,
+        rounding_mode: str = "nearest",
+    ) -> RpeGridResult:
+        """
+        Fill the missing dimension of every set and derive working weights.
+
+        ``one_rm`` is either one value per set, or one value per exercise when
+        ``exercise_index`` maps each set to its position in ``one_rm``.
+        """
+        filled_i, filled_e, filled_v = self.fill(intensity, effort, volume)
+        one_rm = np.asarray(one_rm, dtype=np.float64)
+        if exercise_index is not None:
+            one_rm = one_rm[np.asarray(exercise_index, dtype=np.intp)]
+        weight = self.weights(filled_i, one_rm, rounding_step, rounding_mode)
+        return RpeGridResult(intensity=filled_i, effort=filled_e, volume=filled_v, weight=weight)
+
+
+@lru_cache(maxsize=1)
+def get_rpe_grid() -> RpeGrid:
+    return RpeGrid(get_rpe_engine())
@@ -0,0 +1,164 @@
+"""
+Request coalescing ("single-flight") for hot downstream reads.
+
+Concurrent calls with the same key share one in-flight call instead of
+each hitting the downstream service; with ``ttl`` the result is also reused
+for a short window afterwards. Exceptions are propagated to every waiter and
+never cached.
+
+Usage:
+    @single_flight(ttl=30.0)
+    async def fetch_exercise_definitions() -> list[dict]:
+        ...
+
+    _meta_flight = SyncSingleFlight(ttl=5.0)
+    data = _meta_flight.do("exercises", fetch_meta)  # sync code / threadpool routes
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, ParamSpec, TypeVar
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+P = ParamSpec("P")
+
+
+class _ResultCache:
+    def __init__(self, ttl: float, cache_if: Callable[[Any], bool] | None) -> None:
+        self.ttl = ttl
+        self.cache_if = cache_if
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(key, None)
+            return False, None
+        return True, value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.ttl <= 0 or (self.cache_if is not None and not self.cache_if(value)):
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def forget(self, key: Hashable | None = None) -> None:
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+
+class SingleFlight:
+    """Coalesces concurrent coroutine calls per key on the current event loop."""
+
+    def __init__(self, ttl: float = 0.0, cache_if: Callable[[Any], bool] | None = None) -> None:
+        self._cache = _ResultCache(ttl, cache_if)
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        hit, value = self._cache.get(key)
+        if hit:
+            return value
+
+        task = self._inflight.get(key)
+        # Tasks belong to one loop; callers on another loop (e.g. Celery's asyncio.run) start their own flight.
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+        else:
+            logger.debug("single_flight_joined", key=str(key))
+        # Shielded so that a cancelled waiter does not cancel the call the others are waiting on.
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is None:
+            self._cache.put(key, task.result())
+
+    def forget(self, key: Hashable | None = None) -> None:
+        self._cache.forget(key)
+
+
+class SyncSingleFlight:
+    """Thread-based counterpart of :class:`SingleFlight` for blocking code."""
+
+    def __init__(self, ttl: float = 0.0, cache_if: Callable[[Any], bool] | None = None) -> None:
+        self._cache = _ResultCache(ttl, cache_if)
+        self._lock = threading.Lock()
+        self._inflight: dict[Hashable, _SyncCall] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            hit, value = self._cache.get(key)
+            if hit:
+                return value
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _SyncCall()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+                if call.error is None:
+                    self._cache.put(key, call.result)
+            call.done.set()
+        return call.result
+
+    def forget(self, key: Hashable | None = None) -> None:
+        with self._lock:
+            self._cache.forget(key)
+
+
+class _SyncCall:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+def single_flight(
+    ttl: float = 0.0,
+    cache_if: Callable[[Any], bool] | None = None,
+) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Awaitable[T]]]:
+    """Decorate a coroutine function so concurrent calls with equal (hashable) arguments are coalesced."""
+
+    def decorator(fn: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+        flight = SingleFlight(ttl=ttl, cache_if=cache_if)
+
+        @functools.wraps(fn)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            key = (args, tuple(sorted(kwargs.items())))
+            return await flight.do(key, lambda: fn(*args, **kwargs))
+
+        wrapper.single_flight = flight  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
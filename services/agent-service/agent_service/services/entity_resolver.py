@@ -6,6 +6,7 @@ from typing import Any
 
 import httpx
 import structlog
+from backend_common.singleflight import single_flight
 
 from ..config import settings
 
@@ -145,6 +146,8 @@ def build_inline_entities_snippet(
 
 logger = structlog.get_logger(__name__)
 
+_EXERCISE_DEFINITIONS_TTL_SECONDS = 30.0
+
 
 @dataclass
 class ResolvedReference:
@@ -158,6 +161,7 @@ class ResolvedReference:
     errors: list[str] = field(default_factory=list)
 
 
+@single_flight(ttl=_EXERCISE_DEFINITIONS_TTL_SECONDS, cache_if=bool)
 async def _fetch_exercise_definitions_json() -> list[dict[str, Any]]:
     base_url = settings.exercises_service_url
     try:
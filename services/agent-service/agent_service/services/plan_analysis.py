@@ -2,6 +2,7 @@ from typing import Any
 
 import httpx
 import structlog
+from backend_common.singleflight import single_flight
 
 from ..config import settings
 from ..metrics import PLAN_ANALYSIS_REQUESTED_TOTAL
@@ -64,6 +65,7 @@ async def fetch_plan_workouts_with_details(applied_plan_id: int, user_id: str) -
         return resp.json()
 
 
+@single_flight(ttl=30.0)
 async def fetch_exercise_definitions_map() -> dict[int, dict[str, Any]]:
     url = f"{settings.exercises_service_url}/exercises/definitions/"
     async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
@@ -12,6 +12,7 @@ from itertools import count
 from typing import Any
 
 import structlog
+from backend_common.rpe import get_rpe_engine
 from google import genai
 from google.genai import types
 from pydantic import BaseModel, Field, field_validator, model_validator
@@ -80,52 +81,15 @@ def _parse_int_tolerant(value: Any) -> int | None:
 
 def _load_rpe_table() -> dict[str, dict[str, int]]:
     logger = structlog.get_logger(__name__)
-    base_url = (os.getenv("RPE_SERVICE_URL") or "http://rpe-service:8001").rstrip("/")
-    url = f"{base_url}/rpe/table"
     try:
-        try:
-            import httpx
-        except Exception as exc:  # pragma: no cover
-            logger.warning("httpx not available for RPE HTTP load: %s", exc)
-        else:
-            headers = {"X-User-Id": os.getenv("RPE_TABLE_USER_ID", "system")}
-            with httpx.Client(timeout=3.0, follow_redirects=True) as client:
-                resp = client.get(url, headers=headers)
-                resp.raise_for_status()
-                raw_data = resp.json()
-
-            if not isinstance(raw_data, dict):
-                logger.warning(
-                    "RPE table URL %s returned non-dict payload of type %s",
-                    url,
-                    type(raw_data).__name__,
-                )
-            else:
-                table_http: dict[str, dict[str, int]] = {}
-                for intensity_key, mapping in raw_data.items():
-                    if not isinstance(mapping, dict):
-                        continue
-                    normalized_intensity = (
-                        str(int(round(intensity_key))) if isinstance(intensity_key, int | float) else str(intensity_key)
-                    )
-                    normalized_mapping: dict[str, int] = {}
-                    for effort_key, reps_value in mapping.items():
-                        if not isinstance(reps_value, int | float):
-                            continue
-                        normalized_effort = (
-                            str(int(round(effort_key))) if isinstance(effort_key, int | float) else str(effort_key)
-                        )
-                        normalized_mapping[normalized_effort] = int(round(reps_value))
-                    if normalized_mapping:
-                        table_http[normalized_intensity] = normalized_mapping
-                if table_http:
-                    logger.info("Loaded RPE table from %s with %d intensity rows", url, len(table_http))
-                    return table_http
+        table = get_rpe_engine().table
     except Exception as exc:  # pragma: no cover - best effort logging
-        logger.warning("Failed to load RPE table from %s: %s", url, exc)
-
-    logger.warning("RPE table not found; falling back to static guidance")
-    return {}
+        logger.warning("Failed to load RPE table: %s", exc)
+        logger.warning("RPE table not found; falling back to static guidance")
+        return {}
+    return {
+        str(intensity): {str(effort): reps for effort, reps in mapping.items()} for intensity, mapping in table.items()
+    }
 
 
 def _format_rpe_summary(table: dict[str, dict[str, int]]) -> str:
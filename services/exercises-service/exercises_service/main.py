@@ -1,6 +1,7 @@
 import structlog
 from backend_common.fastapi_app import create_service_app
 
+from exercises_service.database import AsyncSessionLocal
 from exercises_service.logging_config import configure_logging
 from exercises_service.redis_client import close_redis, init_redis
 from exercises_service.routers import (
@@ -8,6 +9,7 @@ from exercises_service.routers import (
     exercise_definition_router,
     exercise_instance_router,
 )
+from exercises_service.services.exercise_definition_service import ExerciseDefinitionService
 from exercises_service.services.exercise_service import ExerciseService
 
 configure_logging()
@@ -28,6 +30,11 @@ async def health():
 @app.on_event("startup")
 async def startup_event():
     await init_redis()
+    try:
+        async with AsyncSessionLocal() as db:
+            await ExerciseDefinitionService(db).publish_catalog()
+    except Exception:
+        logger.warning("exercise_catalog_publish_failed", exc_info=True)
 
 
 @app.on_event("shutdown")
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
+from collections.abc import Iterable, Mapping
+from typing import Any
 
 import structlog
+from backend_common.exercise_catalog import publish_catalog, publish_catalog_changes
 from redis.asyncio import Redis
 
 from .config import get_settings
@@ -108,6 +110,29 @@ async def invalidate_exercise_cache(
         logger.warning("Failed to invalidate exercise cache", keys=list(keys), exc_info=True)
 
 
+async def publish_definition_catalog(definitions: Iterable[Mapping[str, Any]]) -> None:
+    if redis_client is None:
+        return
+
+    try:
+        await publish_catalog(redis_client, definitions)
+    except Exception:
+        logger.warning("Failed to publish exercise catalog", exc_info=True)
+
+
+async def publish_definition_changes(
+    upserts: Iterable[Mapping[str, Any]] = (),
+    deleted_ids: Iterable[int] = (),
+) -> None:
+    if redis_client is None:
+        return
+
+    try:
+        await publish_catalog_changes(redis_client, upserts=upserts, deleted_ids=deleted_ids)
+    except Exception:
+        logger.warning("Failed to publish exercise catalog changes", exc_info=True)
+
+
 async def invalidate_instance_cache(
     user_id: str,
     instance_ids: Iterable[int] | None = None,
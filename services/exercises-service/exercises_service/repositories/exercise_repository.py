@@ -1,5 +1,5 @@
 from exercises_service.models import ExerciseInstance, ExerciseList
-from sqlalchemy import and_, delete, select
+from sqlalchemy import and_, delete, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -62,6 +62,29 @@ class ExerciseRepository:
         await db.refresh(db_instance)
         return db_instance
 
+    @staticmethod
+    async def get_exercise_instances_by_ids(db: AsyncSession, instance_ids: list[int], user_id: str):
+        if not instance_ids:
+            return []
+        result = await db.execute(
+            select(ExerciseInstance)
+            .options(selectinload(ExerciseInstance.exercise_definition))
+            .where(
+                and_(
+                    ExerciseInstance.id.in_(instance_ids),
+                    ExerciseInstance.user_id == user_id,
+                )
+            )
+        )
+        return result.scalars().all()
+
+    @staticmethod
+    async def update_exercise_instances_sets(db: AsyncSession, updates: list[tuple[ExerciseInstance, list]]):
+        for db_instance, sets in updates:
+            db_instance.sets = sets
+        await db.commit()
+        return [db_instance for db_instance, _ in updates]
+
     @staticmethod
     async def delete_exercise_instance(db: AsyncSession, instance_id: int, user_id: str):
         query = select(ExerciseInstance).where(
@@ -113,6 +136,23 @@ class ExerciseRepository:
         )
         return result.scalars().all()
 
+    @staticmethod
+    async def get_instances_by_workouts(db: AsyncSession, workout_ids: list[int], user_id: str):
+        if not workout_ids:
+            return []
+        result = await db.execute(
+            select(ExerciseInstance)
+            .options(selectinload(ExerciseInstance.exercise_definition))
+            .filter(
+                and_(
+                    ExerciseInstance.workout_id.in_(workout_ids),
+                    ExerciseInstance.user_id == user_id,
+                )
+            )
+            .order_by(ExerciseInstance.workout_id, ExerciseInstance.id)
+        )
+        return result.scalars().all()
+
     @staticmethod
     async def migrate_set_ids(db):
         from exercises_service.services.exercise_service import ExerciseService
@@ -133,28 +173,33 @@ class ExerciseRepository:
 
     @staticmethod
     async def create_exercise_instances_batch(db: AsyncSession, instances_data: list, user_id: str):
-        from exercises_service.services.exercise_service import ExerciseService
+        from exercises_service.services.set_service import SetService
 
-        created_instances = []
+        if not instances_data:
+            return []
+        rows = []
         for data in instances_data:
             instance_dict = dict(data)
             if "sets" in instance_dict:
-                instance_dict["sets"] = ExerciseService.ensure_set_ids(instance_dict["sets"])
+                instance_dict["sets"] = SetService.ensure_set_ids(instance_dict["sets"])
             instance_dict["user_id"] = user_id
-            db_instance = ExerciseInstance(**instance_dict)
-            db.add(db_instance)
-            await db.flush()
-            created_instances.append(
-                {
-                    "id": db_instance.id,
-                    "exercise_list_id": db_instance.exercise_list_id,
-                    "sets": ExerciseService.normalize_sets_for_frontend(db_instance.sets or []),
-                    "notes": db_instance.notes,
-                    "order": db_instance.order,
-                    "workout_id": db_instance.workout_id,
-                    "user_max_id": db_instance.user_max_id,
-                    "user_id": db_instance.user_id,
-                }
-            )
+            rows.append(instance_dict)
+        result = await db.execute(
+            insert(ExerciseInstance).returning(ExerciseInstance, sort_by_parameter_order=True),
+            rows,
+        )
+        created_instances = [
+            {
+                "id": db_instance.id,
+                "exercise_list_id": db_instance.exercise_list_id,
+                "sets": SetService.normalize_sets_for_frontend(db_instance.sets or []),
+                "notes": db_instance.notes,
+                "order": db_instance.order,
+                "workout_id": db_instance.workout_id,
+                "user_max_id": db_instance.user_max_id,
+                "user_id": db_instance.user_id,
+            }
+            for db_instance in result.scalars().all()
+        ]
         await db.commit()
         return created_instances
@@ -6,7 +6,7 @@ from exercises_service.metrics import (
     EXERCISE_SETS_UPDATED_TOTAL,
 )
 from exercises_service.repositories.exercise_repository import ExerciseRepository
-from exercises_service.services.exercise_instance_service import ExerciseInstanceService
+from exercises_service.services.exercise_instance_service import ExerciseInstanceService, InstanceBatchValidationError
 from exercises_service.services.set_service import SetService
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -14,6 +14,22 @@ from sqlalchemy.ext.asyncio import AsyncSession
 router = APIRouter(prefix="/instances")
 
 
+@router.post("/by-workouts", response_model=dict[int, list[schemas.ExerciseInstanceResponse]])
+async def get_instances_by_workouts(
+    payload: schemas.ExerciseInstancesByWorkoutsRequest,
+    db: AsyncSession = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
+):
+    service = ExerciseInstanceService(db, SetService(), user_id)
+    grouped = await service.get_instances_by_workouts(payload.workout_ids)
+    if not payload.include_definition:
+        grouped = {
+            wid: [{**instance, "exercise_definition": None} for instance in instances]
+            for wid, instances in grouped.items()
+        }
+    return grouped
+
+
 @router.get("/{instance_id}", response_model=schemas.ExerciseInstanceResponse)
 async def get_exercise_instance(
     instance_id: int,
@@ -88,6 +104,19 @@ async def update_exercise_set(
     return schemas.ExerciseInstanceResponse.model_validate(result)
 
 
+@router.post("/sets/batch-update", response_model=schemas.ExerciseSetBatchUpdateResponse)
+async def update_exercise_sets_batch(
+    payload: schemas.ExerciseSetBatchUpdateRequest,
+    db: AsyncSession = Depends(get_db),
+    set_service: SetService = Depends(get_set_service),
+    user_id: str = Depends(get_current_user_id),
+):
+    service = ExerciseInstanceService(db, set_service, user_id)
+    result = await service.update_sets_batch(payload.items)
+    EXERCISE_SETS_UPDATED_TOTAL.inc(len(result["updated"]))
+    return result
+
+
 @router.delete("/{instance_id}/sets/{set_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_exercise_set(
     instance_id: int,
@@ -114,17 +143,16 @@ async def delete_exercise_instance(
 
 @router.post("/batch", response_model=list[schemas.ExerciseInstanceResponse])
 async def create_exercise_instances_batch(
-    instances_data: list[schemas.ExerciseInstanceCreate],
+    instances_data: list[schemas.ExerciseInstanceBatchCreate],
     db: AsyncSession = Depends(get_db),
+    set_service: SetService = Depends(get_set_service),
     user_id: str = Depends(get_current_user_id),
 ):
-    instances_list = []
-    for data in instances_data:
-        instance_dict = data.model_dump()
-        if "sets" in instance_dict:
-            instance_dict["sets"] = SetService.ensure_set_ids(instance_dict["sets"])
-        instances_list.append(instance_dict)
-    result = await ExerciseRepository.create_exercise_instances_batch(db, instances_list, user_id)
+    service = ExerciseInstanceService(db, set_service, user_id)
+    try:
+        result = await service.create_instances_batch(instances_data)
+    except InstanceBatchValidationError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=e.errors)
     EXERCISE_INSTANCES_BATCH_CREATED_TOTAL.inc(len(result))
     return result
 
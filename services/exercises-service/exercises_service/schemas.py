@@ -1,5 +1,6 @@
 from enum import Enum
 
+from backend_common.http_client import INSTANCES_BY_WORKOUTS_BATCH_SIZE
 from pydantic import BaseModel, Field
 
 
@@ -84,6 +85,10 @@ class ExerciseInstanceCreate(ExerciseInstanceBase):
     user_max_id: int | None = None
 
 
+class ExerciseInstanceBatchCreate(ExerciseInstanceCreate):
+    workout_id: int
+
+
 class ExerciseInstanceResponse(ExerciseInstanceBase):
     id: int
     workout_id: int | None = None
@@ -94,6 +99,30 @@ class ExerciseInstanceResponse(ExerciseInstanceBase):
         from_attributes = True
 
 
+class ExerciseInstancesByWorkoutsRequest(BaseModel):
+    workout_ids: list[int] = Field(..., max_length=INSTANCES_BY_WORKOUTS_BATCH_SIZE)
+    include_definition: bool = Field(False, description="Embed exercise_definition into each instance")
+
+
+class ExerciseSetRef(BaseModel):
+    instance_id: int
+    set_id: int
+
+
+class ExerciseSetPatch(ExerciseSetRef):
+    patch: ExerciseSetUpdate
+
+
+class ExerciseSetBatchUpdateRequest(BaseModel):
+    items: list[ExerciseSetPatch] = Field(..., max_length=5000)
+
+
+class ExerciseSetBatchUpdateResponse(BaseModel):
+    updated: list[ExerciseSetRef] = Field(default_factory=list)
+    skipped: list[ExerciseSetRef] = Field(default_factory=list, description="Unknown instance or set ids")
+    instances: list[ExerciseInstanceResponse] = Field(default_factory=list)
+
+
 class ExerciseInstanceCoachUpdate(BaseModel):
     notes: str | None = None
     order: int | None = None
@@ -16,6 +16,8 @@ from ..redis_client import (
     exercise_definitions_list_key,
     get_redis,
     invalidate_exercise_cache,
+    publish_definition_catalog,
+    publish_definition_changes,
 )
 from ..repositories.exercise_repository import ExerciseRepository
 
@@ -57,6 +59,13 @@ class ExerciseDefinitionService:
 
         return responses
 
+    async def publish_catalog(self) -> None:
+        """Publish every definition to the shared catalog read by the other services."""
+        definitions = await self.repository.list_exercise_definitions(self.db)
+        await publish_definition_catalog(
+            schemas.ExerciseListResponse.model_validate(defn).model_dump(mode="json") for defn in definitions
+        )
+
     async def get_definition(self, exercise_list_id: int):
         cache_key = exercise_definition_key(exercise_list_id)
         redis = await get_redis()
@@ -91,7 +100,9 @@ class ExerciseDefinitionService:
 
         created = await self.repository.create_exercise_definition(self.db, exercise.model_dump())
         await invalidate_exercise_cache()
-        return schemas.ExerciseListResponse.model_validate(created)
+        response = schemas.ExerciseListResponse.model_validate(created)
+        await publish_definition_changes(upserts=[response.model_dump(mode="json")])
+        return response
 
     async def update_definition(self, exercise_list_id: int, exercise_update: schemas.ExerciseListCreate):
         updated = await self.repository.update_exercise_definition(
@@ -100,9 +111,13 @@ class ExerciseDefinitionService:
             exercise_update.model_dump(),
         )
         await invalidate_exercise_cache(definition_ids=[exercise_list_id])
-        return schemas.ExerciseListResponse.model_validate(updated)
+        response = schemas.ExerciseListResponse.model_validate(updated)
+        await publish_definition_changes(upserts=[response.model_dump(mode="json")])
+        return response
 
     async def delete_definition(self, exercise_list_id: int):
         result = await self.repository.delete_exercise_definition(self.db, exercise_list_id)
         await invalidate_exercise_cache(definition_ids=[exercise_list_id])
+        if result:
+            await publish_definition_changes(deleted_ids=[exercise_list_id])
         return result
@@ -24,6 +24,14 @@ from .set_service import SetService
 logger = structlog.get_logger(__name__)
 
 
+class InstanceBatchValidationError(ValueError):
+    """Raised when items of a batch create fail validation; nothing from the batch is written."""
+
+    def __init__(self, errors: list[dict[str, Any]]):
+        super().__init__(f"{len(errors)} exercise instance(s) failed validation")
+        self.errors = errors
+
+
 class ExerciseInstanceService:
     def __init__(self, db: AsyncSession, set_service: SetService, user_id: str):
         self.db = db
@@ -116,6 +124,26 @@ class ExerciseInstanceService:
         await self._cache_instances_list(cache_key, serialized)
         return serialized
 
+    async def get_instances_by_workouts(self, workout_ids: list[int]) -> dict[int, list[dict]]:
+        workout_ids = list(dict.fromkeys(workout_ids))
+        cached = await self._cache.get_many([workout_instances_key(self.user_id, wid) for wid in workout_ids])
+        by_workout: dict[int, list[dict]] = {
+            wid: payload for wid, payload in zip(workout_ids, cached, strict=True) if payload is not None
+        }
+
+        missing = [wid for wid in workout_ids if wid not in by_workout]
+        if missing:
+            fetched: dict[int, list[dict]] = {wid: [] for wid in missing}
+            for instance in await self.repository.get_instances_by_workouts(self.db, missing, self.user_id):
+                fetched[instance.workout_id].append(self._serialize_instance(instance))
+            await self._cache.set_many(
+                {workout_instances_key(self.user_id, wid): payload for wid, payload in fetched.items()},
+                ttl=EXERCISE_WORKOUT_TTL_SECONDS,
+            )
+            by_workout.update(fetched)
+
+        return {wid: by_workout[wid] for wid in workout_ids}
+
     async def create_instance(self, workout_id: int, instance_data: schemas.ExerciseInstanceCreate) -> dict:
         logger.info(
             "exercise_instance_create_requested",
@@ -154,6 +182,44 @@ class ExerciseInstanceService:
         await self._cache_instance(exercise_instance_key(self.user_id, serialized.get("id")), serialized)
         return serialized
 
+    async def create_instances_batch(self, items: list[schemas.ExerciseInstanceBatchCreate]) -> list[dict]:
+        """
+        Create instances across workouts with the checks of ``create_instance``, in one insert.
+
+        All or nothing: if any item references a missing definition or has invalid sets, the
+        batch is rejected with ``InstanceBatchValidationError`` listing every failing item.
+        """
+        definition_ids = sorted({item.exercise_list_id for item in items})
+        definitions = await self.repository.list_exercise_definitions(self.db, definition_ids) if definition_ids else []
+        known_ids = {definition.id for definition in definitions}
+
+        rows: list[dict] = []
+        errors: list[dict[str, Any]] = []
+        for index, item in enumerate(items):
+            if item.exercise_list_id not in known_ids:
+                errors.append(
+                    {"index": index, "detail": f"Exercise definition with id {item.exercise_list_id} not found"}
+                )
+                continue
+            instance_dict = item.model_dump()
+            try:
+                instance_dict["sets"] = self.set_service.prepare_sets(instance_dict.get("sets") or [])
+            except (TypeError, ValueError) as exc:
+                errors.append({"index": index, "detail": str(exc)})
+                continue
+            rows.append(instance_dict)
+
+        if errors:
+            logger.warning("exercise_instances_batch_rejected", user_id=self.user_id, errors=len(errors))
+            raise InstanceBatchValidationError(errors)
+
+        created = await self.repository.create_exercise_instances_batch(self.db, rows, self.user_id)
+        await invalidate_instance_cache(
+            user_id=self.user_id,
+            workout_ids={instance["workout_id"] for instance in created},
+        )
+        return created
+
     async def update_instance(self, instance_id: int, update_data: schemas.ExerciseInstanceBase) -> dict:
         db_instance = await self.repository.get_exercise_instance(self.db, instance_id, self.user_id)
         if not db_instance:
@@ -193,6 +259,62 @@ class ExerciseInstanceService:
         )
         return serialized
 
+    async def update_sets_batch(self, items: list[schemas.ExerciseSetPatch]) -> dict:
+        patches_by_instance: dict[int, list[schemas.ExerciseSetPatch]] = {}
+        for item in items:
+            patches_by_instance.setdefault(item.instance_id, []).append(item)
+
+        db_instances = await self.repository.get_exercise_instances_by_ids(
+            self.db, list(patches_by_instance), self.user_id
+        )
+        instances_by_id = {instance.id: instance for instance in db_instances}
+
+        updated: list[dict] = []
+        skipped: list[dict] = []
+        pending: list[tuple[Any, list]] = []
+        for instance_id, patches in patches_by_instance.items():
+            db_instance = instances_by_id.get(instance_id)
+            if db_instance is None or not isinstance(db_instance.sets, list):
+                skipped.extend({"instance_id": p.instance_id, "set_id": p.set_id} for p in patches)
+                continue
+            new_sets = db_instance.sets
+            instance_updated = False
+            for patch in patches:
+                update_data = patch.patch.model_dump(exclude_unset=True)
+                if "rpe" in update_data and "effort" not in update_data:
+                    update_data["effort"] = update_data.get("rpe")
+                if "effort" in update_data and "rpe" not in update_data:
+                    update_data["rpe"] = update_data.get("effort")
+                ref = {"instance_id": instance_id, "set_id": patch.set_id}
+                try:
+                    new_sets = self.set_service.update_set(new_sets, patch.set_id, update_data)
+                except ValueError:
+                    skipped.append(ref)
+                    continue
+                updated.append(ref)
+                instance_updated = True
+            if instance_updated:
+                pending.append((db_instance, new_sets))
+
+        serialized: list[dict] = []
+        if pending:
+            saved = await self.repository.update_exercise_instances_sets(self.db, pending)
+            serialized = [self._serialize_instance(instance) for instance in saved]
+            await invalidate_instance_cache(
+                user_id=self.user_id,
+                instance_ids=[instance.get("id") for instance in serialized],
+                workout_ids={instance.get("workout_id") for instance in serialized},
+            )
+
+        logger.info(
+            "exercise_sets_batch_updated",
+            user_id=self.user_id,
+            instances=len(serialized),
+            updated=len(updated),
+            skipped=len(skipped),
+        )
+        return {"updated": updated, "skipped": skipped, "instances": serialized}
+
     async def delete_set(self, instance_id: int, set_id: int) -> None:
         db_instance = await self.repository.get_exercise_instance(self.db, instance_id, self.user_id)
         if not db_instance:
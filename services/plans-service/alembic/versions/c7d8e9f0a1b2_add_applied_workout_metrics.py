@@ -0,0 +1,52 @@
+"""add applied_workout_metrics table
+
+Revision ID: c7d8e9f0a1b2
+Revises: 9abcde123456
+Create Date: 2026-10-16 10:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "c7d8e9f0a1b2"
+down_revision: str | None = "9abcde123456"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "applied_workout_metrics",
+        sa.Column("id", sa.Integer(), primary_key=True, nullable=False),
+        sa.Column(
+            "applied_plan_id",
+            sa.Integer(),
+            sa.ForeignKey("applied_calendar_plans.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("workout_id", sa.Integer(), nullable=False),
+        sa.Column("order_index", sa.Integer(), nullable=False),
+        sa.Column("workout_date", sa.String(length=64), nullable=True),
+        sa.Column("readiness_score", sa.Float(), nullable=True),
+        sa.Column("rpe_session", sa.Float(), nullable=True),
+        sa.Column("total_reps", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("exercises", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.UniqueConstraint("applied_plan_id", "workout_id", name="uq_applied_workout_metrics_workout"),
+    )
+    op.create_index("ix_applied_workout_metrics_id", "applied_workout_metrics", ["id"], unique=False)
+    op.create_index(
+        "ix_applied_workout_metrics_applied_plan_id",
+        "applied_workout_metrics",
+        ["applied_plan_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_applied_workout_metrics_applied_plan_id", table_name="applied_workout_metrics")
+    op.drop_index("ix_applied_workout_metrics_id", table_name="applied_workout_metrics")
+    op.drop_table("applied_workout_metrics")
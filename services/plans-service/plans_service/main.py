@@ -3,6 +3,7 @@ import uuid
 
 import structlog
 from asgi_correlation_id import CorrelationIdMiddleware
+from backend_common.http_client import close_http_clients
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from prometheus_fastapi_instrumentator import Instrumentator
@@ -75,6 +76,7 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     await close_redis()
+    await close_http_clients()
 
 
 origins = [
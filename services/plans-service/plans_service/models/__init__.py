@@ -10,7 +10,7 @@ from .calendar import (  # noqa: F401
     PlanSet,
     PlanWorkout,
 )
-from .macro import PlanMacro  # noqa: F401
+from .macro import AppliedWorkoutMetrics, PlanMacro  # noqa: F401
 from .templates import MesocycleTemplate, MicrocycleTemplate  # noqa: F401
 
 __all__ = [
@@ -25,6 +25,7 @@ __all__ = [
     "PlanSet",
     "PlanWorkout",
     "PlanMacro",
+    "AppliedWorkoutMetrics",
     "MesocycleTemplate",
     "MicrocycleTemplate",
 ]
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import JSON, Boolean, Column, DateTime, Float, ForeignKey, Integer, String, Text, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from .calendar import Base
@@ -24,3 +24,27 @@ class PlanMacro(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     calendar_plan = relationship("CalendarPlan", back_populates="macros", passive_deletes=True)
+
+
+class AppliedWorkoutMetrics(Base):
+    """Compact per-workout metric snapshot that macro triggers read instead of re-deriving history."""
+
+    __tablename__ = "applied_workout_metrics"
+    __table_args__ = (UniqueConstraint("applied_plan_id", "workout_id", name="uq_applied_workout_metrics_workout"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    applied_plan_id = Column(
+        Integer, ForeignKey("applied_calendar_plans.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    workout_id = Column(Integer, nullable=False)
+    order_index = Column(Integer, nullable=False)
+
+    workout_date = Column(String(64), nullable=True)
+    readiness_score = Column(Float, nullable=True)
+    rpe_session = Column(Float, nullable=True)
+    total_reps = Column(Integer, nullable=False, default=0)
+    # {exercise_id: {"e1rm", "reps", "rpe_delta": [sum, count], "reps_delta": [sum, count]}}
+    exercises = Column(JSON, nullable=False, default=dict)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -117,6 +117,10 @@ async def apply_plan_macros(
 
         applier = MacroApplier(user_id=user_id)
         patch_result = await applier.apply(preview)
+        # Patched workouts no longer match their stored metric snapshots.
+        await engine.invalidate_workout_metrics(
+            applied_plan_id, (detail["workout_id"] for detail in patch_result.get("details") or [])
+        )
         return {
             "preview": preview,
             "plan_changes": plan_changes_results,
@@ -293,6 +297,7 @@ async def apply_plan(
     plan_id: int,
     compute: ApplyPlanComputeSettings,
     user_max_ids: str = Query(..., description="Comma-separated list of user_max IDs"),
+    resume: bool = Query(False, description="Continue an interrupted application of this plan"),
     db: Session = Depends(get_db),
     user_id: str = Depends(get_current_user_id),
 ):
@@ -307,7 +312,7 @@ async def apply_plan(
             user_max_ids=user_max_ids_list,
         )
         service = AppliedCalendarPlanService(db, user_id)
-        result = await service.apply_plan(plan_id, compute, user_max_ids_list)
+        result = await service.apply_plan(plan_id, compute, user_max_ids_list, resume=resume)
         logger.info(
             "applied_plan_apply_success",
             user_id=user_id,
@@ -352,12 +357,18 @@ async def apply_plan_async(
 async def run_plan_macros(
     applied_plan_id: int,
     index_offset: int = Query(1, description="Offset to apply to current_workout_index when evaluating macros"),
+    workout_id: int | None = Query(None, description="Just-finished workout whose metric snapshot should be stored"),
     db: Session = Depends(get_db),
     user_id: str = Depends(get_current_user_id),
 ):
     try:
         engine = MacroEngine(db, user_id)
-        result = await engine.run_for_applied_plan(applied_plan_id, anchor="current", index_offset=index_offset)
+        result = await engine.run_for_applied_plan(
+            applied_plan_id,
+            anchor="current",
+            index_offset=index_offset,
+            finished_workout_id=workout_id,
+        )
         return result
     except Exception as e:
         raise HTTPException(
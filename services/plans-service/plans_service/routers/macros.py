@@ -14,6 +14,7 @@ from ..schemas.macro import (
     PlanMacroResponse,
     PlanMacroUpdate,
 )
+from ..services.macro_rules import invalidate_compiled_macro
 
 router = APIRouter(prefix="/calendar-plans/{plan_id}/macros", tags=["plan-macros"])
 
@@ -114,6 +115,7 @@ async def update_macro(
         obj.rule_json = _safe_dump_json(payload.rule.model_dump())
     await db.flush()
     await db.commit()
+    invalidate_compiled_macro(macro_id)
     await db.refresh(obj)
     return PlanMacroResponse(
         id=obj.id,
@@ -138,6 +140,7 @@ async def delete_macro(
     stmt = delete(PlanMacro).where(PlanMacro.id == macro_id, PlanMacro.calendar_plan_id == plan_id)
     await db.execute(stmt)
     await db.commit()
+    invalidate_compiled_macro(macro_id)
 
     return
 
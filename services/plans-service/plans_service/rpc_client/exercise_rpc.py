@@ -1,6 +1,7 @@
 import os
 
 import httpx
+from backend_common.http_client import borrow_http_client
 from fastapi import APIRouter, HTTPException
 
 EXERCISE_SERVICE_URL = os.getenv("EXERCISES_SERVICE_URL") or os.getenv("GATEWAY_URL")
@@ -14,7 +15,7 @@ router = APIRouter()
 
 async def create_exercise_instances_batch(instances: list) -> list:
     try:
-        async with httpx.AsyncClient() as client:
+        async with borrow_http_client("exercises") as client:
             response = await client.post(
                 f"{EXERCISE_SERVICE_URL}/api/v1/exercises/instances/batch",
                 json=instances,
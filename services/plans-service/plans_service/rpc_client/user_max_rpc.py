@@ -1,6 +1,7 @@
 import os
 
 import httpx
+from backend_common.http_client import borrow_http_client
 from fastapi import APIRouter, HTTPException
 
 USER_MAX_SERVICE_URL = os.getenv("USER_MAX_SERVICE_URL") or os.getenv("GATEWAY_URL")
@@ -14,7 +15,7 @@ router = APIRouter()
 
 async def get_true_1rm(user_max_id: int) -> float:
     try:
-        async with httpx.AsyncClient() as client:
+        async with borrow_http_client("user-max") as client:
             response = await client.post(
                 f"{USER_MAX_SERVICE_URL}/api/v1/user-maxes/calculate-true-1rm",
                 json={"user_max_id": user_max_id},
@@ -28,7 +29,7 @@ async def get_true_1rm(user_max_id: int) -> float:
 
 async def get_user_maxes_by_exercises(exercise_ids: list[int]) -> list[dict]:
     try:
-        async with httpx.AsyncClient() as client:
+        async with borrow_http_client("user-max") as client:
             response = await client.post(
                 f"{USER_MAX_SERVICE_URL}/api/v1/user-maxes/by-exercises",
                 json={"exercise_ids": exercise_ids},
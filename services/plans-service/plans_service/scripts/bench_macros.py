@@ -0,0 +1,307 @@
+"""
+Benchmark ``MacroEngine.run_for_applied_plan`` and ``MacroApplier.apply`` on synthetic plans.
+
+The workouts/exercises services are replaced by an in-process ASGI stub, and plans data lives in an
+in-memory SQLite database, so no other container is needed (requires ``aiosqlite``)::
+
+    python -m plans_service.scripts.bench_macros --mesocycles 4 --workouts 12 --exercises 6 --output bench.json
+
+One JSON record is emitted per macro type and phase with wall time, downstream request counts and
+peak traced memory.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any
+
+import httpx
+import structlog
+from backend_common.http_client import close_http_clients
+from fastapi import Body, FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from ..models.calendar import AppliedCalendarPlan, AppliedPlanWorkout, Base, CalendarPlan
+from ..models.macro import PlanMacro
+from ..services.macro_apply import MacroApplier
+from ..services.macro_engine import MacroEngine
+
+STUB_BASE_URL = "http://bench-stub"
+BENCH_USER_ID = "bench-user"
+
+MACRO_RULES: dict[str, dict[str, Any]] = {
+    "e1rm_trend": {
+        "trigger": {"metric": "Performance_Trend", "exercise_id": 1},
+        "condition": {"op": "stagnates_for", "n": 3, "epsilon_percent": 50.0},
+    },
+    "reps_delta": {
+        "trigger": {"metric": "Reps_Delta_From_Plan", "exercise_id": 1},
+        "condition": {"op": "holds_for", "relation": ">=", "value": -5, "n": 3},
+    },
+    "readiness": {
+        "trigger": {"metric": "Readiness_Score"},
+        "condition": {"op": "holds_for", "relation": "<=", "value": 10, "n": 3},
+    },
+}
+
+
+class SyntheticPlan:
+    """Deterministic workouts and exercise instances for ``mesocycles * workouts`` sessions."""
+
+    def __init__(self, mesocycles: int, workouts: int, exercises: int, sets: int) -> None:
+        self.workout_ids = list(range(1, mesocycles * workouts + 1))
+        start = datetime(2025, 1, 6)
+        self.workouts: dict[int, dict[str, Any]] = {}
+        self.instances: dict[int, list[dict[str, Any]]] = {}
+        set_id = 0
+        for idx, wid in enumerate(self.workout_ids):
+            planned: list[dict[str, Any]] = []
+            actual: list[dict[str, Any]] = []
+            for eid in range(1, exercises + 1):
+                plan_sets: list[dict[str, Any]] = []
+                done_sets: list[dict[str, Any]] = []
+                for k in range(sets):
+                    set_id += 1
+                    volume = 5 + (k % 3)
+                    plan_sets.append({"id": set_id, "volume": volume, "intensity": 75, "effort": 8})
+                    done_sets.append(
+                        {
+                            "id": set_id,
+                            "reps": volume - (idx + k) % 2,
+                            "volume": volume,
+                            "weight": 60.0 + eid * 5 + (idx % 4) * 2.5,
+                            "rpe": 8 + (k % 2) * 0.5,
+                            "effort": 8,
+                            "intensity": 75,
+                        }
+                    )
+                planned.append({"exercise_id": eid, "sets": plan_sets})
+                actual.append(
+                    {
+                        "id": wid * 1000 + eid,
+                        "workout_id": wid,
+                        "exercise_list_id": eid,
+                        "user_max_id": None,
+                        "notes": None,
+                        "order": eid,
+                        "sets": done_sets,
+                    }
+                )
+            day = start + timedelta(days=2 * idx)
+            self.workouts[wid] = {
+                "id": wid,
+                "exercises": planned,
+                "scheduled_for": day.isoformat(),
+                "completed_at": day.isoformat(),
+                "readiness_score": 5 + idx % 4,
+                "rpe_session": 7.5,
+            }
+            self.instances[wid] = actual
+
+
+def build_stub_app(plan: SyntheticPlan, requests: Counter[str]) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/workouts/by-ids")
+    async def workouts_by_ids(payload: dict[str, Any] = Body(...)) -> list[dict[str, Any]]:
+        requests["POST /workouts/by-ids"] += 1
+        fields = set(payload.get("fields") or [])
+        out = []
+        for wid in payload.get("ids") or []:
+            workout = plan.workouts.get(int(wid))
+            if workout:
+                out.append({k: v for k, v in workout.items() if k == "id" or not fields or k in fields})
+        return out
+
+    @app.post("/exercises/instances/by-workouts")
+    async def instances_by_workouts(payload: dict[str, Any] = Body(...)) -> dict[str, list[dict[str, Any]]]:
+        requests["POST /exercises/instances/by-workouts"] += 1
+        return {str(wid): plan.instances.get(int(wid), []) for wid in payload.get("workout_ids") or []}
+
+    @app.get("/exercises/definitions")
+    async def definitions() -> list[dict[str, Any]]:
+        requests["GET /exercises/definitions"] += 1
+        return []
+
+    @app.post("/exercises/instances/sets/batch-update")
+    async def update_sets_batch(payload: dict[str, Any] = Body(...)) -> dict[str, Any]:
+        requests["POST /exercises/instances/sets/batch-update"] += 1
+        refs = [{"instance_id": i["instance_id"], "set_id": i["set_id"]} for i in payload.get("items") or []]
+        return {"updated": refs, "skipped": [], "instances": []}
+
+    @app.put("/exercises/instances/{instance_id}")
+    async def put_instance(instance_id: int, payload: dict[str, Any] = Body(...)) -> dict[str, Any]:
+        requests["PUT /exercises/instances/{instance_id}"] += 1
+        return {**payload, "id": instance_id}
+
+    return app
+
+
+@contextmanager
+def route_httpx_to(app: FastAPI) -> Iterator[None]:
+    """
+    Send every ``httpx.AsyncClient`` created inside the block to ``app`` instead of the network.
+
+    This covers the pooled clients too, as long as the registry creates them inside the block; callers
+    close them with ``close_http_clients`` before switching to another stub.
+    """
+    original = httpx.AsyncClient
+
+    class _StubClient(original):
+        def __init__(self, *args: Any, **kwargs: Any) -> None:
+            kwargs["transport"] = httpx.ASGITransport(app=app)
+            super().__init__(*args, **kwargs)
+
+    httpx.AsyncClient = _StubClient
+    try:
+        yield
+    finally:
+        httpx.AsyncClient = original
+
+
+async def _seed(session: AsyncSession, plan: SyntheticPlan, rule: dict[str, Any], current_index: int) -> int:
+    calendar_plan = CalendarPlan(id=1, root_plan_id=1, name="bench", duration_weeks=4, user_id=BENCH_USER_ID)
+    applied = AppliedCalendarPlan(
+        calendar_plan_id=1,
+        user_id=BENCH_USER_ID,
+        current_workout_index=current_index,
+        status="active",
+    )
+    session.add_all([calendar_plan, applied])
+    await session.flush()
+    session.add_all(
+        AppliedPlanWorkout(applied_plan_id=applied.id, workout_id=wid, order_index=idx)
+        for idx, wid in enumerate(plan.workout_ids)
+    )
+    action = {"type": "Adjust_Reps", "params": {"mode": "by_Value", "value": -1}, "target": {"exercise_id": 1}}
+    session.add(
+        PlanMacro(
+            calendar_plan_id=1,
+            name="bench",
+            priority=1,
+            rule_json=json.dumps({**rule, "action": action, "duration": {"scope": "Next_N_Workouts", "count": 3}}),
+        )
+    )
+    applied_plan_id = applied.id
+    await session.commit()
+    return applied_plan_id
+
+
+async def _measure(phase: str, macro_type: str, requests: Counter[str], coro) -> tuple[dict[str, Any], Any]:
+    requests.clear()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = await coro
+    wall_ms = (time.perf_counter() - started) * 1000.0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    record = {
+        "macro_type": macro_type,
+        "phase": phase,
+        "wall_ms": round(wall_ms, 3),
+        "downstream_requests": sum(requests.values()),
+        "requests_by_route": dict(sorted(requests.items())),
+        "peak_memory_kib": round(peak / 1024.0, 1),
+    }
+    return record, result
+
+
+async def bench_macro(macro_type: str, args: argparse.Namespace) -> list[dict[str, Any]]:
+    plan = SyntheticPlan(args.mesocycles, args.workouts, args.exercises, args.sets)
+    requests: Counter[str] = Counter()
+    db_engine = create_async_engine("sqlite+aiosqlite://")
+    async with db_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(db_engine, expire_on_commit=False)
+
+    size = {
+        "mesocycles": args.mesocycles,
+        "workouts_per_mesocycle": args.workouts,
+        "exercises_per_workout": args.exercises,
+        "sets_per_exercise": args.sets,
+        "workouts_total": len(plan.workout_ids),
+    }
+    current_index = len(plan.workout_ids) // 2
+    records: list[dict[str, Any]] = []
+    with route_httpx_to(build_stub_app(plan, requests)):
+        async with session_factory() as session:
+            applied_plan_id = await _seed(session, plan, MACRO_RULES[macro_type], current_index)
+            preview: dict[str, Any] = {}
+            # "cold" derives history from the stub, "warm" reads the snapshots the cold run stored.
+            for phase in ("run_cold", "run_warm"):
+                engine = MacroEngine(session, BENCH_USER_ID)
+                record, preview = await _measure(
+                    phase,
+                    macro_type,
+                    requests,
+                    engine.run_for_applied_plan(applied_plan_id, anchor="current", index_offset=0),
+                )
+                record["patches"] = sum(len(item.get("patches") or []) for item in preview.get("preview", []))
+                if record["patches"] <= 0:
+                    # An empty preview would make the apply phase a no-op and the numbers meaningless.
+                    raise RuntimeError(f"{macro_type} {phase}: macro produced no patches")
+                records.append(record)
+            applier = MacroApplier(BENCH_USER_ID)
+            record, applied = await _measure("apply", macro_type, requests, applier.apply(preview))
+            record["applied"] = applied.get("applied", 0)
+            record["errors"] = len(applied.get("errors") or [])
+            records.append(record)
+    await close_http_clients()
+    await db_engine.dispose()
+    for record in records:
+        record.update(size)
+    return records
+
+
+async def run(args: argparse.Namespace) -> list[dict[str, Any]]:
+    os.environ["WORKOUTS_SERVICE_URL"] = STUB_BASE_URL
+    os.environ["EXERCISES_SERVICE_URL"] = STUB_BASE_URL
+    results: list[dict[str, Any]] = []
+    for macro_type in args.macro_types:
+        for _ in range(args.repeat):
+            results.extend(await bench_macro(macro_type, args))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark macro evaluation and application on synthetic plans")
+    parser.add_argument("--mesocycles", type=int, default=4)
+    parser.add_argument("--workouts", type=int, default=12, help="Workouts per mesocycle")
+    parser.add_argument("--exercises", type=int, default=6, help="Exercises per workout")
+    parser.add_argument("--sets", type=int, default=4, help="Sets per exercise")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument(
+        "--macro-types",
+        nargs="+",
+        choices=sorted(MACRO_RULES),
+        default=sorted(MACRO_RULES),
+    )
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    parser.add_argument("--log-level", default="WARNING", help="Service log level while benchmarking")
+    args = parser.parse_args()
+
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(getattr(logging, args.log_level.upper(), logging.WARNING))
+    )
+    results = asyncio.run(run(args))
+    payload = json.dumps({"benchmark": "macros", "results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(payload + "\n")
+    else:
+        sys.stdout.write(payload + "\n")
+
+
+if __name__ == "__main__":
+    main()
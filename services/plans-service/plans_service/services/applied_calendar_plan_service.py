@@ -1,28 +1,31 @@
 import asyncio
-import math
 import os
 import urllib.parse
 from collections import defaultdict
+from collections.abc import AsyncIterator, Callable
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
 import httpx
+import numpy as np
 import structlog
-from backend_common.http_client import ServiceClient
-from sqlalchemy import select, update
+from backend_common.http_client import ServiceClient, borrow_http_client
+from backend_common.rpe_grid import as_float_array, get_rpe_grid, to_python
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from .. import workout_calculation
 from ..models.calendar import (
     AppliedCalendarPlan,
+    AppliedPlanWorkout,
     CalendarPlan,
     Mesocycle,
     Microcycle,
     PlanExercise,
     PlanWorkout,
 )
-from ..rpc import get_effort, get_intensity, get_volume
+from ..models.macro import AppliedWorkoutMetrics
 from ..schemas.calendar_plan import (
     AppliedCalendarPlanResponse,
     ApplyPlanComputeSettings,
@@ -36,6 +39,9 @@ from .template_service import TemplateService
 
 logger = structlog.get_logger(__name__)
 
+APPLY_PLAN_CHUNK_SIZE = int(os.getenv("APPLY_PLAN_CHUNK_SIZE", "28"))
+APPLY_PLAN_PENDING_STATUS = "applying"
+
 
 class AppliedCalendarPlanService:
     def __init__(self, db: AsyncSession, user_id: str):
@@ -62,12 +68,12 @@ class AppliedCalendarPlanService:
         base = "http://user-max-service:8003/user-max"
         headers = self._auth_headers()
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with borrow_http_client("user-max") as client:
 
             async def fetch_one(ex_id):
                 try:
                     url = f"{base}/by_exercise/{ex_id}"
-                    response = await client.get(url, headers=headers)
+                    response = await client.get(url, headers=headers, timeout=10.0)
                     response.raise_for_status()
                     data = response.json()
                     if isinstance(data, list):
@@ -89,11 +95,11 @@ class AppliedCalendarPlanService:
         headers = self._auth_headers()
         base = "http://user-max-service:8003"
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with borrow_http_client("user-max") as client:
             try:
                 url = f"{base}/user-max/by-ids"
                 params = {"ids": user_max_ids}
-                response = await client.get(url, params=params, headers=headers)
+                response = await client.get(url, params=params, headers=headers, timeout=10.0)
                 response.raise_for_status()
                 data = response.json()
                 if isinstance(data, list):
@@ -109,11 +115,11 @@ class AppliedCalendarPlanService:
         base = os.getenv("EXERCISES_SERVICE_URL", "http://exercises-service:8002")
         headers = self._auth_headers()
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with borrow_http_client("exercises") as client:
             for ex_id in exercise_ids:
                 try:
                     url = f"{base.rstrip('/')}/exercises/definitions/{ex_id}"
-                    response = await client.get(url, headers=headers)
+                    response = await client.get(url, headers=headers, timeout=10.0)
                     if response.status_code == 200:
                         continue
                 except httpx.RequestError:
@@ -130,8 +136,8 @@ class AppliedCalendarPlanService:
         url = f"{base.rstrip('/')}/exercises/definitions"
 
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(url, params=params, headers=headers)
+            async with borrow_http_client("exercises") as client:
+                response = await client.get(url, params=params, headers=headers, timeout=10.0)
                 response.raise_for_status()
                 data = response.json()
                 if not isinstance(data, list):
@@ -182,7 +188,7 @@ class AppliedCalendarPlanService:
             workout_count=len(workouts),
         )
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with borrow_http_client("workouts") as client:
             for base in bases:
                 paths = ["workouts/workout-generation/generate"]
                 for path in paths:
@@ -199,6 +205,7 @@ class AppliedCalendarPlanService:
                                 "workouts": workouts,
                             },
                             headers=headers,
+                            timeout=30.0,
                         )
                         response.raise_for_status()
                         body = response.json()
@@ -232,19 +239,20 @@ class AppliedCalendarPlanService:
     ) -> None:
         if not workout_ids or not workouts_to_generate:
             return
-        base = os.getenv("EXERCISES_SERVICE_URL", "http://exercises-service:8002")
+        base = os.getenv("EXERCISES_SERVICE_URL", "http://exercises-service:8002").rstrip("/")
+        url = f"{base}/exercises/instances/batch"
+        chunk_size = max(1, int(os.getenv("APPLY_PLAN_INSTANCES_CHUNK", "50")))
 
         headers = self._auth_headers()
-        async with httpx.AsyncClient(timeout=20.0) as client:
-            for idx, workout_id in enumerate(workout_ids):
-                if idx >= len(workouts_to_generate):
-                    break
-                src = workouts_to_generate[idx]
-                exercises = src.get("exercises") or []
-                for ex in exercises:
-                    sets_payload = []
-                    for s in ex.get("sets") or []:
-                        sets_payload.append(
+        pairs = list(zip(workout_ids, workouts_to_generate, strict=False))
+        async with ServiceClient(timeout=30.0, service="exercises") as client:
+            for start in range(0, len(pairs), chunk_size):
+                chunk = pairs[start : start + chunk_size]
+                instances_payload = [
+                    {
+                        "workout_id": workout_id,
+                        "exercise_list_id": ex.get("exercise_id"),
+                        "sets": [
                             {
                                 "reps": s.get("volume"),
                                 "weight": s.get("working_weight"),
@@ -254,29 +262,284 @@ class AppliedCalendarPlanService:
                                 "intensity": s.get("intensity"),
                                 "volume": s.get("volume"),
                             }
-                        )
-                    instance_payload = {
-                        "exercise_list_id": ex.get("exercise_id"),
-                        "sets": sets_payload,
+                            for s in ex.get("sets") or []
+                        ],
                         "notes": None,
                         "order": None,
                         "user_max_id": None,
                     }
-                    url = f"{base}/exercises/instances/workouts/{workout_id}/instances"
-                    try:
-                        res = await client.post(url, json=instance_payload, headers=headers)
+                    for workout_id, src in chunk
+                    for ex in src.get("exercises") or []
+                ]
+                if not instances_payload:
+                    continue
+                resp = await client.post(
+                    url,
+                    headers=headers,
+                    json=instances_payload,
+                    expected_status=(200, 201),
+                    workouts_count=len(chunk),
+                    instances_count=len(instances_payload),
+                )
+                if not resp.success:
+                    logger.warning(
+                        "apply_plan_instances_batch_failed",
+                        first_workout_id=chunk[0][0],
+                        workouts_count=len(chunk),
+                        status_code=resp.status_code,
+                        error=resp.error,
+                    )
+                    raise RuntimeError(
+                        f"Failed to create exercise instances for workouts starting at {chunk[0][0]}: "
+                        f"status={resp.status_code} error={resp.error}"
+                    )
 
-                        if res.status_code not in (200, 201):
-                            print(
-                                f"[APPLY_PLAN] Failed to create instance for workout {workout_id}: "
-                                f"status={res.status_code} body={res.text}"
-                            )
-                    except httpx.RequestError as e:
-                        print(f"[APPLY_PLAN] Exception creating instance for workout {workout_id}: {e}")
+    async def _find_resumable_applied_plan(self, plan_id: int) -> AppliedCalendarPlan | None:
+        stmt = (
+            select(AppliedCalendarPlan)
+            .where(
+                AppliedCalendarPlan.user_id == self.user_id,
+                AppliedCalendarPlan.calendar_plan_id == plan_id,
+                AppliedCalendarPlan.status == APPLY_PLAN_PENDING_STATUS,
+            )
+            .order_by(AppliedCalendarPlan.id.desc())
+            .limit(1)
+        )
+        result = await self.db.execute(stmt)
+        return result.scalars().first()
+
+    async def _count_applied_plan_workouts(self, applied_plan_id: int) -> int:
+        result = await self.db.execute(
+            select(func.count())
+            .select_from(AppliedPlanWorkout)
+            .where(AppliedPlanWorkout.applied_plan_id == applied_plan_id)
+        )
+        return int(result.scalar() or 0)
+
+    async def _fetch_generated_workout_ids(self, applied_plan_id: int, plan_order_indices: list[int]) -> dict[int, int]:
+        """Workouts already generated for ``applied_plan_id`` by an interrupted run, keyed by plan order index."""
+        base = os.getenv("WORKOUTS_SERVICE_URL", "http://localhost:8004").rstrip("/")
+        async with ServiceClient(timeout=10.0, service="workouts") as client:
+            workouts = await client.get_json(
+                f"{base}/workouts/",
+                headers=self._auth_headers(),
+                params={"applied_plan_id": applied_plan_id, "limit": 1000},
+                default=[],
+            )
+        wanted = set(plan_order_indices)
+        return {
+            w["plan_order_index"]: w["id"]
+            for w in workouts
+            if isinstance(w, dict) and w.get("plan_order_index") in wanted and isinstance(w.get("id"), int)
+        }
+
+    async def _fetch_workouts_with_instances(self, workout_ids: list[int]) -> set[int]:
+        base = os.getenv("EXERCISES_SERVICE_URL", "http://exercises-service:8002").rstrip("/")
+        async with ServiceClient(timeout=10.0, service="exercises") as client:
+            resp = await client.post(
+                f"{base}/exercises/instances/by-workouts",
+                headers=self._auth_headers(),
+                json={"workout_ids": workout_ids},
+                expected_status=200,
+            )
+        grouped = resp.json_or({})
+        if not isinstance(grouped, dict):
+            return set()
+        return {int(wid) for wid, items in grouped.items() if items}
+
+    async def _apply_workouts_chunk(
+        self,
+        applied_plan_id: int,
+        chunk: list[dict[str, Any]],
+        compute: ApplyPlanComputeSettings,
+        reconcile: bool = False,
+    ) -> int:
+        """
+        Generate one chunk of workouts with their exercise instances and commit the plan links.
+
+        ``reconcile`` is set for the first chunk after a resume: workouts and instances that the
+        interrupted run created before its commit are reused instead of being created twice.
+        """
+        existing: dict[int, int] = {}
+        if reconcile:
+            existing = await self._fetch_generated_workout_ids(applied_plan_id, [w["plan_order_index"] for w in chunk])
+        pending = [w for w in chunk if w["plan_order_index"] not in existing]
+
+        ids_by_order = dict(existing)
+        if pending:
+            generated = await self._generate_workouts_via_rpc(applied_plan_id, pending, compute)
+            if not generated or len(generated) != len(pending):
+                raise RuntimeError(
+                    f"workouts-service generated {len(generated or [])} of {len(pending)} workouts "
+                    f"for applied plan {applied_plan_id}"
+                )
+            ids_by_order.update(zip((w["plan_order_index"] for w in pending), generated, strict=True))
+
+        with_instances = await self._fetch_workouts_with_instances(list(existing.values())) if existing else set()
+        needs_instances = [w for w in chunk if ids_by_order[w["plan_order_index"]] not in with_instances]
+        # A failure aborts the chunk before its commit; a resumed apply reuses the generated workouts
+        # and creates their instances again.
+        await self._create_instances_for_workouts(
+            [ids_by_order[w["plan_order_index"]] for w in needs_instances], needs_instances
+        )
+
+        self.db.add_all(
+            AppliedPlanWorkout(
+                applied_plan_id=applied_plan_id,
+                workout_id=ids_by_order[w["plan_order_index"]],
+                order_index=w["plan_order_index"],
+            )
+            for w in chunk
+        )
+        await self.db.commit()
+        logger.info(
+            "apply_plan_chunk_committed",
+            applied_plan_id=applied_plan_id,
+            first_order_index=chunk[0]["plan_order_index"],
+            workouts_count=len(chunk),
+        )
+        return len(chunk)
+
+    @staticmethod
+    def _snapshot_plan_microcycles(mesocycles: list[Mesocycle], microcycles: list[Microcycle]) -> list[dict[str, Any]]:
+        """Plain, ordered copy of the microcycles that ``_iter_plan_workouts`` walks."""
+        meso_id_to_micro: dict[int, list[Microcycle]] = {}
+        for mc in microcycles:
+            meso_id_to_micro.setdefault(mc.mesocycle_id, []).append(mc)
+
+        snapshot: list[dict[str, Any]] = []
+        for mi, meso in enumerate(mesocycles, start=1):
+            for mci, mc in enumerate(meso_id_to_micro.get(meso.id, []), start=1):
+                snapshot.append(
+                    {
+                        "label": f"M{mi}-MC{mci}",
+                        "normalization_value": mc.normalization_value,
+                        "normalization_unit": mc.normalization_unit,
+                        "normalization_rules": mc.normalization_rules,
+                        "workouts": [
+                            {
+                                "day_label": workout.day_label,
+                                "exercises": [
+                                    {
+                                        "exercise_id": exercise.exercise_definition_id,
+                                        "sets": [
+                                            {"intensity": s.intensity, "effort": s.effort, "volume": s.volume}
+                                            for s in exercise.sets
+                                        ],
+                                    }
+                                    for exercise in workout.exercises
+                                ],
+                            }
+                            for workout in sorted(mc.plan_workouts, key=lambda w: (w.order_index, w.id))
+                        ],
+                    }
+                )
+        return snapshot
+
+    async def _iter_plan_workouts(
+        self,
+        plan_start: datetime,
+        plan_microcycles: list[dict[str, Any]],
+        user_maxes: list[dict],
+        user_max_by_exercise: dict[int, dict],
+        exercise_scope: dict[str, dict[str, set[int]]],
+        compute: ApplyPlanComputeSettings,
+        headers: dict[str, str],
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield workouts to generate in plan order, computing sets one microcycle at a time."""
+        plan_order = 0
+        effective_1rms: dict[int, float] = {}
+        for um in user_maxes:
+            base_true = await workout_calculation.WorkoutCalculator.get_true_1rm_from_user_max(um, headers=headers)
+            effective_1rms[um["exercise_id"]] = float(base_true if base_true is not None else um["max_weight"])
+
+        for mc in plan_microcycles:
+            schedule_dict: dict[str, list[dict[str, Any]]] = defaultdict(list)
+            for workout in mc["workouts"]:
+                schedule_dict[workout["day_label"]].append(workout)
+
+            if not schedule_dict:
+                continue
+
+            # Weights depend on the 1RMs as normalized so far, so the whole microcycle is
+            # evaluated in one vectorized pass before moving on to the next one.
+            plan_sets: list[dict[str, Any]] = []
+            set_one_rms: list[float | None] = []
+            for workouts in schedule_dict.values():
+                for workout_payload in workouts:
+                    for exercise in workout_payload.get("exercises", []):
+                        user_max = user_max_by_exercise.get(exercise["exercise_id"])
+                        eff = None
+                        if compute.compute_weights and user_max is not None:
+                            eff = effective_1rms.get(user_max["exercise_id"])
+                            if eff is None:
+                                calculator = workout_calculation.WorkoutCalculator
+                                true_1rm = await calculator.get_true_1rm_from_user_max(user_max, headers=headers)
+                                eff = float(true_1rm) if true_1rm is not None else float(user_max["max_weight"])
+                                effective_1rms[user_max["exercise_id"]] = eff
+                        plan_sets.extend(exercise["sets"])
+                        set_one_rms.extend([eff] * len(exercise["sets"]))
+            computed_sets = iter(self._compute_plan_sets(plan_sets, set_one_rms, compute))
+
+            for di, (day_key, workouts) in enumerate(schedule_dict.items(), start=1):
+                label = f"{mc['label']}-D{di}: {day_key}"
+
+                for workout_index, workout_payload in enumerate(workouts, start=1):
+                    workout_exercises: list[dict[str, Any]] = []
+
+                    for exercise in workout_payload.get("exercises", []):
+                        calculated_sets = [next(computed_sets) for _ in exercise["sets"]]
+                        workout_exercises.append(
+                            {
+                                "exercise_id": exercise["exercise_id"],
+                                "sets": [
+                                    {
+                                        "exercise_id": exercise["exercise_id"],
+                                        "intensity": s["intensity"],
+                                        "effort": s["effort"],
+                                        "volume": s["volume"],
+                                        "working_weight": s["working_weight"],
+                                    }
+                                    for s in calculated_sets
+                                ],
+                            }
+                        )
+
+                    yield {
+                        "name": f"{label} - Workout {workout_index}",
+                        "scheduled_for": (plan_start + timedelta(days=plan_order)).isoformat(),
+                        "plan_order_index": plan_order,
+                        "exercises": workout_exercises,
+                    }
+                    plan_order += 1
+
+            self._apply_normalization(
+                effective_1rms,
+                mc["normalization_value"],
+                mc["normalization_unit"],
+                mc["normalization_rules"],
+                exercise_scope,
+            )
 
     async def apply_plan(
-        self, plan_id: int, compute: ApplyPlanComputeSettings, user_max_ids: list[int]
+        self,
+        plan_id: int,
+        compute: ApplyPlanComputeSettings,
+        user_max_ids: list[int],
+        *,
+        chunk_size: int | None = None,
+        progress: Callable[[dict[str, Any]], None] | None = None,
+        resume: bool = False,
     ) -> AppliedCalendarPlanResponse:
+        """
+        Apply a calendar plan as a pipeline: sets are computed microcycle by microcycle and
+        every ``chunk_size`` workouts are generated, given exercise instances and committed.
+
+        The new applied plan stays inactive with status "applying" until all workouts are committed;
+        only then is the previous active plan deactivated, in the same transaction that activates it.
+        With ``resume`` an unfinished application of the same plan is continued after its last
+        committed chunk instead of starting over. ``progress`` receives a status dict after each stage.
+        """
         try:
             user_id = self._require_user_id()
             headers = self._auth_headers()
@@ -365,216 +628,108 @@ class AppliedCalendarPlanService:
             exercise_metadata = await self._fetch_exercise_metadata(required_exercises)
             exercise_scope = self._build_exercise_scope(exercise_metadata)
 
-            stmt = (
+            # Chunk commits expire loaded ORM state, so everything read from the plan after the
+            # first commit is taken from plain snapshots made here.
+            calendar_plan_response = CalendarPlanService._get_plan_response(base_plan)
+            plan_microcycles = self._snapshot_plan_microcycles(mesocycles, microcycles)
+            workouts_total = sum(len(mc["workouts"]) for mc in plan_microcycles)
+
+            applied_plan = await self._find_resumable_applied_plan(plan_id) if resume else None
+            workouts_applied = 0
+            if applied_plan is None:
+                start_date = compute.start_date or datetime.now(UTC)
+                applied_plan = AppliedCalendarPlan(
+                    calendar_plan_id=plan_id,
+                    start_date=start_date,
+                    user_id=user_id,
+                    status=APPLY_PLAN_PENDING_STATUS,
+                    # Stays inactive, and the current plan stays active, until every workout is persisted.
+                    is_active=False,
+                )
+                total_days = 0
+                for mc in microcycles:
+                    if mc.days_count is not None:
+                        total_days += mc.days_count
+                    else:
+                        total_days += len(mc.plan_workouts)
+                applied_plan.end_date = applied_plan.start_date + timedelta(days=total_days)
+                applied_plan.start_date = applied_plan.start_date.replace(tzinfo=None)
+                applied_plan.end_date = applied_plan.end_date.replace(tzinfo=None)
+                self.db.add(applied_plan)
+                await self.db.flush()
+                applied_plan_id, plan_start = applied_plan.id, applied_plan.start_date
+                # Committed up front so that every later chunk commit can be resumed from.
+                await self.db.commit()
+            else:
+                applied_plan_id, plan_start = applied_plan.id, applied_plan.start_date
+                workouts_applied = await self._count_applied_plan_workouts(applied_plan_id)
+                logger.info(
+                    "apply_plan_resume",
+                    applied_plan_id=applied_plan_id,
+                    workouts_applied=workouts_applied,
+                )
+
+            chunk_size = max(1, chunk_size or APPLY_PLAN_CHUNK_SIZE)
+            chunks_done = 0
+
+            def report(stage: str) -> None:
+                if progress is None:
+                    return
+                progress(
+                    {
+                        "stage": stage,
+                        "applied_plan_id": applied_plan_id,
+                        "workouts_total": workouts_total,
+                        "workouts_applied": workouts_applied,
+                        "chunks_done": chunks_done,
+                    }
+                )
+
+            report("computing")
+            planned_total = 0
+            reconcile = workouts_applied > 0
+            chunk: list[dict[str, Any]] = []
+            workouts_stream = self._iter_plan_workouts(
+                plan_start,
+                plan_microcycles,
+                user_maxes,
+                user_max_by_exercise,
+                exercise_scope,
+                compute,
+                headers,
+            )
+            async for workout in workouts_stream:
+                planned_total += 1
+                if not compute.generate_workouts or workout["plan_order_index"] < workouts_applied:
+                    continue
+                chunk.append(workout)
+                if len(chunk) < chunk_size:
+                    continue
+                workouts_applied += await self._apply_workouts_chunk(applied_plan_id, chunk, compute, reconcile)
+                reconcile = False
+                chunks_done += 1
+                chunk = []
+                report("generating")
+            if chunk:
+                workouts_applied += await self._apply_workouts_chunk(applied_plan_id, chunk, compute, reconcile)
+                chunks_done += 1
+                report("generating")
+
+            # Switching plans happens in the final transaction only, so a failed or interrupted apply
+            # leaves the previous plan active and this one "applying" for a resume.
+            await self.db.execute(
                 update(AppliedCalendarPlan)
                 .where(
                     AppliedCalendarPlan.is_active.is_(True),
                     AppliedCalendarPlan.user_id == user_id,
+                    AppliedCalendarPlan.id != applied_plan_id,
                 )
                 .values(is_active=False)
             )
-            await self.db.execute(stmt)
-
-            start_date = compute.start_date or datetime.now(UTC)
-            applied_plan = AppliedCalendarPlan(
-                calendar_plan_id=plan_id,
-                start_date=start_date,
-                user_id=user_id,
-                status="active",
-            )
-            total_days = 0
-            for mc in microcycles:
-                if mc.days_count is not None:
-                    total_days += mc.days_count
-                else:
-                    total_days += len(mc.plan_workouts)
-            applied_plan.end_date = applied_plan.start_date + timedelta(days=total_days)
-            applied_plan.start_date = applied_plan.start_date.replace(tzinfo=None)
-            applied_plan.end_date = applied_plan.end_date.replace(tzinfo=None)
-            self.db.add(applied_plan)
-            await self.db.flush()
-
-            calculated_schedule: dict[str, list[dict[str, Any]]] = {}
-
-            def round_to_step(value: float) -> float:
-                step = compute.rounding_step
-                mode = compute.rounding_mode
-                if step <= 0:
-                    return value
-                ratio = value / step
-                if mode == RoundingMode.floor:
-                    return math.floor(ratio) * step
-                if mode == RoundingMode.ceil:
-                    return math.ceil(ratio) * step
-                return round(ratio) * step
-
-            plan_order = 0
-            meso_id_to_micro: dict[int, list[Microcycle]] = {}
-            for mc in microcycles:
-                meso_id_to_micro.setdefault(mc.mesocycle_id, []).append(mc)
-
-            effective_1rms: dict[int, float] = {}
-            for um in user_maxes:
-                base_true = await workout_calculation.WorkoutCalculator.get_true_1rm_from_user_max(um, headers=headers)
-                effective_1rms[um["exercise_id"]] = float(base_true if base_true is not None else um["max_weight"])
-
-            workouts_to_generate: list[dict[str, Any]] = []
-            for mi, meso in enumerate(mesocycles, start=1):
-                for mci, mc in enumerate(meso_id_to_micro.get(meso.id, []), start=1):
-                    schedule_dict: dict[str, list[dict[str, Any]]] = defaultdict(list)
-                    for workout in sorted(mc.plan_workouts, key=lambda w: (w.order_index, w.id)):
-                        workout_data = {"exercises": []}
-                        for exercise in workout.exercises:
-                            sets_data = []
-                            for s in exercise.sets:
-                                sets_data.append(
-                                    {
-                                        "intensity": s.intensity,
-                                        "effort": s.effort,
-                                        "volume": s.volume,
-                                    }
-                                )
-                            workout_data["exercises"].append(
-                                {
-                                    "exercise_id": exercise.exercise_definition_id,
-                                    "sets": sets_data,
-                                }
-                            )
-                        schedule_dict[workout.day_label].append(workout_data)
-
-                    if not schedule_dict:
-                        continue
-
-                    micro_len = mc.days_count or 0
-                    if micro_len <= 0:
-                        micro_len = max(len(schedule_dict) if schedule_dict else 0, len(mc.plan_workouts))
-                        if micro_len == 0:
-                            micro_len = 7
-
-                    for di, (day_key, workouts) in enumerate(schedule_dict.items(), start=1):
-                        label = f"M{mi}-MC{mci}-D{di}: {day_key}"
-                        calculated_schedule[label] = []
-
-                        for workout_index, workout_payload in enumerate(workouts, start=1):
-                            workout_exercises: list[dict[str, Any]] = []
-
-                            for exercise in workout_payload.get("exercises", []):
-                                user_max = user_max_by_exercise.get(exercise["exercise_id"])
-                                calculated_sets = []
-                                for set_data in exercise["sets"]:
-                                    intensity = set_data.get("intensity")
-                                    effort = set_data.get("effort")
-                                    volume = set_data.get("volume")
-                                    try:
-                                        if intensity is not None and effort is not None:
-                                            volume = await get_volume(
-                                                intensity=intensity, effort=effort, headers=headers
-                                            )
-                                        elif volume is not None and effort is not None:
-                                            intensity = await get_intensity(
-                                                volume=volume, effort=effort, headers=headers
-                                            )
-                                        elif volume is not None and intensity is not None:
-                                            effort = await get_effort(
-                                                volume=volume, intensity=intensity, headers=headers
-                                            )
-                                    except Exception:
-                                        pass
-
-                                    weight = None
-                                    if compute.compute_weights and intensity is not None and user_max is not None:
-                                        eff = effective_1rms.get(user_max["exercise_id"])
-                                        if eff is None:
-                                            true_1rm = (
-                                                await workout_calculation.WorkoutCalculator.get_true_1rm_from_user_max(
-                                                    user_max, headers=headers
-                                                )
-                                            )
-                                            eff = (
-                                                float(true_1rm)
-                                                if true_1rm is not None
-                                                else float(user_max["max_weight"])
-                                            )
-                                            effective_1rms[user_max["exercise_id"]] = eff
-                                        raw = eff * (intensity / 100.0)
-                                        weight = round_to_step(raw)
-
-                                    calculated_sets.append(
-                                        {
-                                            "intensity": intensity,
-                                            "effort": effort,
-                                            "volume": volume,
-                                            "working_weight": weight,
-                                            "weight": weight,
-                                        }
-                                    )
-
-                                calculated_schedule[label].append(
-                                    {
-                                        "exercise_id": exercise["exercise_id"],
-                                        "sets": calculated_sets,
-                                    }
-                                )
-
-                                workout_exercises.append(
-                                    {
-                                        "exercise_id": exercise["exercise_id"],
-                                        "sets": [
-                                            {
-                                                "exercise_id": exercise["exercise_id"],
-                                                "intensity": s["intensity"],
-                                                "effort": s["effort"],
-                                                "volume": s["volume"],
-                                                "working_weight": s["working_weight"],
-                                            }
-                                            for s in calculated_sets
-                                        ],
-                                    }
-                                )
-
-                            workout_name = f"{label} - Workout {workout_index}"
-                            workouts_to_generate.append(
-                                {
-                                    "name": workout_name,
-                                    "scheduled_for": (applied_plan.start_date + timedelta(days=plan_order)).isoformat(),
-                                    "plan_order_index": plan_order,
-                                    "exercises": workout_exercises,
-                                }
-                            )
-                            plan_order += 1
-
-                    self._apply_normalization(
-                        effective_1rms,
-                        mc.normalization_value,
-                        mc.normalization_unit,
-                        mc.normalization_rules,
-                        exercise_scope,
-                    )
-
-            if compute.generate_workouts:
-                workout_ids = await self._generate_workouts_via_rpc(applied_plan.id, workouts_to_generate, compute)
-                if workout_ids:
-                    from ..models.calendar import AppliedPlanWorkout
-
-                    for i, workout_id in enumerate(workout_ids):
-                        applied_workout = AppliedPlanWorkout(
-                            applied_plan_id=applied_plan.id,
-                            workout_id=workout_id,
-                            order_index=i,
-                        )
-                        self.db.add(applied_workout)
-                    await self.db.flush()
-                    try:
-                        await self._create_instances_for_workouts(workout_ids, workouts_to_generate)
-                    except Exception as e:
-                        print(f"[APPLY_PLAN] Non-fatal: failed to create some instances: {e}")
-
-            try:
-                applied_plan.planned_sessions_total = len(workouts_to_generate)
-            except Exception:
-                applied_plan.planned_sessions_total = None
-
-            calendar_plan_response = CalendarPlanService._get_plan_response(base_plan)
+            await self.db.refresh(applied_plan)
+            applied_plan.planned_sessions_total = planned_total
+            applied_plan.status = "active"
+            applied_plan.is_active = True
 
             selected_user_maxes_by_id = {um.get("id"): um for um in selected_user_maxes if um.get("id") is not None}
             ordered_user_maxes = [selected_user_maxes_by_id.get(uid) for uid in user_max_ids] if user_max_ids else []
@@ -611,6 +766,7 @@ class AppliedCalendarPlanService:
                 next_workout=None,
             )
 
+            report("done")
             return applied_plan_response
         except Exception:
             raise
@@ -873,6 +1029,53 @@ class AppliedCalendarPlanService:
             logger.exception("cancel_applied_plan_failed", applied_plan_id=applied_plan_id)
             return None
 
+    @staticmethod
+    def _compute_plan_sets(
+        sets: list[dict[str, Any]],
+        one_rms: list[float | None],
+        compute: ApplyPlanComputeSettings,
+        *,
+        recompute_volume: bool = True,
+    ) -> list[dict[str, Any]]:
+        """Fill the missing RPE dimension and working weight of every set in one vectorized pass.
+
+        With ``recompute_volume`` (apply_plan semantics) volume is always derived from intensity and
+        effort when both are present; otherwise only a single missing value is filled.
+        """
+        if not sets:
+            return []
+        grid = get_rpe_grid()
+        intensity = as_float_array(s.get("intensity") for s in sets)
+        effort = as_float_array(s.get("effort") for s in sets)
+        volume = as_float_array(s.get("volume") for s in sets)
+        has_i, has_e, has_v = ~np.isnan(intensity), ~np.isnan(effort), ~np.isnan(volume)
+
+        fill_volume = has_i & has_e if recompute_volume else has_i & has_e & ~has_v
+        fill_intensity = ~fill_volume & has_v & has_e & ~has_i
+        fill_effort = ~fill_volume & ~fill_intensity & has_v & has_i & ~has_e
+        filled_i, filled_e, filled_v = grid.fill(intensity, effort, np.where(fill_volume, np.nan, volume))
+
+        weights = grid.weights(
+            np.where(fill_intensity, filled_i, intensity),
+            as_float_array(one_rms),
+            compute.rounding_step,
+            compute.rounding_mode,
+        )
+
+        calculated: list[dict[str, Any]] = []
+        for k, s in enumerate(sets):
+            weight = None if np.isnan(weights[k]) else float(weights[k])
+            calculated.append(
+                {
+                    "intensity": to_python(filled_i[k]) if fill_intensity[k] else s.get("intensity"),
+                    "effort": to_python(filled_e[k]) if fill_effort[k] else s.get("effort"),
+                    "volume": to_python(filled_v[k]) if fill_volume[k] else s.get("volume"),
+                    "working_weight": weight,
+                    "weight": weight,
+                }
+            )
+        return calculated
+
     def _apply_normalization(
         self,
         effective_1rms: dict[int, float],
@@ -1212,46 +1415,18 @@ class AppliedCalendarPlanService:
                         eff = 0.0
                     effective_1rms[exid] = eff
 
-                def _round_to_step(value: float) -> float:
-                    step = compute.rounding_step
-                    mode = compute.rounding_mode
-                    if step <= 0:
-                        return value
-                    ratio = value / step
-                    if mode == RoundingMode.floor:
-                        return math.floor(ratio) * step
-                    if mode == RoundingMode.ceil:
-                        return math.ceil(ratio) * step
-                    return round(ratio) * step
-
+                template_sets: list[dict[str, Any]] = []
+                set_one_rms: list[float | None] = []
                 for w in workouts_to_generate:
                     for ex in w.get("exercises") or []:
-                        ex_id = ex.get("exercise_id")
-                        eff_1rm = effective_1rms.get(ex_id)
-                        for s in ex.get("sets") or []:
-                            intensity = s.get("intensity")
-                            effort = s.get("effort")
-                            volume = s.get("volume")
-                            try:
-                                if intensity is not None and effort is not None and volume is None:
-                                    volume = await get_volume(intensity=intensity, effort=effort, headers=headers)
-                                    s["volume"] = volume
-                                elif volume is not None and effort is not None and intensity is None:
-                                    intensity = await get_intensity(volume=volume, effort=effort, headers=headers)
-                                    s["intensity"] = intensity
-                                elif volume is not None and intensity is not None and effort is None:
-                                    effort = await get_effort(volume=volume, intensity=intensity, headers=headers)
-                                    s["effort"] = effort
-                            except Exception as e:
-                                logger.exception("calculate_set_values_failed", exc_info=e)
-
-                            weight = None
-                            try:
-                                if eff_1rm is not None and intensity is not None:
-                                    weight = _round_to_step(float(eff_1rm) * (float(intensity) / 100.0))
-                            except (TypeError, ValueError):
-                                weight = None
-                            s["working_weight"] = weight
+                        sets = ex.get("sets") or []
+                        template_sets.extend(sets)
+                        set_one_rms.extend([effective_1rms.get(ex.get("exercise_id"))] * len(sets))
+
+                computed = self._compute_plan_sets(template_sets, set_one_rms, compute, recompute_volume=False)
+                for s, values in zip(template_sets, computed, strict=True):
+                    for key in ("intensity", "effort", "volume", "working_weight"):
+                        s[key] = values[key]
 
             workout_ids = await self._generate_workouts_via_rpc(applied_plan_id, workouts_to_generate, compute)
             if not workout_ids:
@@ -1260,12 +1435,20 @@ class AppliedCalendarPlanService:
             for w in sorted(plan.workouts or [], key=lambda w: w.order_index, reverse=True):
                 if w.order_index >= insert_pos:
                     w.order_index = w.order_index + len(workout_ids)
+            # Keep the macro metric snapshots in step with the shifted plan positions.
+            await self.db.execute(
+                update(AppliedWorkoutMetrics)
+                .where(
+                    AppliedWorkoutMetrics.applied_plan_id == plan.id,
+                    AppliedWorkoutMetrics.order_index >= insert_pos,
+                )
+                .values(order_index=AppliedWorkoutMetrics.order_index + len(workout_ids))
+            )
             await self.db.flush()
 
             from ..models.calendar import (
                 AppliedMesocycle,
                 AppliedMicrocycle,
-                AppliedPlanWorkout,
                 AppliedWorkout,
             )
 
@@ -1433,7 +1616,7 @@ class AppliedCalendarPlanService:
         base = os.getenv("WORKOUTS_SERVICE_URL", "http://localhost:8004")
         headers = self._auth_headers()
         url = urllib.parse.urljoin(base + "/", f"workouts/?applied_plan_id={applied_plan_id}")
-        async with ServiceClient(timeout=15.0) as client:
+        async with ServiceClient(timeout=15.0, service="workouts") as client:
             data = await client.get_json(url, headers=headers, default=[], applied_plan_id=applied_plan_id)
         return data if isinstance(data, list) else []
 
@@ -1461,7 +1644,7 @@ class AppliedCalendarPlanService:
             "only_future": only_future,
             "baseline_date": baseline_date.isoformat() if baseline_date is not None else None,
         }
-        async with ServiceClient(timeout=20.0) as client:
+        async with ServiceClient(timeout=20.0, service="workouts") as client:
             resp = await client.post(
                 url, headers=headers, json=payload, expected_status=200, applied_plan_id=applied_plan_id
             )
@@ -1487,7 +1670,7 @@ class AppliedCalendarPlanService:
         if group_by:
             params["group_by"] = group_by
         params["include_actual"] = "true"
-        async with ServiceClient(timeout=20.0) as client:
+        async with ServiceClient(timeout=20.0, service="workouts") as client:
             resp = await client.get(url, headers=headers, params=params, applied_plan_id=applied_plan_id)
         if not resp.success:
             raise ValueError(f"Failed to fetch analytics: status={resp.status_code}")
@@ -821,9 +821,10 @@ class CalendarPlanService:
     @staticmethod
     async def _get_exercise_details(exercise_definition_id: int) -> dict:
         import httpx
+        from backend_common.http_client import borrow_http_client
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with borrow_http_client("exercises") as client:
                 response = await client.get(
                     f"http://exercises-service:8002/exercises/definitions/{exercise_definition_id}",
                     timeout=5.0,
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import os
 from typing import Any
 
@@ -7,15 +8,20 @@ import structlog
 
 try:
     import httpx
+    from backend_common.http_client import INSTANCES_BY_WORKOUTS_BATCH_SIZE, borrow_http_client
 except ImportError:  # pragma: no cover
     httpx = None
 
 
 logger = structlog.get_logger(__name__)
 
+MACRO_APPLY_CONCURRENCY = max(1, int(os.getenv("MACRO_APPLY_CONCURRENCY", "8")))
+# Mirrors ExerciseSetBatchUpdateRequest.items max_length in exercises-service.
+MACRO_APPLY_BATCH_SIZE = 5000
+
 
 class MacroApplier:
-    def __init__(self, user_id: str) -> None:
+    def __init__(self, user_id: str, concurrency: int = MACRO_APPLY_CONCURRENCY) -> None:
         self.user_id = user_id
         self.exercises_base = os.getenv("EXERCISES_SERVICE_URL")
         if not self.exercises_base:
@@ -25,118 +31,114 @@ class MacroApplier:
         if not self.workouts_base:
             raise RuntimeError("WORKOUTS_SERVICE_URL must be set")
         self.workouts_base = self.workouts_base.rstrip("/")
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
 
     async def apply(self, preview: dict[str, Any]) -> dict[str, Any]:
+        """
+        Apply macro patches to exercise instances.
+
+        Set-level edits of all instances go out as one diff-only bulk request; instances whose set
+        list changes shape (added/removed sets) are PUT concurrently, bounded by a semaphore.
+        """
         if not httpx:
-            return {"applied": 0, "errors": ["httpx not available"], "details": []}
+            return {"applied": 0, "errors": ["httpx not available"], "details": [], "patches": []}
         patches = self._collect_patches(preview)
         logger.info("MacroApplier.apply start | user_id=%s patches_total=%d", self.user_id, len(patches))
         if not patches:
-            return {"applied": 0, "errors": [], "details": []}
+            return {"applied": 0, "errors": [], "details": [], "patches": []}
 
         grouped: dict[int, dict[int, list[dict[str, Any]]]] = {}
         for p in patches:
             wid = int(p.get("workout_id"))
             eid = int(p.get("exercise_id")) if p.get("exercise_id") is not None else -1
             grouped.setdefault(wid, {}).setdefault(eid, []).append(p)
-        applied = 0
-        errors: list[str] = []
-        details: list[dict[str, Any]] = []
 
-        async with httpx.AsyncClient(timeout=8.0) as client:
-            for wid, per_ex in grouped.items():
-                instances = await self._fetch_instances(client, wid)
+        results: list[dict[str, Any]] = []
+        bulk_items: dict[tuple[int, int], dict[str, Any]] = {}
+        bulk_refs: dict[tuple[int, int], list[dict[str, Any]]] = {}
+        bulk_instances: dict[int, dict[str, Any]] = {}
+        put_jobs: list[tuple[dict[str, Any], list[dict[str, Any]], list[dict[str, Any]]]] = []
 
+        async with borrow_http_client("exercises") as client:
+            instances_by_workout = await self._fetch_instances(client, list(grouped.keys()))
+            for wid, per_ex in grouped.items():
                 by_ex: dict[int, dict[str, Any]] = {}
-                for inst in instances:
+                for inst in instances_by_workout.get(wid, []):
                     try:
-                        exid = int(inst.get("exercise_list_id"))
-                        by_ex[exid] = inst
+                        by_ex[int(inst.get("exercise_list_id"))] = inst
                     except (TypeError, ValueError):
                         continue
                 for eid, actions in per_ex.items():
-                    logger.info(
-                        "MacroApplier.apply attempt | workout_id=%s exercise_id=%s actions=%d",
-                        wid,
-                        eid,
-                        len(actions),
-                    )
                     inst = by_ex.get(eid)
-                    if not inst:
+                    if not inst or inst.get("id") is None:
                         logger.warning(
                             "MacroApplier.apply skip | workout_id=%s exercise_id=%s reason=no_instance",
                             wid,
                             eid,
                         )
+                        results.extend(self._patch_result(act, False, "no_instance") for act in actions)
                         continue
 
-                    sets = list(inst.get("sets") or [])
-                    changed = False
-                    for act in actions:
-                        ch = act.get("changes") or {}
-                        if ch.get("action") == "add_set":
-                            tpl = ch.get("template") or {}
-                            new_set = {
-                                "reps": tpl.get("volume"),
-                                "weight": None,
-                                "rpe": tpl.get("effort"),
-                                "intensity": tpl.get("intensity"),
-                                "volume": tpl.get("volume"),
-                                "effort": tpl.get("effort"),
-                            }
-                            sets.append(new_set)
-                            changed = True
-                        elif ch.get("action") == "remove_set":
-                            sid = act.get("set_id")
-                            if sid is not None:
-                                sets = [s for s in sets if int(s.get("id")) != int(sid)]
-                                changed = True
-                        else:
-                            sid = act.get("set_id")
-                            for i, s in enumerate(sets):
-                                if sid is not None and int(s.get("id")) == int(sid):
-                                    updated = dict(s)
-                                    if "volume" in ch:
-                                        updated["reps"] = ch["volume"]
-                                        updated["volume"] = ch["volume"]
-                                    if "intensity" in ch:
-                                        updated["intensity"] = ch["intensity"]
-                                    if "weight" in ch or "working_weight" in ch:
-                                        val = (
-                                            ch.get("weight")
-                                            if ch.get("weight") is not None
-                                            else ch.get("working_weight")
-                                        )
-                                        updated["weight"] = val
-                                    sets[i] = updated
-                                    changed = True
-                                    break
-                    if not changed:
-                        logger.info(
-                            "MacroApplier.apply no_changes | workout_id=%s exercise_id=%s",
-                            wid,
-                            eid,
-                        )
+                    if any((act.get("changes") or {}).get("action") in {"add_set", "remove_set"} for act in actions):
+                        sets = self._rebuild_sets(list(inst.get("sets") or []), actions)
+                        put_jobs.append((inst, sets, actions))
                         continue
 
-                    ok = await self._put_instance(client, inst, sets)
-                    if ok:
-                        applied += 1
-                        details.append({"workout_id": wid, "exercise_id": eid, "sets_count": len(sets)})
-                        logger.info(
-                            "MacroApplier.apply success | workout_id=%s exercise_id=%s sets_count=%d",
-                            wid,
-                            eid,
-                            len(sets),
-                        )
-                    else:
-                        errors.append(f"Failed to update instance for workout {wid} exercise {eid}")
-                        logger.error(
-                            "MacroApplier.apply failed | workout_id=%s exercise_id=%s",
-                            wid,
-                            eid,
-                        )
-        return {"applied": applied, "errors": errors, "details": details}
+                    for act, diff in self._set_diffs(inst, actions):
+                        if diff is None:
+                            results.append(self._patch_result(act, False, "set_not_found"))
+                        elif not diff:
+                            results.append(self._patch_result(act, True, "unchanged"))
+                        else:
+                            ref = (int(inst["id"]), int(act.get("set_id")))
+                            # Several patches on one set are folded into a single item.
+                            item = bulk_items.setdefault(ref, {"instance_id": ref[0], "set_id": ref[1], "patch": {}})
+                            item["patch"].update(diff)
+                            bulk_refs.setdefault(ref, []).append(act)
+                            bulk_instances[ref[0]] = inst
+
+            bulk_done, fallback = await self._send_bulk(client, list(bulk_items.values()))
+            for ref, acts in bulk_refs.items():
+                if ref in fallback:
+                    continue
+                ok = ref in bulk_done
+                results.extend(self._patch_result(act, ok, None if ok else "update_failed") for act in acts)
+
+            if fallback:
+                # The bulk endpoint is unavailable: PUT each touched instance with its patched sets instead.
+                for inst_id in {ref[0] for ref in fallback}:
+                    inst = bulk_instances[inst_id]
+                    acts = [act for ref, items in bulk_refs.items() if ref[0] == inst_id for act in items]
+                    put_jobs.append((inst, self._rebuild_sets(list(inst.get("sets") or []), acts), acts))
+
+            put_outcomes = await asyncio.gather(*(self._put_instance(client, inst, sets) for inst, sets, _ in put_jobs))
+            for (_, _, acts), ok in zip(put_jobs, put_outcomes, strict=True):
+                results.extend(self._patch_result(act, ok, None if ok else "update_failed") for act in acts)
+
+        applied_keys: dict[tuple[int, int], int] = {}
+        failed_keys: set[tuple[int, int]] = set()
+        for res in results:
+            key = (res["workout_id"], res["exercise_id"])
+            if res["ok"] and res.get("reason") != "unchanged":
+                applied_keys[key] = applied_keys.get(key, 0) + 1
+            elif not res["ok"] and res.get("reason") == "update_failed":
+                failed_keys.add(key)
+
+        errors = [f"Failed to update instance for workout {wid} exercise {eid}" for wid, eid in sorted(failed_keys)]
+        details = [
+            {"workout_id": wid, "exercise_id": eid, "sets_changed": count}
+            for (wid, eid), count in applied_keys.items()
+            if (wid, eid) not in failed_keys
+        ]
+        logger.info(
+            "MacroApplier.apply done | user_id=%s instances_applied=%d bulk_items=%d puts=%d errors=%d",
+            self.user_id,
+            len(details),
+            len(bulk_items),
+            len(put_jobs),
+            len(errors),
+        )
+        return {"applied": len(details), "errors": errors, "details": details, "patches": results}
 
     def _collect_patches(self, preview: dict[str, Any]) -> list[dict[str, Any]]:
         out: list[dict[str, Any]] = []
@@ -145,16 +147,143 @@ class MacroApplier:
                 out.append(p)
         return out
 
-    async def _fetch_instances(self, client: httpx.AsyncClient, workout_id: int) -> list[dict[str, Any]]:
-        url = f"{self.exercises_base}/exercises/instances/workouts/{workout_id}/instances"
+    @staticmethod
+    def _patch_result(act: dict[str, Any], ok: bool, reason: str | None) -> dict[str, Any]:
+        eid = act.get("exercise_id")
+        out = {
+            "workout_id": int(act.get("workout_id")),
+            "exercise_id": int(eid) if eid is not None else -1,
+            "set_id": act.get("set_id"),
+            "action": (act.get("changes") or {}).get("action") or "update_set",
+            "ok": ok,
+        }
+        if reason:
+            out["reason"] = reason
+        return out
+
+    @staticmethod
+    def _changed_fields(ch: dict[str, Any]) -> dict[str, Any]:
+        fields: dict[str, Any] = {}
+        if "volume" in ch:
+            fields["reps"] = ch["volume"]
+            fields["volume"] = ch["volume"]
+        if "intensity" in ch:
+            fields["intensity"] = ch["intensity"]
+        if "weight" in ch or "working_weight" in ch:
+            fields["weight"] = ch.get("weight") if ch.get("weight") is not None else ch.get("working_weight")
+        return fields
+
+    def _set_diffs(
+        self, inst: dict[str, Any], actions: list[dict[str, Any]]
+    ) -> list[tuple[dict[str, Any], dict[str, Any] | None]]:
+        """Per action, the fields that actually differ from the stored set (``None`` if the set is unknown)."""
+        sets_by_id: dict[int, dict[str, Any]] = {}
+        for s in inst.get("sets") or []:
+            try:
+                sets_by_id[int(s.get("id"))] = dict(s)
+            except (TypeError, ValueError):
+                continue
+        out: list[tuple[dict[str, Any], dict[str, Any] | None]] = []
+        for act in actions:
+            sid = act.get("set_id")
+            current = sets_by_id.get(int(sid)) if sid is not None else None
+            if current is None:
+                out.append((act, None))
+                continue
+            diff = {k: v for k, v in self._changed_fields(act.get("changes") or {}).items() if current.get(k) != v}
+            current.update(diff)
+            out.append((act, diff))
+        return out
+
+    def _rebuild_sets(self, sets: list[dict[str, Any]], actions: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        for act in actions:
+            ch = act.get("changes") or {}
+            if ch.get("action") == "add_set":
+                tpl = ch.get("template") or {}
+                sets.append(
+                    {
+                        "reps": tpl.get("volume"),
+                        "weight": None,
+                        "rpe": tpl.get("effort"),
+                        "intensity": tpl.get("intensity"),
+                        "volume": tpl.get("volume"),
+                        "effort": tpl.get("effort"),
+                    }
+                )
+            elif ch.get("action") == "remove_set":
+                sid = act.get("set_id")
+                if sid is not None:
+                    sets = [s for s in sets if int(s.get("id")) != int(sid)]
+            else:
+                sid = act.get("set_id")
+                for i, s in enumerate(sets):
+                    if sid is not None and int(s.get("id")) == int(sid):
+                        sets[i] = {**s, **self._changed_fields(ch)}
+                        break
+        return sets
+
+    async def _fetch_instances(
+        self, client: httpx.AsyncClient, workout_ids: list[int]
+    ) -> dict[int, list[dict[str, Any]]]:
+        url = f"{self.exercises_base}/exercises/instances/by-workouts"
+        headers = {"X-User-Id": self.user_id}
+        out: dict[int, list[dict[str, Any]]] = {}
+        for start in range(0, len(workout_ids), INSTANCES_BY_WORKOUTS_BATCH_SIZE):
+            batch = workout_ids[start : start + INSTANCES_BY_WORKOUTS_BATCH_SIZE]
+            try:
+                res = await client.post(url, json={"workout_ids": batch}, headers=headers, timeout=8.0)
+                data = res.json() if res.status_code == 200 else None
+            except (httpx.RequestError, httpx.HTTPStatusError, ValueError):
+                continue
+            if isinstance(data, dict):
+                out.update((int(wid), items) for wid, items in data.items() if isinstance(items, list))
+        return out
+
+    async def _send_bulk(
+        self, client: httpx.AsyncClient, items: list[dict[str, Any]]
+    ) -> tuple[set[tuple[int, int]], set[tuple[int, int]]]:
+        """Send set diffs to the bulk endpoint; returns (updated refs, refs needing a PUT fallback)."""
+        if not items:
+            return set(), set()
+        url = f"{self.exercises_base}/exercises/instances/sets/batch-update"
         headers = {"X-User-Id": self.user_id}
-        try:
-            res = await client.get(url, headers=headers)
-            if res.status_code == 200 and isinstance(res.json(), list):
-                return res.json()
-        except (httpx.RequestError, httpx.HTTPStatusError, ValueError):
-            return []
-        return []
+        chunks = [items[i : i + MACRO_APPLY_BATCH_SIZE] for i in range(0, len(items), MACRO_APPLY_BATCH_SIZE)]
+
+        async def _send(chunk: list[dict[str, Any]]) -> tuple[set[tuple[int, int]], set[tuple[int, int]]]:
+            refs = {(i["instance_id"], i["set_id"]) for i in chunk}
+            async with self._semaphore:
+                try:
+                    res = await client.post(url, json={"items": chunk}, headers=headers, timeout=8.0)
+                except httpx.RequestError:
+                    logger.warning("MacroApplier.bulk_update_failed", items=len(chunk), exc_info=True)
+                    return set(), set()
+            if res.status_code in (404, 405):
+                return set(), refs
+            if res.status_code == 422 and len(chunk) > 1:
+                # One invalid item fails validation of the whole request: bisect so only the offending patches fail.
+                # Other 4xx (auth, rate limit, malformed request) would reject every half too, so they fail the chunk.
+                logger.info("MacroApplier.bulk_update_split", items=len(chunk), status=res.status_code)
+                middle = len(chunk) // 2
+                (done_a, retry_a), (done_b, retry_b) = await asyncio.gather(
+                    _send(chunk[:middle]), _send(chunk[middle:])
+                )
+                return done_a | done_b, retry_a | retry_b
+            if res.status_code != 200:
+                logger.warning("MacroApplier.bulk_update_non_200", items=len(chunk), status=res.status_code)
+                return set(), set()
+            try:
+                data = res.json()
+            except ValueError:
+                return set(), set()
+            updated = {(int(r["instance_id"]), int(r["set_id"])) for r in data.get("updated") or []}
+            return updated & refs, set()
+
+        done: set[tuple[int, int]] = set()
+        fallback: set[tuple[int, int]] = set()
+        for updated, retry in await asyncio.gather(*(_send(chunk) for chunk in chunks)):
+            done |= updated
+            fallback |= retry
+        return done, fallback
 
     async def _put_instance(self, client: httpx.AsyncClient, inst: dict[str, Any], sets: list[dict[str, Any]]) -> bool:
         inst_id = inst.get("id")
@@ -164,8 +293,9 @@ class MacroApplier:
         headers = {"X-User-Id": self.user_id}
         payload = dict(inst)
         payload["sets"] = sets
-        try:
-            res = await client.put(url, json=payload, headers=headers)
-            return res.status_code in (200, 201)
-        except (httpx.RequestError, httpx.HTTPStatusError):
-            return False
+        async with self._semaphore:
+            try:
+                res = await client.put(url, json=payload, headers=headers, timeout=8.0)
+                return res.status_code in (200, 201)
+            except (httpx.RequestError, httpx.HTTPStatusError):
+                return False
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any
+
+WorkoutsFetcher = Callable[[list[int], list[str]], Awaitable[dict[int, dict[str, Any]]]]
+InstancesFetcher = Callable[[list[int]], Awaitable[dict[int, list[dict[str, Any]]]]]
+
+# Workout fields any macro trigger or action reads; fetched together so one request serves them all.
+MACRO_WORKOUT_FIELDS = ["exercises", "scheduled_for", "completed_at", "readiness_score", "rpe_session"]
+
+
+class MacroDataLoader:
+    """
+    In-memory snapshot of the workout data read while evaluating macros for one plan run.
+
+    ``prefetch`` loads workout details/metrics and exercise instances for many workouts with a
+    few concurrent bulk requests. Later lookups are served from the snapshot; ids that were not
+    prefetched are fetched once and then kept as well, so nothing is requested twice per run.
+    """
+
+    def __init__(
+        self,
+        fetch_workouts: WorkoutsFetcher,
+        fetch_instances: InstancesFetcher,
+        batch_size: int = 500,
+    ) -> None:
+        self._fetch_workouts = fetch_workouts
+        self._fetch_instances = fetch_instances
+        self._batch_size = max(1, batch_size)
+        self._workouts: dict[int, dict[str, Any]] = {}
+        self._instances: dict[int, list[dict[str, Any]]] = {}
+
+    async def prefetch(self, workout_ids: Iterable[int], *, instances: bool = True) -> None:
+        ids = list(dict.fromkeys(workout_ids))
+        if not ids:
+            return
+        if instances:
+            await asyncio.gather(self.workouts(ids), self.instances(ids))
+        else:
+            await self.workouts(ids)
+
+    async def workouts(self, workout_ids: Iterable[int]) -> dict[int, dict[str, Any]]:
+        ids = list(dict.fromkeys(workout_ids))
+        missing = [wid for wid in ids if wid not in self._workouts]
+        if missing:
+            results = await asyncio.gather(
+                *(self._fetch_workouts(chunk, MACRO_WORKOUT_FIELDS) for chunk in self._chunks(missing))
+            )
+            for result in results:
+                self._workouts.update(result)
+            for wid in missing:
+                # Remember misses too, so an unknown id is not requested again during the run.
+                self._workouts.setdefault(wid, {})
+        return {wid: self._workouts[wid] for wid in ids if self._workouts[wid]}
+
+    async def instances(self, workout_ids: Iterable[int]) -> dict[int, list[dict[str, Any]]]:
+        ids = list(dict.fromkeys(workout_ids))
+        missing = [wid for wid in ids if wid not in self._instances]
+        if missing:
+            results = await asyncio.gather(*(self._fetch_instances(chunk) for chunk in self._chunks(missing)))
+            for result in results:
+                self._instances.update(result)
+            for wid in missing:
+                self._instances.setdefault(wid, [])
+        return {wid: self._instances[wid] for wid in ids if wid in self._instances}
+
+    def _chunks(self, ids: list[int]) -> list[list[int]]:
+        return [ids[i : i + self._batch_size] for i in range(0, len(ids), self._batch_size)]
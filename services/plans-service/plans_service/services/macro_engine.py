@@ -2,17 +2,22 @@ from __future__ import annotations
 
 import json
 import os
+from collections.abc import Iterable
 from typing import Any
 
 import structlog
-from sqlalchemy import select
+from sqlalchemy import delete, select
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models.calendar import AppliedCalendarPlan, AppliedPlanWorkout
-from ..models.macro import PlanMacro
+from ..models.macro import AppliedWorkoutMetrics, PlanMacro
+from .macro_data import MacroDataLoader
+from .macro_rules import CompiledMacroRule, _get_dict, compare_values, compile_macro
 
 try:
     import httpx
+    from backend_common.http_client import INSTANCES_BY_WORKOUTS_BATCH_SIZE, borrow_http_client
 except ImportError:  # pragma: no cover
     httpx = None
 
@@ -26,21 +31,23 @@ except ImportError:  # pragma: no cover
     rpc_get_volume = None
 
 
-def _get_dict(obj: dict[str, Any] | None, key: str) -> dict[str, Any]:
-    """Safely get a dict value, returning empty dict if missing or wrong type."""
-    if obj is None:
-        return {}
-    val = obj.get(key)
-    return val if isinstance(val, dict) else {}
-
-
 class MacroEngine:
     def __init__(self, db: AsyncSession, user_id: str) -> None:
         self.db = db
         self.user_id = user_id
+        self._data = MacroDataLoader(self._fetch_workouts_by_ids, self._request_exercise_instances)
+        self._applied_plan_id: int | None = None
+        self._order_by_wid: dict[int, int] = {}
+        self._metrics: dict[int, dict[str, Any]] = {}
+        self._pending_metrics: dict[int, dict[str, Any]] = {}
+        self._selector_ids: dict[str, set[int] | None] = {}
 
     async def run_for_applied_plan(
-        self, applied_plan_id: int, anchor: str = "current", index_offset: int | None = None
+        self,
+        applied_plan_id: int,
+        anchor: str = "current",
+        index_offset: int | None = None,
+        finished_workout_id: int | None = None,
     ) -> dict[str, Any]:
         logger.info(
             "MacroEngine.run_for_applied_plan start",
@@ -64,12 +71,16 @@ class MacroEngine:
         if index_offset is not None:
             current_idx = max(0, current_idx + index_offset)
 
+        self._begin_run(applied_plan_id, ordered_workouts)
+        rules = [compile_macro(m) for m in macros]
+        await self._prefetch_macro_data(rules, ordered_workouts, current_idx)
+        if finished_workout_id is not None:
+            await self._record_workout_metrics(finished_workout_id)
+
         preview: list[dict[str, Any]] = []
-        for m in macros:
-            rule = self._safe_parse_rule(m.rule_json)
-            duration = _get_dict(rule, "duration")
-            duration_scope = duration.get("scope") or "Next_N_Workouts"
-            count = int(duration.get("count") or 1)
+        for m, rule in zip(macros, rules, strict=True):
+            duration_scope = rule.duration_scope
+            count = rule.count
 
             target_workouts = self._select_next_n_workouts(ordered_workouts, current_idx, count)
             matched_workouts = await self._filter_by_trigger(
@@ -79,12 +90,7 @@ class MacroEngine:
             )
             patches = await self._build_patches(rule, matched_workouts)
             try:
-                trig = _get_dict(rule, "trigger")
-                cond = _get_dict(rule, "condition")
-                metric = str(trig.get("metric") or "").strip()
-                op = str(cond.get("op") or "").strip()
-                value = cond.get("value")
-                rng = cond.get("range") or cond.get("values")
+                metric, op, value, rng = rule.metric, rule.op, rule.value, rule.rng
                 if matched_workouts:
                     logger.info(
                         "Macro trigger fired | macro_id=%s name=%s metric=%s op=%s "
@@ -109,10 +115,9 @@ class MacroEngine:
 
             plan_changes: list[dict[str, Any]] = []
             try:
-                action = _get_dict(rule, "action")
-                a_type = str(action.get("type") or "").strip()
-                params = _get_dict(action, "params")
-                mode = str(params.get("mode") or "").strip()
+                a_type = rule.action_type
+                params = rule.action_params
+                mode = rule.action_mode
                 if a_type == "Inject_Mesocycle":
                     placement = _get_dict(params, "placement")
                     on_conflict = params.get("on_conflict") or "Shift_Forward"
@@ -168,8 +173,237 @@ class MacroEngine:
             "actions_applied": 0,
             "preview": preview,
         }
+        await self._flush_workout_metrics()
         return summary
 
+    def _begin_run(self, applied_plan_id: int, ordered_workouts: list[dict[str, int]]) -> None:
+        self._data = MacroDataLoader(self._fetch_workouts_by_ids, self._request_exercise_instances)
+        self._applied_plan_id = applied_plan_id
+        self._order_by_wid = {int(w["workout_id"]): int(w.get("order_index", 0)) for w in ordered_workouts}
+        self._metrics = {}
+        self._pending_metrics = {}
+        self._selector_ids = {}
+
+    async def _prefetch_macro_data(
+        self, rules: list[CompiledMacroRule], ordered_workouts: list[dict[str, int]], current_idx: int
+    ) -> None:
+        """Load, in bulk, the workouts and instances every rule of this run will read."""
+        workout_ids: dict[int, None] = {}
+        history_window = 0
+        needs_instances = False
+        for rule in rules:
+            workout_ids.update(dict.fromkeys(self._select_next_n_workouts(ordered_workouts, current_idx, rule.count)))
+            history_window = max(history_window, self._history_window(rule))
+            needs_instances = needs_instances or rule.metric in {
+                "e1RM",
+                "Performance_Trend",
+                "RPE_Delta_From_Plan",
+                "Reps_Delta_From_Plan",
+            }
+        await self._data.prefetch(workout_ids, instances=needs_instances)
+        if history_window:
+            prev = [w["workout_id"] for w in ordered_workouts if int(w.get("order_index", 0)) < current_idx]
+            await self._history_metrics(prev[-history_window:])
+
+    @staticmethod
+    def _history_window(rule: CompiledMacroRule) -> int:
+        """How many previous workouts ``_filter_by_trigger`` reads for ``rule`` (same ``n`` defaults)."""
+        if rule.metric == "Performance_Trend":
+            if rule.op not in {"stagnates_for", "deviates_from_avg"}:
+                return 0
+            default_n, factor = 5, 2
+        elif rule.op == "holds_for":
+            if rule.metric in {"Readiness_Score", "RPE_Session", "Total_Reps"}:
+                default_n, factor = 3, 1
+            elif rule.metric in {"RPE_Delta_From_Plan", "Reps_Delta_From_Plan"}:
+                default_n, factor = 1, 1
+            else:
+                return 0
+        else:
+            return 0
+        try:
+            n = int(rule.condition.get("n") or default_n)
+        except (TypeError, ValueError):
+            n = default_n
+        return max(1, n * factor)
+
+    async def _history_metrics(self, workout_ids: list[int]) -> dict[int, dict[str, Any]]:
+        """
+        Metric snapshots for past workouts, read from ``applied_workout_metrics``.
+
+        Workouts finished before snapshots existed are derived once from the workouts and
+        exercises services and stored, so later runs only read the persisted series.
+        """
+        unknown = [wid for wid in dict.fromkeys(workout_ids) if wid not in self._metrics]
+        if unknown and self._applied_plan_id is not None:
+            stmt = (
+                select(AppliedWorkoutMetrics)
+                .where(AppliedWorkoutMetrics.applied_plan_id == self._applied_plan_id)
+                .where(AppliedWorkoutMetrics.workout_id.in_(unknown))
+            )
+            res = await self.db.execute(stmt)
+            for row in res.scalars().all():
+                self._metrics[row.workout_id] = {
+                    "workout_id": row.workout_id,
+                    "order_index": row.order_index,
+                    "date": row.workout_date,
+                    "readiness_score": row.readiness_score,
+                    "rpe_session": row.rpe_session,
+                    "total_reps": row.total_reps,
+                    "exercises": row.exercises or {},
+                }
+            missing = [wid for wid in unknown if wid not in self._metrics]
+            if missing:
+                await self._data.prefetch(missing)
+                for wid in missing:
+                    await self._record_workout_metrics(wid)
+        return {wid: self._metrics[wid] for wid in workout_ids if wid in self._metrics}
+
+    async def _record_workout_metrics(self, wid: int) -> None:
+        if wid not in self._order_by_wid:
+            return
+        self._metrics[wid] = await self._build_workout_metrics(wid)
+        self._pending_metrics[wid] = self._metrics[wid]
+
+    async def _build_workout_metrics(self, wid: int) -> dict[str, Any]:
+        details = (await self._fetch_workout_details([wid])).get(wid) or {}
+        session = (await self._fetch_workout_metrics([wid])).get(wid) or {}
+        inst_by_eid: dict[int, dict] = {}
+        for inst in (await self._fetch_exercise_instances([wid])).get(wid) or []:
+            try:
+                inst_by_eid[int(inst.get("exercise_list_id"))] = inst
+            except (TypeError, ValueError):
+                continue
+
+        exercises: dict[str, dict[str, Any]] = {}
+        total_reps = 0
+        for ex in details.get("exercises") or []:
+            eid = ex.get("exercise_id")
+            if eid is None:
+                continue
+            entry = exercises.setdefault(
+                str(eid), {"e1rm": None, "reps": 0, "rpe_delta": [0.0, 0], "reps_delta": [0.0, 0]}
+            )
+            sets_plan = list(ex.get("sets") or [])
+            for sp in sets_plan:
+                try:
+                    reps = int(sp.get("volume")) if sp.get("volume") is not None else None
+                except (TypeError, ValueError):
+                    reps = None
+                if reps:
+                    entry["reps"] += reps
+                    total_reps += reps
+            inst = inst_by_eid.get(eid)
+            if not inst:
+                continue
+            sets_actual = list(inst.get("sets") or [])
+            for sa in sets_actual:
+                try:
+                    w = sa.get("weight") if sa.get("weight") is not None else sa.get("working_weight")
+                    r = sa.get("reps") or sa.get("volume")
+                    if w is None or r is None or float(w) <= 0 or int(r) <= 0:
+                        continue
+                    e = self._e1rm_from_weight_reps(float(w), int(r))
+                except (TypeError, ValueError):
+                    continue
+                if entry["e1rm"] is None or e > entry["e1rm"]:
+                    entry["e1rm"] = e
+            for sp, sa in zip(sets_plan, sets_actual, strict=False):
+                sp = sp or {}
+                sa = sa or {}
+                pairs = (
+                    ("rpe_delta", sp.get("effort"), sa.get("rpe") if sa.get("rpe") is not None else sa.get("effort")),
+                    ("reps_delta", sp.get("volume"), sa.get("reps") or sa.get("volume")),
+                )
+                for key, planned, actual in pairs:
+                    if planned is None or actual is None:
+                        continue
+                    try:
+                        entry[key][0] += float(actual) - float(planned)
+                    except (TypeError, ValueError):
+                        continue
+                    entry[key][1] += 1
+
+        return {
+            "workout_id": wid,
+            "order_index": self._order_by_wid.get(wid, 0),
+            "date": details.get("date"),
+            "readiness_score": session.get("readiness_score"),
+            "rpe_session": session.get("rpe_session"),
+            "total_reps": total_reps,
+            "exercises": exercises,
+        }
+
+    async def _flush_workout_metrics(self) -> None:
+        if not self._pending_metrics or self._applied_plan_id is None:
+            return
+        pending, self._pending_metrics = self._pending_metrics, {}
+        try:
+            stmt = (
+                select(AppliedWorkoutMetrics)
+                .where(AppliedWorkoutMetrics.applied_plan_id == self._applied_plan_id)
+                .where(AppliedWorkoutMetrics.workout_id.in_(list(pending)))
+            )
+            res = await self.db.execute(stmt)
+            rows = {row.workout_id: row for row in res.scalars().all()}
+            for wid, snapshot in pending.items():
+                row = rows.get(wid)
+                if row is None:
+                    row = AppliedWorkoutMetrics(applied_plan_id=self._applied_plan_id, workout_id=wid)
+                    self.db.add(row)
+                row.order_index = snapshot["order_index"]
+                row.workout_date = str(snapshot["date"]) if snapshot["date"] is not None else None
+                row.readiness_score = snapshot["readiness_score"]
+                row.rpe_session = snapshot["rpe_session"]
+                row.total_reps = snapshot["total_reps"]
+                row.exercises = snapshot["exercises"]
+            await self.db.commit()
+        except SQLAlchemyError:
+            await self.db.rollback()
+            logger.warning(
+                "MacroEngine._flush_workout_metrics_failed",
+                applied_plan_id=self._applied_plan_id,
+                workouts_count=len(pending),
+                exc_info=True,
+            )
+
+    async def invalidate_workout_metrics(self, applied_plan_id: int, workout_ids: Iterable[int] | None = None) -> None:
+        """
+        Drop metric snapshots whose source workouts changed (all of the plan's when ``workout_ids`` is None).
+
+        The next run derives them again from the workouts and exercises services.
+        """
+        ids = None if workout_ids is None else sorted({int(wid) for wid in workout_ids})
+        if ids == []:
+            return
+        stmt = delete(AppliedWorkoutMetrics).where(AppliedWorkoutMetrics.applied_plan_id == applied_plan_id)
+        if ids is not None:
+            stmt = stmt.where(AppliedWorkoutMetrics.workout_id.in_(ids))
+        try:
+            await self.db.execute(stmt)
+            await self.db.commit()
+        except SQLAlchemyError:
+            await self.db.rollback()
+            logger.warning(
+                "MacroEngine.invalidate_workout_metrics_failed",
+                applied_plan_id=applied_plan_id,
+                workouts_count=len(ids) if ids is not None else None,
+                exc_info=True,
+            )
+            return
+        if self._applied_plan_id == applied_plan_id:
+            for wid in ids if ids is not None else list(self._metrics):
+                self._metrics.pop(wid, None)
+                self._pending_metrics.pop(wid, None)
+
+    @staticmethod
+    def _snapshot_exercises(snapshot: dict[str, Any], filter_ex_ids: list[int] | None) -> list[dict[str, Any]]:
+        exercises = snapshot.get("exercises") or {}
+        if not filter_ex_ids:
+            return list(exercises.values())
+        wanted = {str(eid) for eid in filter_ex_ids}
+        return [entry for eid, entry in exercises.items() if eid in wanted]
+
     async def _load_applied_plan(self, applied_plan_id: int) -> AppliedCalendarPlan | None:
         stmt = (
             select(AppliedCalendarPlan)
@@ -206,22 +440,12 @@ class MacroEngine:
         pipeline = [w for w in ordered_workouts if int(w.get("order_index", 0)) >= current_index]
         return [w.get("workout_id") for w in pipeline[: max(0, int(n))]]
 
-    def _safe_parse_rule(self, s: str | None) -> dict[str, Any]:
-        if not s:
-            return {}
-        try:
-            obj = json.loads(s)
-            return obj if isinstance(obj, dict) else {}
-        except json.JSONDecodeError:
-            return {}
-
     async def _filter_by_trigger(
-        self, rule: dict[str, Any], workout_ids: list[int], ctx: dict[str, Any] | None = None
+        self, rule: CompiledMacroRule, workout_ids: list[int], ctx: dict[str, Any] | None = None
     ) -> list[int]:
         if not workout_ids:
             return []
-        trigger = _get_dict(rule, "trigger")
-        condition = _get_dict(rule, "condition")
+        condition = rule.condition
 
         try:
             self._last_ctx = ctx or {}
@@ -229,7 +453,7 @@ class MacroEngine:
             logger.exception("MacroEngine._filter_by_trigger_ctx_failed", exc_info=True)
             self._last_ctx = {}
 
-        metric = str(trigger.get("metric") or "").strip()
+        metric = rule.metric
         if not metric:
             return []
 
@@ -246,9 +470,8 @@ class MacroEngine:
             logger.info("MacroEngine._filter_by_trigger unsupported metric=%s", metric)
             return []
 
-        op = str(condition.get("op") or "").strip()
-        value = condition.get("value")
-        rng = condition.get("range") or condition.get("values")
+        op = rule.op
+        value = rule.value
 
         matched: list[int] = []
 
@@ -290,17 +513,14 @@ class MacroEngine:
                     return []
                 else:
                     try:
-                        if self._compare(op, v, value, rng):
+                        if rule.compare(v):
                             matched.append(wid)
                     except (TypeError, ValueError):
                         continue
             return matched
 
         if metric == "e1RM":
-            ex_id = trigger.get("exercise_id")
-            ex_ids = trigger.get("exercise_ids") if isinstance(trigger.get("exercise_ids"), list) else None
-            if ex_id is not None and not ex_ids:
-                ex_ids = [ex_id]
+            ex_ids = rule.trigger_exercise_ids
 
             if not ex_ids:
                 logger.info("MacroEngine._filter_by_trigger e1RM requires exercise_id(s)")
@@ -308,21 +528,18 @@ class MacroEngine:
             for wid in workout_ids:
                 v = await self._e1rm_for_wid(wid, ex_ids)
                 try:
-                    if self._compare(op, v, value, rng):
+                    if rule.compare(v):
                         matched.append(wid)
                 except (TypeError, ValueError):
                     continue
             return matched
 
         if metric == "Performance_Trend":
-            relation_op = str(condition.get("op") or "").strip()
+            relation_op = op
             n = int(condition.get("n") or 5)
             if relation_op not in {"stagnates_for", "deviates_from_avg"}:
                 return []
-            ex_id = trigger.get("exercise_id")
-            ex_ids = trigger.get("exercise_ids") if isinstance(trigger.get("exercise_ids"), list) else None
-            if ex_id is not None and not ex_ids:
-                ex_ids = [ex_id]
+            ex_ids = rule.trigger_exercise_ids
             if not ex_ids:
                 logger.info("MacroEngine.Performance_Trend requires exercise_id(s)")
                 return []
@@ -346,10 +563,7 @@ class MacroEngine:
                 return workout_ids if ok else []
 
         if metric == "Total_Reps":
-            ex_id = trigger.get("exercise_id")
-            ex_ids = trigger.get("exercise_ids") if isinstance(trigger.get("exercise_ids"), list) else None
-            if ex_id is not None and not ex_ids:
-                ex_ids = [ex_id]
+            ex_ids = rule.trigger_exercise_ids
             details = await self._fetch_workout_details(workout_ids)
             for wid in workout_ids:
                 payload = details.get(wid) or {}
@@ -380,17 +594,14 @@ class MacroEngine:
                     return []
                 else:
                     try:
-                        if self._compare(op, total, value, rng):
+                        if rule.compare(total):
                             matched.append(wid)
                     except (TypeError, ValueError):
                         continue
             return matched
 
         if metric in {"RPE_Delta_From_Plan", "Reps_Delta_From_Plan"}:
-            ex_id = trigger.get("exercise_id")
-            ex_ids = trigger.get("exercise_ids") if isinstance(trigger.get("exercise_ids"), list) else None
-            if ex_id is not None and not ex_ids:
-                ex_ids = [ex_id]
+            ex_ids = rule.trigger_exercise_ids
 
             if op == "holds_for":
                 relation = str(condition.get("relation") or ">=").strip()
@@ -400,50 +611,19 @@ class MacroEngine:
                 except (TypeError, ValueError):
                     thr = 0.0
 
+                delta_key = "rpe_delta" if metric == "RPE_Delta_From_Plan" else "reps_delta"
+
                 async def _delta_value_for_wid(wid: int) -> float | None:
-                    details = await self._fetch_workout_details([wid])
-                    instances = await self._fetch_exercise_instances([wid])
-                    pd = (details.get(wid) or {}).get("exercises") or []
-                    inst_list = instances.get(wid) or []
-                    inst_by_eid: dict[int, dict] = {}
-                    for inst in inst_list:
-                        try:
-                            eid = int(inst.get("exercise_list_id"))
-                            inst_by_eid[eid] = inst
-                        except (TypeError, ValueError):
-                            continue
-                    deltas: list[float] = []
-                    for ex in pd:
-                        eid = ex.get("exercise_id")
-                        if ex_ids and eid not in ex_ids:
-                            continue
-                        sets_plan = list(ex.get("sets") or [])
-                        inst = inst_by_eid.get(eid)
-                        if not inst:
-                            continue
-                        sets_actual = list(inst.get("sets") or [])
-                        k = min(len(sets_plan), len(sets_actual))
-                        for i in range(k):
-                            sp = sets_plan[i] or {}
-                            sa = sets_actual[i] or {}
-                            try:
-                                if metric == "RPE_Delta_From_Plan":
-                                    p = sp.get("effort")
-                                    a = sa.get("rpe") if sa.get("rpe") is not None else sa.get("effort")
-                                    if p is None or a is None:
-                                        continue
-                                    deltas.append(float(a) - float(p))
-                                else:
-                                    p = sp.get("volume")
-                                    a = sa.get("reps") or sa.get("volume")
-                                    if p is None or a is None:
-                                        continue
-                                    deltas.append(float(a) - float(p))
-                            except (TypeError, ValueError):
-                                continue
-                    if not deltas:
+                    snapshot = (await self._history_metrics([wid])).get(wid) or {}
+                    total = 0.0
+                    count = 0
+                    for entry in self._snapshot_exercises(snapshot, ex_ids):
+                        delta_sum, delta_count = entry.get(delta_key) or (0.0, 0)
+                        total += float(delta_sum)
+                        count += int(delta_count)
+                    if not count:
                         return None
-                    return sum(deltas) / len(deltas)
+                    return total / count
 
                 if await self._holds_for_series(_delta_value_for_wid, relation, thr, n, ctx):
                     return workout_ids
@@ -516,7 +696,7 @@ class MacroEngine:
             for wid in workout_ids:
                 v = _delta_for_wid(wid)
                 try:
-                    if self._compare(op, v, value, rng):
+                    if rule.compare(v):
                         matched.append(wid)
                 except (TypeError, ValueError):
                     continue
@@ -525,36 +705,7 @@ class MacroEngine:
         return workout_ids
 
     def _compare(self, op: str, v: Any, target: Any, rng: Any) -> bool:
-        if v is None:
-            return False
-        try:
-            fv = float(v)
-        except (TypeError, ValueError):
-            return False
-        if op in (">", "gt"):
-            return fv > float(target)
-        if op in ("<", "lt"):
-            return fv < float(target)
-        if op in (">=", "ge"):
-            return fv >= float(target)
-        if op in ("<=", "le"):
-            return fv <= float(target)
-        if op in ("=", "==", "eq"):
-            return abs(fv - float(target)) < 1e-6
-        if op in ("!=", "ne"):
-            return abs(fv - float(target)) >= 1e-6
-        if op in ("in_range", "in"):
-            if isinstance(rng, list | tuple) and len(rng) >= 2:
-                a, b = float(rng[0]), float(rng[1])
-                lo, hi = (a, b) if a <= b else (b, a)
-                return (fv >= lo) and (fv <= hi)
-            return False
-        if op in ("not_in_range", "not_in"):
-            if isinstance(rng, list | tuple) and len(rng) >= 2:
-                a, b = float(rng[0]), float(rng[1])
-                lo, hi = (a, b) if a <= b else (b, a)
-                return not ((fv >= lo) and (fv <= hi))
-            return True
+        return compare_values(op, v, target, rng)
 
     async def _holds_for_metric(
         self,
@@ -575,7 +726,7 @@ class MacroEngine:
         window = prev[-n:]
         if len(window) < n:
             return False
-        metrics = await self._fetch_workout_metrics(window)
+        metrics = await self._history_metrics(window)
 
         def _val(wid: int) -> float | None:
             d = metrics.get(wid) or {}
@@ -624,21 +775,8 @@ class MacroEngine:
         return True
 
     async def _total_reps_for_workout(self, wid: int, filter_ex_ids: list[int] | None) -> float | None:
-        details = await self._fetch_workout_details([wid])
-        payload = details.get(wid) or {}
-        total = 0
-        for ex in payload.get("exercises", []) or []:
-            eid = ex.get("exercise_id")
-            if filter_ex_ids and eid not in filter_ex_ids:
-                continue
-            for s in ex.get("sets", []) or []:
-                try:
-                    reps = int(s.get("volume")) if s.get("volume") is not None else None
-                except (TypeError, ValueError):
-                    reps = None
-                if reps:
-                    total += reps
-        return float(total)
+        snapshot = (await self._history_metrics([wid])).get(wid) or {}
+        return float(sum(int(entry.get("reps") or 0) for entry in self._snapshot_exercises(snapshot, filter_ex_ids)))
 
     async def _reps_delta_consecutive_sets(
         self,
@@ -712,6 +850,9 @@ class MacroEngine:
         return False
 
     async def _fetch_exercise_instances(self, workout_ids: list[int]) -> dict[int, list[dict[str, Any]]]:
+        return await self._data.instances(workout_ids)
+
+    async def _request_exercise_instances(self, workout_ids: list[int]) -> dict[int, list[dict[str, Any]]]:
         out: dict[int, list[dict[str, Any]]] = {}
         if not workout_ids or not httpx:
             return out
@@ -719,30 +860,35 @@ class MacroEngine:
         if not base:
             return out
         base = base.rstrip("/")
-        async with httpx.AsyncClient(timeout=6.0) as client:
-            for wid in workout_ids:
+        url = f"{base}/exercises/instances/by-workouts"
+        headers = {"X-User-Id": self.user_id}
+        async with borrow_http_client("exercises") as client:
+            for start in range(0, len(workout_ids), INSTANCES_BY_WORKOUTS_BATCH_SIZE):
+                batch = workout_ids[start : start + INSTANCES_BY_WORKOUTS_BATCH_SIZE]
                 try:
-                    url = f"{base}/exercises/instances/workouts/{wid}/instances"
-                    headers = {"X-User-Id": self.user_id}
-                    res = await client.get(url, headers=headers)
-                    if res.status_code == 200:
-                        try:
-                            data = res.json()
-                        except ValueError:
-                            logger.warning(
-                                "MacroEngine._fetch_exercise_instances_json_failed",
-                                workout_id=wid,
-                                exc_info=True,
-                            )
-                            continue
-                        if isinstance(data, list):
-                            out[wid] = data
+                    res = await client.post(url, headers=headers, json={"workout_ids": batch}, timeout=6.0)
                 except httpx.RequestError:
                     logger.warning(
                         "MacroEngine._fetch_exercise_instances_failed",
-                        workout_id=wid,
+                        workouts_count=len(batch),
                         exc_info=True,
                     )
+                    continue
+                if res.status_code != 200:
+                    continue
+                try:
+                    data = res.json()
+                except ValueError:
+                    logger.warning(
+                        "MacroEngine._fetch_exercise_instances_json_failed",
+                        workouts_count=len(batch),
+                        exc_info=True,
+                    )
+                    continue
+                if isinstance(data, dict):
+                    for wid, items in data.items():
+                        if isinstance(items, list):
+                            out[int(wid)] = items
         return out
 
     async def _fetch_user_max_histories(self, exercise_ids: list[int]) -> dict[int, list[dict[str, Any]]]:
@@ -864,18 +1010,19 @@ class MacroEngine:
         except (AttributeError, TypeError, ValueError):
             logger.warning("MacroEngine._trend_series_ctx_invalid", exc_info=True)
             prev = []
+        # Only the last ``2 * window_n`` previous workouts feed the series; older ones are never read or backfilled.
+        prev = prev[-max(1, int(window_n * 2)) :]
         if not prev:
             return []
-        details = await self._fetch_workout_details(prev)
-        await self._fetch_exercise_instances(prev)
+        snapshots = await self._history_metrics(prev)
         series: list[tuple[str, float]] = []
         for wid in prev:
-            date = (details.get(wid) or {}).get("date")
-            val = await self._e1rm_for_wid(wid, filter_ex_ids)
-            if date is not None and val is not None:
-                series.append((date, float(val)))
+            snapshot = snapshots.get(wid) or {}
+            values = [e["e1rm"] for e in self._snapshot_exercises(snapshot, filter_ex_ids) if e.get("e1rm") is not None]
+            if snapshot.get("date") is not None and values:
+                series.append((snapshot["date"], float(max(values))))
         series.sort(key=lambda x: x[0])
-        return series[-max(1, int(window_n * 2)) :]
+        return series
 
     @staticmethod
     def _e1rm_from_weight_reps(weight: float, reps: int) -> float:
@@ -918,52 +1065,56 @@ class MacroEngine:
             return (-delta_pct) >= thr
         return abs(delta_pct) >= thr
 
-    async def _fetch_workout_metrics(self, workout_ids: list[int]) -> dict[int, dict[str, Any]]:
+    async def _fetch_workouts_by_ids(self, workout_ids: list[int], fields: list[str]) -> dict[int, dict[str, Any]]:
         out: dict[int, dict[str, Any]] = {}
-        if not workout_ids:
+        if not workout_ids or not httpx:
             return out
         base = os.getenv("WORKOUTS_SERVICE_URL")
         if not base:
             return out
         base = base.rstrip("/")
-        if not httpx:
+        url = f"{base}/workouts/by-ids"
+        headers = {"X-User-Id": self.user_id}
+        try:
+            async with borrow_http_client("workouts") as client:
+                res = await client.post(url, headers=headers, json={"ids": workout_ids, "fields": fields}, timeout=6.0)
+            if res.status_code != 200:
+                return out
+            try:
+                data = res.json()
+            except ValueError:
+                logger.warning(
+                    "MacroEngine._fetch_workouts_by_ids_json_failed",
+                    workouts_count=len(workout_ids),
+                    exc_info=True,
+                )
+                return out
+        except httpx.RequestError:
+            logger.warning(
+                "MacroEngine._fetch_workouts_by_ids_failed",
+                workouts_count=len(workout_ids),
+                exc_info=True,
+            )
             return out
-
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            for wid in workout_ids:
-                try:
-                    url = f"{base}/workouts/{wid}"
-                    headers = {"X-User-Id": self.user_id}
-                    res = await client.get(url, headers=headers)
-                    if res.status_code == 200:
-                        try:
-                            data = res.json() or {}
-                        except ValueError:
-                            logger.warning(
-                                "MacroEngine._fetch_workout_metrics_json_failed",
-                                workout_id=wid,
-                                exc_info=True,
-                            )
-                            continue
-                        out[wid] = {
-                            "readiness_score": data.get("readiness_score"),
-                            "rpe_session": data.get("rpe_session"),
-                        }
-                except httpx.RequestError:
-                    logger.warning(
-                        "MacroEngine._fetch_workout_metrics_failed",
-                        workout_id=wid,
-                        exc_info=True,
-                    )
+        if isinstance(data, list):
+            for item in data:
+                if isinstance(item, dict) and isinstance(item.get("id"), int):
+                    out[item["id"]] = item
         return out
 
-    async def _build_patches(self, rule: dict[str, Any], workout_ids: list[int]) -> list[dict[str, Any]]:
+    async def _fetch_workout_metrics(self, workout_ids: list[int]) -> dict[int, dict[str, Any]]:
+        workouts = await self._data.workouts(workout_ids)
+        return {
+            wid: {"readiness_score": data.get("readiness_score"), "rpe_session": data.get("rpe_session")}
+            for wid, data in workouts.items()
+        }
+
+    async def _build_patches(self, rule: CompiledMacroRule, workout_ids: list[int]) -> list[dict[str, Any]]:
         if not workout_ids:
             return []
-        action = _get_dict(rule, "action")
-        a_type = str(action.get("type") or "").strip()
-        params = _get_dict(action, "params")
-        mode = str(params.get("mode") or "").strip()
+        a_type = rule.action_type
+        params = rule.action_params
+        mode = rule.action_mode
 
         if a_type not in {"Adjust_Load", "Adjust_Reps", "Adjust_Sets"}:
             return []
@@ -976,8 +1127,7 @@ class MacroEngine:
 
         w_details = await self._fetch_workout_details(workout_ids)
 
-        target = _get_dict(action, "target")
-        allowed_ex_ids = await self._resolve_target_exercise_ids(target)
+        allowed_ex_ids = await self._target_exercise_ids(rule)
         patches: list[dict[str, Any]] = []
 
         if a_type == "Adjust_Load":
@@ -1137,6 +1287,19 @@ class MacroEngine:
                                     "changes": {"action": "remove_set"},
                                 }
                             )
+        return patches
+
+    async def _target_exercise_ids(self, rule: CompiledMacroRule) -> set[int] | None:
+        if rule.target_exercise_ids is not None:
+            return set(rule.target_exercise_ids)
+        if not rule.target_selector:
+            return None
+        # Tag selectors depend on the exercise catalog, so they are resolved once per run, not compiled.
+        key = json.dumps(rule.target_selector, sort_keys=True, default=str)
+        if key not in self._selector_ids:
+            self._selector_ids[key] = await self._resolve_target_exercise_ids(rule.target)
+        resolved = self._selector_ids[key]
+        return set(resolved) if resolved is not None else None
 
     async def _resolve_target_exercise_ids(self, target: dict[str, Any]) -> set[int] | None:
         if not isinstance(target, dict) or not target:
@@ -1186,9 +1349,9 @@ class MacroEngine:
         if not httpx:
             return None
         try:
-            async with httpx.AsyncClient(timeout=6.0) as client:
+            async with borrow_http_client("exercises") as client:
                 url = f"{base}/exercises/definitions"
-                res = await client.get(url)
+                res = await client.get(url, timeout=6.0)
                 if res.status_code != 200:
                     return None
                 data = res.json()
@@ -1220,29 +1383,11 @@ class MacroEngine:
         return None
 
     async def _fetch_workout_details(self, workout_ids: list[int]) -> dict[int, dict[str, Any]]:
-        out: dict[int, dict[str, Any]] = {}
-        if not workout_ids:
-            return out
-        base = os.getenv("WORKOUTS_SERVICE_URL")
-        if not base:
-            return out
-        base = base.rstrip("/")
-        if not httpx:
-            return out
-
-        async with httpx.AsyncClient(timeout=6.0) as client:
-            for wid in workout_ids:
-                try:
-                    url = f"{base}/workouts/{wid}"
-                    headers = {"X-User-Id": self.user_id}
-                    res = await client.get(url, headers=headers)
-                    if res.status_code == 200:
-                        data = res.json() or {}
-
-                        out[wid] = {
-                            "exercises": data.get("exercises") or [],
-                            "date": data.get("scheduled_for") or data.get("completed_at"),
-                        }
-                except Exception:
-                    continue
-        return out
+        workouts = await self._data.workouts(workout_ids)
+        return {
+            wid: {
+                "exercises": data.get("exercises") or [],
+                "date": data.get("scheduled_for") or data.get("completed_at"),
+            }
+            for wid, data in workouts.items()
+        }
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from ..models.macro import PlanMacro
+
+# Compiled rules are keyed by macro id and only reused while ``updated_at`` matches.
+COMPILED_RULES_MAX_SIZE = 1024
+
+_compiled_rules: dict[int, tuple[datetime | None, CompiledMacroRule]] = {}
+
+
+def _get_dict(obj: dict[str, Any] | None, key: str) -> dict[str, Any]:
+    """Safely get a dict value, returning empty dict if missing or wrong type."""
+    if obj is None:
+        return {}
+    val = obj.get(key)
+    return val if isinstance(val, dict) else {}
+
+
+def compare_values(op: str, v: Any, target: Any, rng: Any) -> bool:
+    if v is None:
+        return False
+    try:
+        fv = float(v)
+    except (TypeError, ValueError):
+        return False
+    if op in (">", "gt"):
+        return fv > float(target)
+    if op in ("<", "lt"):
+        return fv < float(target)
+    if op in (">=", "ge"):
+        return fv >= float(target)
+    if op in ("<=", "le"):
+        return fv <= float(target)
+    if op in ("=", "==", "eq"):
+        return abs(fv - float(target)) < 1e-6
+    if op in ("!=", "ne"):
+        return abs(fv - float(target)) >= 1e-6
+    if op in ("in_range", "in"):
+        if isinstance(rng, list | tuple) and len(rng) >= 2:
+            a, b = float(rng[0]), float(rng[1])
+            lo, hi = (a, b) if a <= b else (b, a)
+            return (fv >= lo) and (fv <= hi)
+        return False
+    if op in ("not_in_range", "not_in"):
+        if isinstance(rng, list | tuple) and len(rng) >= 2:
+            a, b = float(rng[0]), float(rng[1])
+            lo, hi = (a, b) if a <= b else (b, a)
+            return not ((fv >= lo) and (fv <= hi))
+        return True
+
+
+def _parse_rule(s: str | None) -> dict[str, Any]:
+    if not s:
+        return {}
+    try:
+        obj = json.loads(s)
+        return obj if isinstance(obj, dict) else {}
+    except json.JSONDecodeError:
+        return {}
+
+
+def _exercise_ids(obj: dict[str, Any]) -> list[Any] | None:
+    ex_id = obj.get("exercise_id")
+    ex_ids = obj.get("exercise_ids") if isinstance(obj.get("exercise_ids"), list) else None
+    if ex_id is not None and not ex_ids:
+        ex_ids = [ex_id]
+    return ex_ids or None
+
+
+def _explicit_target_ids(target: dict[str, Any]) -> frozenset[int] | None:
+    out: set[int] = set()
+    for v in _exercise_ids(target) or []:
+        try:
+            out.add(int(v))
+        except (TypeError, ValueError):
+            continue
+    return frozenset(out) if out else None
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledMacroRule:
+    """A parsed ``PlanMacro.rule_json`` with every field the engine reads resolved once."""
+
+    macro_id: int | None
+    rule: dict[str, Any]
+    metric: str
+    op: str
+    value: Any
+    rng: Any
+    trigger: dict[str, Any]
+    condition: dict[str, Any]
+    action: dict[str, Any]
+    action_type: str
+    action_params: dict[str, Any]
+    action_mode: str
+    duration_scope: str
+    count: int
+    trigger_exercise_ids: list[Any] | None
+    target: dict[str, Any]
+    # Explicit target ids; ``None`` with ``target_selector`` set means tags still need resolving.
+    target_exercise_ids: frozenset[int] | None
+    target_selector: dict[str, Any]
+    compare: Callable[[Any], bool] = field(repr=False)
+
+    @classmethod
+    def from_json(cls, rule_json: str | None, macro_id: int | None = None) -> CompiledMacroRule:
+        rule = _parse_rule(rule_json)
+        trigger = _get_dict(rule, "trigger")
+        condition = _get_dict(rule, "condition")
+        action = _get_dict(rule, "action")
+        duration = _get_dict(rule, "duration")
+        params = _get_dict(action, "params")
+        target = _get_dict(action, "target")
+        op = str(condition.get("op") or "").strip()
+        value = condition.get("value")
+        rng = condition.get("range") or condition.get("values")
+        try:
+            count = int(duration.get("count") or 1)
+        except (TypeError, ValueError):
+            count = 1
+        target_ids = _explicit_target_ids(target)
+        return cls(
+            macro_id=macro_id,
+            rule=rule,
+            metric=str(trigger.get("metric") or "").strip(),
+            op=op,
+            value=value,
+            rng=rng,
+            trigger=trigger,
+            condition=condition,
+            action=action,
+            action_type=str(action.get("type") or "").strip(),
+            action_params=params,
+            action_mode=str(params.get("mode") or "").strip(),
+            duration_scope=duration.get("scope") or "Next_N_Workouts",
+            count=count,
+            trigger_exercise_ids=_exercise_ids(trigger),
+            target=target,
+            target_exercise_ids=target_ids,
+            target_selector={} if target_ids else _get_dict(target, "selector"),
+            compare=lambda v: compare_values(op, v, value, rng),
+        )
+
+
+def compile_macro(macro: PlanMacro) -> CompiledMacroRule:
+    """Return the compiled rule for ``macro``, reusing the cached one while the macro is unchanged."""
+    cached = _compiled_rules.get(macro.id)
+    if cached is not None and cached[0] == macro.updated_at:
+        return cached[1]
+    compiled = CompiledMacroRule.from_json(macro.rule_json, macro.id)
+    _compiled_rules.pop(macro.id, None)
+    if len(_compiled_rules) >= COMPILED_RULES_MAX_SIZE:
+        _compiled_rules.pop(next(iter(_compiled_rules)))
+    _compiled_rules[macro.id] = (macro.updated_at, compiled)
+    return compiled
+
+
+def invalidate_compiled_macro(macro_id: int) -> None:
+    _compiled_rules.pop(macro_id, None)
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-import asyncio
+from collections.abc import Callable
 from typing import Any
 
+from backend_common.celery_utils import run_async
 from celery import shared_task
 from celery.utils.log import get_task_logger
 
@@ -17,7 +18,7 @@ logger = get_task_logger(__name__)
 
 
 def _run_async(coro):
-    return asyncio.run(coro)
+    return run_async(coro)
 
 
 async def _apply_plan_async(
@@ -25,12 +26,14 @@ async def _apply_plan_async(
     user_id: str,
     compute_data: dict[str, Any],
     user_max_ids: list[int],
+    progress: Callable[[dict[str, Any]], None] | None = None,
+    resume: bool = False,
 ) -> dict[str, Any]:
     async with AsyncSessionLocal() as session:
         service = AppliedCalendarPlanService(session, user_id)
         compute = ApplyPlanComputeSettings.model_validate(compute_data)
         try:
-            result = await service.apply_plan(plan_id, compute, user_max_ids)
+            result = await service.apply_plan(plan_id, compute, user_max_ids, progress=progress, resume=resume)
         except ValueError as exc:
             return {
                 "ok": False,
@@ -80,6 +83,10 @@ async def _apply_macros_async(
 
         applier = MacroApplier(user_id=user_id)
         patch_result = await applier.apply(preview)
+        # Patched workouts no longer match their stored metric snapshots.
+        await engine.invalidate_workout_metrics(
+            applied_plan_id, (detail["workout_id"] for detail in patch_result.get("details") or [])
+        )
         return {
             "preview": preview,
             "plan_changes": plan_changes_results,
@@ -101,6 +108,9 @@ def apply_plan_task(
     compute: dict[str, Any],
     user_max_ids: list[int],
 ) -> dict[str, Any]:
+    def report_progress(meta: dict[str, Any]) -> None:
+        self.update_state(state="PROGRESS", meta=meta)
+
     try:
         return _run_async(
             _apply_plan_async(
@@ -108,6 +118,9 @@ def apply_plan_task(
                 user_id=user_id,
                 compute_data=compute,
                 user_max_ids=user_max_ids,
+                progress=report_progress,
+                # A retry continues the applied plan left behind by the failed attempt.
+                resume=self.request.retries > 0,
             )
         )
     except Exception as exc:
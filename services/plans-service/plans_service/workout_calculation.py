@@ -1,27 +1,14 @@
-from .rpc import get_intensity, get_rpe_table
+from backend_common.rpe import get_rpe_engine
 
 
 class WorkoutCalculator:
-    RPE_TABLE = None
-
-    @classmethod
-    async def _get_rpe_table(cls, headers=None):
-        if cls.RPE_TABLE is None:
-            cls.RPE_TABLE = await get_rpe_table(headers=headers)
-        return cls.RPE_TABLE
-
     @classmethod
     async def calculate_true_1rm(cls, weight: float, reps: int, rpe: float = 10.0, headers=None) -> float | None:
         if weight is None or reps is None or rpe is None:
             return None
 
         try:
-            await cls._get_rpe_table(headers=headers)
-        except Exception:
-            pass
-
-        try:
-            intensity = await get_intensity(volume=reps, effort=rpe, headers=headers)
+            intensity = get_rpe_engine().compute(volume=reps, effort=rpe).intensity
         except Exception:
             return None
         if intensity is None:
@@ -0,0 +1,5 @@
+import os
+
+# MacroApplier reads the downstream base URLs on construction; tests route them through httpx.MockTransport.
+os.environ.setdefault("EXERCISES_SERVICE_URL", "http://exercises-service:8002")
+os.environ.setdefault("WORKOUTS_SERVICE_URL", "http://workouts-service:8004")
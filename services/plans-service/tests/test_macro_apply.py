@@ -0,0 +1,90 @@
+import asyncio
+import json
+
+import httpx
+from plans_service.services.macro_apply import MacroApplier
+
+
+def _bulk_handler(calls: list[int]):
+    """Stand-in for exercises-service batch-update: any out-of-range patch rejects the whole request."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        items = json.loads(request.content)["items"]
+        calls.append(len(items))
+        if any(item["patch"].get("volume", 1) < 1 for item in items):
+            return httpx.Response(422, json={"detail": "volume must be >= 1"})
+        refs = [{"instance_id": item["instance_id"], "set_id": item["set_id"]} for item in items]
+        return httpx.Response(200, json={"updated": refs, "skipped": [], "instances": []})
+
+    return handler
+
+
+def test_rejected_bulk_chunk_only_fails_the_bad_items():
+    items = [{"instance_id": 10, "set_id": set_id, "patch": {"volume": 5}} for set_id in range(1, 9)]
+    items[5]["patch"]["volume"] = 0
+    calls: list[int] = []
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(_bulk_handler(calls))) as client:
+            return await MacroApplier("user-1")._send_bulk(client, items)
+
+    done, fallback = asyncio.run(run())
+
+    assert done == {(10, set_id) for set_id in range(1, 9) if set_id != 6}
+    assert fallback == set()
+    # 8 -> 4 + 4 -> 2 + 2 -> 1 + 1: the good half never gets split further.
+    assert calls[0] == 8
+    assert sorted(calls[1:]) == [1, 1, 2, 2, 4, 4]
+
+
+def test_forbidden_bulk_chunk_fails_without_bisecting():
+    items = [{"instance_id": 10, "set_id": set_id, "patch": {"volume": 5}} for set_id in range(1, 1001)]
+    calls: list[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(len(json.loads(request.content)["items"]))
+        return httpx.Response(403, json={"detail": "Forbidden"})
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await MacroApplier("user-1")._send_bulk(client, items)
+
+    done, fallback = asyncio.run(run())
+
+    assert done == set()
+    assert fallback == set()
+    assert calls == [1000]
+
+
+def test_accepted_bulk_chunk_is_sent_once():
+    items = [{"instance_id": 10, "set_id": set_id, "patch": {"volume": 5}} for set_id in range(1, 4)]
+    calls: list[int] = []
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(_bulk_handler(calls))) as client:
+            return await MacroApplier("user-1")._send_bulk(client, items)
+
+    done, fallback = asyncio.run(run())
+
+    assert done == {(10, 1), (10, 2), (10, 3)}
+    assert fallback == set()
+    assert calls == [3]
+
+
+def test_fetch_instances_splits_workout_ids_into_batches():
+    workout_ids = list(range(1, 2501))
+    calls: list[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        batch = json.loads(request.content)["workout_ids"]
+        calls.append(len(batch))
+        return httpx.Response(200, json={str(wid): [{"id": wid}] for wid in batch})
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await MacroApplier("user-1")._fetch_instances(client, workout_ids)
+
+    instances = asyncio.run(run())
+
+    assert calls == [1000, 1000, 500]
+    assert sorted(instances) == workout_ids
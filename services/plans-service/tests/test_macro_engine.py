@@ -0,0 +1,86 @@
+import asyncio
+import json
+
+from plans_service.services.macro_engine import MacroEngine
+from plans_service.services.macro_rules import CompiledMacroRule
+
+WORKOUT_DETAILS = {
+    7: {
+        "exercises": [
+            {"exercise_id": 1, "sets": [{"id": 11, "volume": 5, "intensity": 75}, {"id": 12, "volume": 3}]},
+            {"exercise_id": 2, "sets": [{"id": 21, "volume": 8, "intensity": 60}]},
+        ],
+        "date": "2025-01-06",
+    }
+}
+
+
+def _build(action: dict) -> list:
+    rule = CompiledMacroRule.from_json(
+        json.dumps({"trigger": {"metric": "Readiness_Score"}, "condition": {"op": ">", "value": 0}, "action": action})
+    )
+    engine = MacroEngine(None, "user-1")
+
+    async def fetch_workout_details(workout_ids):
+        return {wid: WORKOUT_DETAILS[wid] for wid in workout_ids if wid in WORKOUT_DETAILS}
+
+    engine._fetch_workout_details = fetch_workout_details
+    return asyncio.run(engine._build_patches(rule, [7]))
+
+
+def test_build_patches_returns_rep_adjustments():
+    patches = _build({"type": "Adjust_Reps", "params": {"mode": "by_Value", "value": -1}})
+
+    assert patches == [
+        {"workout_id": 7, "exercise_id": 1, "set_id": 11, "changes": {"volume": 4}},
+        {"workout_id": 7, "exercise_id": 1, "set_id": 12, "changes": {"volume": 2}},
+        {"workout_id": 7, "exercise_id": 2, "set_id": 21, "changes": {"volume": 7}},
+    ]
+
+
+def test_build_patches_returns_set_removals_for_target_exercise():
+    patches = _build({"type": "Adjust_Sets", "params": {"mode": "by_Value", "value": -1}, "target": {"exercise_id": 1}})
+
+    assert patches == [{"workout_id": 7, "exercise_id": 1, "set_id": 12, "changes": {"action": "remove_set"}}]
+
+
+def _history_requests(rules: list[dict], current_idx: int) -> list[int]:
+    engine = MacroEngine(None, "user-1")
+    ordered = [{"workout_id": 100 + idx, "order_index": idx} for idx in range(current_idx + 3)]
+    requested: list[int] = []
+
+    async def prefetch(workout_ids, instances=False):
+        return None
+
+    async def history_metrics(workout_ids):
+        requested.extend(workout_ids)
+        return {}
+
+    engine._data.prefetch = prefetch
+    engine._history_metrics = history_metrics
+    compiled = [CompiledMacroRule.from_json(json.dumps(rule)) for rule in rules]
+    asyncio.run(engine._prefetch_macro_data(compiled, ordered, current_idx))
+    return requested
+
+
+def test_prefetch_loads_only_the_history_tail_rules_need():
+    requested = _history_requests(
+        [
+            {"trigger": {"metric": "Readiness_Score"}, "condition": {"op": "holds_for", "value": 5, "n": 4}},
+            {
+                "trigger": {"metric": "Performance_Trend", "exercise_id": 1},
+                "condition": {"op": "stagnates_for", "n": 3},
+            },
+        ],
+        current_idx=40,
+    )
+
+    assert requested == list(range(134, 140))
+
+
+def test_prefetch_skips_history_for_rules_on_upcoming_workouts():
+    requested = _history_requests(
+        [{"trigger": {"metric": "Readiness_Score"}, "condition": {"op": ">", "value": 5}}], 40
+    )
+
+    assert requested == []
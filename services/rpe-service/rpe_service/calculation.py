@@ -2,6 +2,8 @@ import json
 import logging
 import math
 import os
+from bisect import bisect_left
+from dataclasses import dataclass
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -79,13 +81,73 @@ def load_rpe_table() -> dict[int, dict[int, int]]:
         raise RuntimeError("Error normalizing RPE table keys") from e
 
 
+@dataclass(frozen=True)
+class RpeIndex:
+    """Inverse lookups and sorted keys for nearest-match fallbacks, built once per table."""
+
+    intensity_by_effort_volume: dict[tuple[int, int], int]
+    effort_by_intensity_volume: dict[tuple[int, int], int]
+    intensities: list[int]
+    intensity_rank: dict[int, int]
+    reps_by_effort: dict[int, list[int]]
+
+    @staticmethod
+    def _nearest(values: list[int], target: int, rank) -> int:
+        # Same result as min() over the table in its original order: ties go to the earlier row.
+        pos = bisect_left(values, target)
+        candidates = values[max(pos - 1, 0) : pos + 1]
+        return min(candidates, key=lambda v: (abs(v - target), rank(v)))
+
+    def nearest_intensity(self, intensity: float) -> int:
+        return self._nearest(self.intensities, int(intensity), self.intensity_rank.__getitem__)
+
+    def nearest_for_effort(self, effort: float, volume: float) -> tuple[int, int] | None:
+        """Return (intensity, reps) whose reps at ``effort`` are closest to ``volume``."""
+        ekey = int(effort)
+        reps = self.reps_by_effort.get(ekey)
+        if not reps:
+            return None
+        nearest_reps = self._nearest(
+            reps,
+            int(volume),
+            lambda r: self.intensity_rank[self.intensity_by_effort_volume[(ekey, r)]],
+        )
+        return self.intensity_by_effort_volume[(ekey, nearest_reps)], nearest_reps
+
+
+def build_rpe_index(table: dict[int, dict[int, int]]) -> RpeIndex:
+    intensity_by_effort_volume: dict[tuple[int, int], int] = {}
+    effort_by_intensity_volume: dict[tuple[int, int], int] = {}
+    reps_by_effort: dict[int, set[int]] = {}
+    for intensity, efforts in table.items():
+        for effort, reps in efforts.items():
+            intensity_by_effort_volume.setdefault((effort, reps), intensity)
+            effort_by_intensity_volume.setdefault((intensity, reps), effort)
+            reps_by_effort.setdefault(effort, set()).add(reps)
+    return RpeIndex(
+        intensity_by_effort_volume=intensity_by_effort_volume,
+        effort_by_intensity_volume=effort_by_intensity_volume,
+        intensities=sorted(table),
+        intensity_rank={intensity: rank for rank, intensity in enumerate(table)},
+        reps_by_effort={effort: sorted(reps) for effort, reps in reps_by_effort.items()},
+    )
+
+
 _RPE_TABLE_CACHE = None
+_RPE_INDEX_CACHE = None
 
 
 def get_rpe_table() -> dict[int, dict[int, int]]:
-    global _RPE_TABLE_CACHE
+    global _RPE_TABLE_CACHE, _RPE_INDEX_CACHE
     if _RPE_TABLE_CACHE is None:
-        _RPE_TABLE_CACHE = load_rpe_table()
-        if not validate_rpe_table(_RPE_TABLE_CACHE):
+        table = load_rpe_table()
+        if not validate_rpe_table(table):
             raise RuntimeError("Invalid RPE table structure")
+        _RPE_INDEX_CACHE = build_rpe_index(table)
+        _RPE_TABLE_CACHE = table
     return _RPE_TABLE_CACHE
+
+
+def get_rpe_index() -> RpeIndex:
+    get_rpe_table()
+    return _RPE_INDEX_CACHE
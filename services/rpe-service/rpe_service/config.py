@@ -3,6 +3,9 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     USER_MAX_SERVICE_URL: str = "http://user-max-service:8003"
+    USER_MAX_TIMEOUT_SECONDS: float = 5.0
+    EFFECTIVE_MAX_CACHE_TTL_SECONDS: float = 60.0
+    EFFECTIVE_MAX_CACHE_MAX_ENTRIES: int = 10_000
 
 
 settings = Settings()
@@ -1,13 +1,15 @@
+import asyncio
 import logging
 
 from fastapi import APIRouter, Depends, FastAPI, Header, HTTPException
 from fastapi.responses import JSONResponse
 from prometheus_fastapi_instrumentator import Instrumentator
+from pydantic import ValidationError
 from sentry_sdk import set_tag, set_user
 
+from .calculation import get_rpe_index, round_to_step
 from .calculation import get_rpe_table as cached_rpe_table
-from .calculation import round_to_step
-from .rpc import get_effective_max
+from .rpc import close_client, get_effective_max
 from .rpe_calculations import (
     EffortNotFoundError,
     IntensityNotFoundError,
@@ -16,7 +18,14 @@ from .rpe_calculations import (
     get_intensity,
     get_volume,
 )
-from .schemas import ComputationError, RpeComputeRequest, RpeComputeResponse
+from .schemas import (
+    ComputationError,
+    RpeComputeBatchItem,
+    RpeComputeBatchRequest,
+    RpeComputeBatchResponse,
+    RpeComputeRequest,
+    RpeComputeResponse,
+)
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
@@ -28,6 +37,11 @@ Instrumentator().instrument(app).expose(app, endpoint="/metrics", include_in_sch
 router = APIRouter(prefix="/rpe")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    await close_client()
+
+
 @app.get("/health")
 def health() -> dict[str, str]:
     return {"status": "ok"}
@@ -54,109 +68,142 @@ def get_rpe_table(user_id: str = Depends(get_current_user_id)) -> dict[int, dict
         )
 
 
+def _compute_set(payload: RpeComputeRequest, max_weight: float | None) -> RpeComputeResponse:
+    intensity = payload.intensity
+    effort = payload.effort
+    volume = payload.volume
+    table = cached_rpe_table()
+    index = get_rpe_index()
+    provided = [p is not None for p in (intensity, effort, volume)]
+    if sum(provided) >= 2:
+        if intensity is not None and effort is not None and volume is None:
+            try:
+                volume = get_volume(table, intensity=intensity, effort=effort)
+            except (IntensityNotFoundError, EffortNotFoundError):
+                nearest_int = index.nearest_intensity(intensity)
+                mapping = table[nearest_int]
+
+                nearest_eff = min(mapping.keys(), key=lambda k: abs(k - int(effort)))
+                volume = mapping[nearest_eff]
+                logger.warning(
+                    "Adjusted (intensity,effort)->volume using nearest match | "
+                    "input=(%s,%s) -> intensity=%d effort=%d volume=%d",
+                    str(intensity),
+                    str(effort),
+                    nearest_int,
+                    nearest_eff,
+                    volume,
+                )
+                intensity = nearest_int
+                effort = nearest_eff
+
+        elif volume is not None and effort is not None and intensity is None:
+            try:
+                intensity = get_intensity(table, volume=volume, effort=effort, index=index)
+            except VolumeNotFoundError:
+                ekey = int(effort)
+                nearest = index.nearest_for_effort(ekey, volume)
+                if nearest is not None:
+                    nearest_int, reps = nearest
+                    intensity = nearest_int
+                    volume = reps
+                    logger.warning(
+                        "Adjusted (volume,effort)->intensity using nearest match | "
+                        "requested_volume=%d effort=%d -> intensity=%d volume=%d",
+                        volume,
+                        ekey,
+                        intensity,
+                        volume,
+                    )
+
+        elif volume is not None and intensity is not None and effort is None:
+            try:
+                effort = get_effort(table, volume=volume, intensity=intensity, index=index)
+            except (IntensityNotFoundError, VolumeNotFoundError):
+                nearest_int = index.nearest_intensity(intensity)
+                mapping = table[nearest_int]
+
+                nearest_eff, reps = min(mapping.items(), key=lambda kv: abs(kv[1] - int(volume)))
+                logger.warning(
+                    "Adjusted (intensity,volume)->effort using nearest match | "
+                    "input=(%s,%s) -> intensity=%d effort=%d volume=%d",
+                    str(intensity),
+                    str(volume),
+                    nearest_int,
+                    nearest_eff,
+                    reps,
+                )
+                intensity = nearest_int
+                effort = nearest_eff
+                volume = reps
+    weight = None
+    if max_weight is not None and intensity is not None:
+        raw = max_weight * (intensity / 100.0)
+        weight = round_to_step(raw, payload.rounding_step, payload.rounding_mode)
+    return RpeComputeResponse(intensity=intensity, effort=effort, volume=volume, weight=weight)
+
+
+def _compute_error(payload: RpeComputeRequest, exc: Exception) -> ComputationError:
+    error_msg = (
+        f"RPE calculation failed: {str(exc)}. "
+        f"Input: intensity={payload.intensity}, volume={payload.volume}, effort={payload.effort}. "
+        "This combination may not exist in the RPE table. "
+        "Valid ranges: 90-100%→1-3 reps, 80-89%→3-6 reps, 70-79%→6-10 reps, 60-69%→10-20 reps, 50-59%→15-25 reps."
+    )
+    logger.error(error_msg)
+    return ComputationError(error="COMPUTE_ERROR", message=error_msg)
+
+
+async def _resolve_effective_max(user_max_id: int, user_id: str) -> float | None:
+    try:
+        return await get_effective_max(user_max_id, user_id)
+    except Exception as e:
+        logger.error(f"Failed to get effective max: {str(e)}")
+        return None
+
+
 @router.post("/compute", tags=["Utils"], response_model=RpeComputeResponse)
 async def compute_rpe_set(
     payload: RpeComputeRequest,
     user_id: str = Depends(get_current_user_id),
 ) -> RpeComputeResponse:
+    max_weight = None
+    if payload.user_max_id:
+        max_weight = await _resolve_effective_max(payload.user_max_id, user_id)
+    elif payload.max_weight:
+        max_weight = payload.max_weight
     try:
-        intensity = payload.intensity
-        effort = payload.effort
-        volume = payload.volume
-        table = cached_rpe_table()
-        max_weight = None
-        if payload.user_max_id:
-            try:
-                await get_effective_max(payload.user_max_id)
-            except Exception as e:
-                logger.error(f"Failed to get effective max: {str(e)}")
-        elif payload.max_weight:
-            max_weight = payload.max_weight
-        provided = [p is not None for p in (intensity, effort, volume)]
-        if sum(provided) >= 2:
-            if intensity is not None and effort is not None and volume is None:
-                try:
-                    volume = get_volume(table, intensity=intensity, effort=effort)
-                except (IntensityNotFoundError, EffortNotFoundError):
-                    try:
-                        nearest_int = min(table.keys(), key=lambda x: abs(x - int(intensity)))
-                        mapping = table[nearest_int]
-
-                        nearest_eff = min(mapping.keys(), key=lambda k: abs(k - int(effort)))
-                        volume = mapping[nearest_eff]
-                        logger.warning(
-                            "Adjusted (intensity,effort)->volume using nearest match | "
-                            "input=(%s,%s) -> intensity=%d effort=%d volume=%d",
-                            str(intensity),
-                            str(effort),
-                            nearest_int,
-                            nearest_eff,
-                            volume,
-                        )
-                        intensity = nearest_int
-                        effort = nearest_eff
-                    except Exception:
-                        raise
-
-            elif volume is not None and effort is not None and intensity is None:
-                try:
-                    intensity = get_intensity(table, volume=volume, effort=effort)
-                except VolumeNotFoundError:
-                    candidates = []
-                    ekey = int(effort)
-                    for i, mapping in table.items():
-                        if ekey in mapping:
-                            candidates.append((i, mapping[ekey]))
-                    if candidates:
-                        nearest_int, reps = min(candidates, key=lambda t: abs(t[1] - int(volume)))
-                        intensity = nearest_int
-                        volume = reps
-                        logger.warning(
-                            "Adjusted (volume,effort)->intensity using nearest match | "
-                            "requested_volume=%d effort=%d -> intensity=%d volume=%d",
-                            volume,
-                            ekey,
-                            intensity,
-                            volume,
-                        )
-
-            elif volume is not None and intensity is not None and effort is None:
-                try:
-                    effort = get_effort(table, volume=volume, intensity=intensity)
-                except (IntensityNotFoundError, VolumeNotFoundError):
-                    nearest_int = min(table.keys(), key=lambda x: abs(x - int(intensity)))
-                    mapping = table[nearest_int]
-
-                    nearest_eff, reps = min(mapping.items(), key=lambda kv: abs(kv[1] - int(volume)))
-                    logger.warning(
-                        "Adjusted (intensity,volume)->effort using nearest match | "
-                        "input=(%s,%s) -> intensity=%d effort=%d volume=%d",
-                        str(intensity),
-                        str(volume),
-                        nearest_int,
-                        nearest_eff,
-                        reps,
-                    )
-                    intensity = nearest_int
-                    effort = nearest_eff
-                    volume = reps
-        weight = None
-        if max_weight is not None and intensity is not None:
-            raw = max_weight * (intensity / 100.0)
-            weight = round_to_step(raw, payload.rounding_step, payload.rounding_mode)
-        return RpeComputeResponse(intensity=intensity, effort=effort, volume=volume, weight=weight)
+        return _compute_set(payload, max_weight)
     except Exception as e:
-        error_msg = (
-            f"RPE calculation failed: {str(e)}. "
-            f"Input: intensity={payload.intensity}, volume={payload.volume}, effort={payload.effort}. "
-            "This combination may not exist in the RPE table. "
-            "Valid ranges: 90-100%→1-3 reps, 80-89%→3-6 reps, 70-79%→6-10 reps, 60-69%→10-20 reps, 50-59%→15-25 reps."
-        )
-        logger.error(error_msg)
-        return JSONResponse(
-            status_code=400,
-            content=ComputationError(error="COMPUTE_ERROR", message=error_msg).model_dump(),
-        )
+        return JSONResponse(status_code=400, content=_compute_error(payload, e).model_dump())
+
+
+@router.post("/compute/batch", tags=["Utils"], response_model=RpeComputeBatchResponse)
+async def compute_rpe_set_batch(
+    payload: RpeComputeBatchRequest,
+    user_id: str = Depends(get_current_user_id),
+) -> RpeComputeBatchResponse:
+    results: list[RpeComputeBatchItem] = []
+    valid: list[tuple[int, RpeComputeRequest]] = []
+    for index, raw in enumerate(payload.items):
+        try:
+            valid.append((index, RpeComputeRequest.model_validate(raw)))
+        except ValidationError as e:
+            error = ComputationError(error="VALIDATION_ERROR", message=str(e))
+            results.append(RpeComputeBatchItem(index=index, error=error))
+
+    user_max_ids = sorted({item.user_max_id for _, item in valid if item.user_max_id})
+    effective_maxes = await asyncio.gather(*(_resolve_effective_max(um_id, user_id) for um_id in user_max_ids))
+    max_by_user_max_id = dict(zip(user_max_ids, effective_maxes, strict=True))
+
+    for index, item in valid:
+        max_weight = max_by_user_max_id.get(item.user_max_id) if item.user_max_id else (item.max_weight or None)
+        try:
+            results.append(RpeComputeBatchItem(index=index, result=_compute_set(item, max_weight)))
+        except Exception as e:
+            results.append(RpeComputeBatchItem(index=index, error=_compute_error(item, e)))
+    results.sort(key=lambda r: r.index)
+    return RpeComputeBatchResponse(results=results)
 
 
 app.include_router(router)
@@ -1,18 +1,73 @@
+import time
+
 import httpx
 
 from .config import settings
 
+_client: httpx.AsyncClient | None = None
+# (user_id, user_max_id) -> (expires_at, effective max)
+_effective_max_cache: dict[tuple[str, int], tuple[float, float]] = {}
+
+
+def get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            base_url=settings.USER_MAX_SERVICE_URL,
+            timeout=settings.USER_MAX_TIMEOUT_SECONDS,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+    _effective_max_cache.clear()
+
+
+def _cache_get(key: tuple[str, int]) -> float | None:
+    entry = _effective_max_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, value = entry
+    if expires_at <= time.monotonic():
+        _effective_max_cache.pop(key, None)
+        return None
+    return value
+
+
+def _cache_set(key: tuple[str, int], value: float) -> None:
+    ttl = settings.EFFECTIVE_MAX_CACHE_TTL_SECONDS
+    if ttl <= 0:
+        return
+    if len(_effective_max_cache) >= settings.EFFECTIVE_MAX_CACHE_MAX_ENTRIES:
+        now = time.monotonic()
+        for stale in [k for k, (expires_at, _) in _effective_max_cache.items() if expires_at <= now]:
+            del _effective_max_cache[stale]
+        if len(_effective_max_cache) >= settings.EFFECTIVE_MAX_CACHE_MAX_ENTRIES:
+            # Dicts keep insertion order, so this drops the oldest entry.
+            del _effective_max_cache[next(iter(_effective_max_cache))]
+    _effective_max_cache[key] = (time.monotonic() + ttl, value)
+
+
+async def get_effective_max(user_max_id: int, user_id: str) -> float:
+    key = (user_id, user_max_id)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
 
-async def get_effective_max(user_max_id: int) -> float:
-    url = f"{settings.USER_MAX_SERVICE_URL}/api/v1/user-max/{user_max_id}"
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url)
-            response.raise_for_status()
-            data = response.json()
+    try:
+        response = await get_client().get(f"/user-max/{user_max_id}", headers={"X-User-Id": user_id})
+        response.raise_for_status()
+        data = response.json()
+        value = float(data.get("verified_1rm") or data.get("true_1rm") or data["max_weight"])
+    except httpx.HTTPStatusError as e:
+        raise RuntimeError(f"Ошибка при запросе: {e.response.status_code}") from e
+    except httpx.RequestError as e:
+        raise RuntimeError(f"Ошибка подключения: {str(e)}") from e
 
-            return data.get("verified_1rm") or data.get("true_1rm") or data["max_weight"]
-        except httpx.HTTPStatusError as e:
-            raise RuntimeError(f"Ошибка при запросе: {e.response.status_code}") from e
-        except httpx.RequestError as e:
-            raise RuntimeError(f"Ошибка подключения: {str(e)}") from e
+    _cache_set(key, value)
+    return value
@@ -1,4 +1,10 @@
+from __future__ import annotations
+
 import math
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .calculation import RpeIndex
 
 
 class TableLookupError(Exception):
@@ -29,21 +35,35 @@ def get_volume(rpe_table: dict[int, dict[int, int]], *, intensity: int, effort:
     return efforts[effort_key]
 
 
-def get_intensity(rpe_table: dict[int, dict[int, int]], *, volume: int, effort: float) -> int:
+def get_intensity(
+    rpe_table: dict[int, dict[int, int]], *, volume: int, effort: float, index: RpeIndex | None = None
+) -> int:
     if volume is None or effort is None:
         return None
     effort_key = math.floor(effort)
+    if index is not None:
+        intensity = index.intensity_by_effort_volume.get((effort_key, volume))
+        if intensity is None:
+            raise VolumeNotFoundError(f"Volume {volume} with effort {effort_key} not found")
+        return intensity
     for intensity, efforts in rpe_table.items():
         if effort_key in efforts and efforts[effort_key] == volume:
             return intensity
     raise VolumeNotFoundError(f"Volume {volume} with effort {effort_key} not found")
 
 
-def get_effort(rpe_table: dict[int, dict[int, int]], *, volume: int, intensity: int) -> float:
+def get_effort(
+    rpe_table: dict[int, dict[int, int]], *, volume: int, intensity: int, index: RpeIndex | None = None
+) -> float:
     if volume is None or intensity is None:
         return None
     if intensity not in rpe_table:
         raise IntensityNotFoundError(f"Intensity {intensity} not found")
+    if index is not None:
+        effort = index.effort_by_intensity_volume.get((intensity, volume))
+        if effort is None:
+            raise VolumeNotFoundError(f"Volume {volume} not found for intensity {intensity}")
+        return effort
     efforts = rpe_table[intensity]
     for effort, vol in efforts.items():
         if vol == volume:
@@ -1,4 +1,4 @@
-from typing import Literal
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 
@@ -23,4 +23,19 @@ class RpeComputeResponse(BaseModel):
     intensity: int | None = None
     effort: int | None = None
     volume: int | None = None
-    weight: int | None = None
+    weight: float | None = None
+
+
+class RpeComputeBatchRequest(BaseModel):
+    # Items are validated one by one so a malformed entry yields a per-item error instead of a 422.
+    items: list[dict[str, Any]] = Field(default_factory=list, max_length=5000)
+
+
+class RpeComputeBatchItem(BaseModel):
+    index: int
+    result: RpeComputeResponse | None = None
+    error: ComputationError | None = None
+
+
+class RpeComputeBatchResponse(BaseModel):
+    results: list[RpeComputeBatchItem]
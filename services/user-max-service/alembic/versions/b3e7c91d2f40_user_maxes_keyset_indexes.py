@@ -0,0 +1,30 @@
+"""user-max: (date, id) keyset pagination indexes
+
+Revision ID: b3e7c91d2f40
+Revises: 8a4f6dba3c01
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "b3e7c91d2f40"
+down_revision: str | None = "8a4f6dba3c01"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_user_maxes_user_date_id", "user_maxes", ["user_id", "date", "id"], unique=False)
+    op.create_index(
+        "ix_user_maxes_user_ex_date_id",
+        "user_maxes",
+        ["user_id", "exercise_id", "date", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_maxes_user_ex_date_id", table_name="user_maxes")
+    op.drop_index("ix_user_maxes_user_date_id", table_name="user_maxes")
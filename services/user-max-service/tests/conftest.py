@@ -0,0 +1,5 @@
+import os
+
+# The service modules read these at import time; unit tests never reach the database or the network.
+os.environ.setdefault("USER_MAX_DATABASE_URL", "sqlite://")
+os.environ.setdefault("EXERCISES_SERVICE_URL", "http://exercises-service:8002")
@@ -0,0 +1,131 @@
+import random
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from user_max_service.services import analysis_kernel, analysis_service
+
+MUSCLES = ["chest", "triceps", "front_delts", "lats", "biceps", "quads", "glutes", "hamstrings"]
+
+
+def _make_maxes(seed: int, n_exercises: int = 12, max_rows: int = 40) -> list[SimpleNamespace]:
+    rng = random.Random(seed)
+    today = datetime.utcnow().date()
+    rows = []
+    for ex_id in range(1, n_exercises + 1):
+        base = rng.uniform(20, 180)
+        for _ in range(rng.randint(1, max_rows)):
+            rows.append(
+                SimpleNamespace(
+                    exercise_id=ex_id,
+                    date=today - timedelta(days=rng.randint(0, 500)),
+                    max_weight=int(base * rng.uniform(0.7, 1.2)),
+                    rep_max=rng.choice([1, 3, 5, 8, 10]),
+                    true_1rm=rng.choice([None, None, base]),
+                    verified_1rm=rng.choice([None, None, None, base * 1.05]),
+                )
+            )
+    rng.shuffle(rows)
+    return rows
+
+
+def _make_meta(seed: int, n_exercises: int = 12) -> dict[int, dict]:
+    rng = random.Random(seed)
+    return {
+        ex_id: {
+            "target_muscles": rng.sample(MUSCLES, rng.randint(1, 2)),
+            "synergist_muscles": rng.sample(MUSCLES, rng.randint(0, 3)),
+        }
+        for ex_id in range(1, n_exercises + 1)
+    }
+
+
+def _reference_states(rows, recent_days, iqr_floor, sigma_floor, robust):
+    by_ex: dict[int, list] = {}
+    for um in rows:
+        by_ex.setdefault(um.exercise_id, []).append(um)
+    return {
+        ex_id: analysis_service.compute_exercise_state(arr, recent_days, iqr_floor, sigma_floor, robust)
+        for ex_id, arr in by_ex.items()
+    }
+
+
+def _assert_states_close(actual: dict, expected: dict) -> None:
+    assert actual.keys() == expected.keys()
+    for ex_id, exp in expected.items():
+        got = actual[ex_id]
+        assert got.keys() == exp.keys()
+        for key, value in exp.items():
+            assert got[key] == pytest.approx(value, rel=1e-9, abs=1e-12), (ex_id, key)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_grouped_weighted_quantiles_match_reference(seed):
+    rng = random.Random(seed)
+    groups = [[rng.uniform(-3, 3) for _ in range(rng.randint(1, 30))] for _ in range(8)]
+    weights = [[rng.choice([1.0, rng.uniform(0, 2)]) for _ in g] for g in groups]
+    codes = np.concatenate([np.full(len(g), i) for i, g in enumerate(groups)])
+    qs = (0.0, 0.1, 0.25, 0.5, 0.75, 1.0)
+
+    out = analysis_kernel.grouped_weighted_quantiles(
+        codes, np.concatenate(groups), np.concatenate(weights), qs, len(groups)
+    )
+
+    for i, q in enumerate(qs):
+        for g, (vals, ws) in enumerate(zip(groups, weights)):
+            assert out[i, g] == pytest.approx(analysis_service._weighted_quantile(vals, ws, q))
+
+
+def test_grouped_weighted_quantiles_zero_weights_use_plain_median():
+    codes = np.array([0, 0, 0, 0, 1, 1, 1])
+    values = np.array([4.0, 1.0, 3.0, 2.0, 9.0, 7.0, 8.0])
+
+    out = analysis_kernel.grouped_weighted_quantiles(codes, values, np.zeros(7), (0.25,), 2)
+
+    assert out[0].tolist() == [2.5, 8.0]
+
+
+@pytest.mark.parametrize("robust", [True, False])
+@pytest.mark.parametrize("seed", range(4))
+def test_exercise_states_match_reference(seed, robust):
+    rows = _make_maxes(seed)
+    cols = analysis_kernel.MaxColumns.from_user_maxes(rows)
+
+    states = analysis_kernel.exercise_states(cols, 90, 0.08, 0.06, robust)
+
+    _assert_states_close(states, _reference_states(rows, 90, 0.08, 0.06, robust))
+
+
+@pytest.mark.parametrize("quantile_mode", ["p", "median", "mean"])
+def test_aggregate_muscle_scores_match_reference(quantile_mode):
+    rng = random.Random(7)
+    meta = _make_meta(7)
+    z_by_ex = {ex_id: rng.uniform(-3, 3) for ex_id in meta}
+    conf_by_ex = {ex_id: rng.uniform(0.5, 6) for ex_id in meta}
+
+    scores = analysis_kernel.aggregate_muscle_scores(z_by_ex, conf_by_ex, meta, 0.25, quantile_mode, 0.25)
+    expected = analysis_service._aggregate_muscle_scores_from_ex(z_by_ex, conf_by_ex, meta, 0.25, quantile_mode, 0.25)
+
+    assert scores.keys() == expected.keys()
+    for muscle, value in expected.items():
+        assert scores[muscle] == pytest.approx(value)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_compute_weak_muscles_kernels_agree(monkeypatch, seed):
+    rows = _make_maxes(seed)
+    monkeypatch.setattr(analysis_service, "_build_exercise_meta_index", lambda: _make_meta(seed))
+
+    results = {}
+    for kernel in ("python", "numpy"):
+        monkeypatch.setattr(analysis_service, "ANALYSIS_KERNEL", kernel)
+        results[kernel] = analysis_service.compute_weak_muscles(rows, recent_days=120, min_records=2, use_cache=False)
+
+    expected, actual = results["python"], results["numpy"]
+    assert actual["muscle_strength"] == pytest.approx(expected["muscle_strength"], abs=0.01)
+    assert [m["muscle"] for m in actual["weak_muscles"]] == [m["muscle"] for m in expected["weak_muscles"]]
+    assert actual["trend"].keys() == expected["trend"].keys()
+    for muscle, trend in expected["trend"].items():
+        for key, value in trend.items():
+            assert actual["trend"][muscle][key] == pytest.approx(value), (muscle, key)
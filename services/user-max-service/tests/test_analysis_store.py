@@ -0,0 +1,144 @@
+import asyncio
+import random
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from user_max_service.services import analysis_service, analysis_store
+
+MUSCLES = ["chest", "triceps", "front_delts", "lats", "biceps", "quads", "glutes", "hamstrings"]
+
+
+class _FakePipeline:
+    def __init__(self, redis: "_FakeRedis") -> None:
+        self._redis = redis
+        self._calls: list = []
+
+    async def __aenter__(self) -> "_FakePipeline":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        self._calls = []
+
+    def __getattr__(self, name: str):
+        def queue(*args, **kwargs):
+            self._calls.append((name, args, kwargs))
+
+        return queue
+
+    async def execute(self) -> None:
+        for name, args, kwargs in self._calls:
+            await getattr(self._redis, name)(*args, **kwargs)
+
+
+class _FakeRedis:
+    """The hash/set subset of ``redis.asyncio.Redis`` (``decode_responses=True``) the store uses."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, dict | set] = {}
+
+    def pipeline(self, transaction: bool = True) -> _FakePipeline:
+        return _FakePipeline(self)
+
+    async def hgetall(self, key):
+        return dict(self.data.get(key) or {})
+
+    async def hget(self, key, field):
+        return (self.data.get(key) or {}).get(field)
+
+    async def hset(self, key, mapping):
+        self.data.setdefault(key, {}).update(mapping)
+
+    async def hdel(self, key, *fields):
+        for field in fields:
+            self.data.get(key, {}).pop(field, None)
+
+    async def sadd(self, key, *members):
+        self.data.setdefault(key, set()).update(members)
+
+    async def smembers(self, key):
+        return set(self.data.get(key) or set())
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    async def expire(self, key, seconds):
+        return True
+
+
+def _row(rng: random.Random, exercise_id: int, base: float) -> SimpleNamespace:
+    return SimpleNamespace(
+        exercise_id=exercise_id,
+        exercise_name=f"exercise {exercise_id}",
+        date=datetime.utcnow().date() - timedelta(days=rng.randint(0, 400)),
+        max_weight=int(base * rng.uniform(0.7, 1.2)),
+        rep_max=rng.choice([1, 3, 5, 8, 10]),
+        true_1rm=rng.choice([None, None, base]),
+        verified_1rm=rng.choice([None, None, None, base * 1.05]),
+    )
+
+
+@pytest.fixture
+def store(monkeypatch):
+    rng = random.Random(7)
+    rows = [_row(rng, ex_id, 40 + 10 * ex_id) for ex_id in range(1, 11) for _ in range(rng.randint(2, 25))]
+    meta = {
+        ex_id: {
+            "target_muscles": rng.sample(MUSCLES, rng.randint(1, 2)),
+            "synergist_muscles": rng.sample(MUSCLES, rng.randint(0, 3)),
+        }
+        for ex_id in range(1, 12)
+    }
+    redis = _FakeRedis()
+
+    async def get_redis():
+        return redis
+
+    def analysis_rows(db, user_id, exercise_ids=None):
+        wanted = None if exercise_ids is None else set(exercise_ids)
+        return [r for r in rows if wanted is None or r.exercise_id in wanted]
+
+    monkeypatch.setattr(analysis_store, "get_redis", get_redis)
+    monkeypatch.setattr(analysis_store, "analysis_rows", analysis_rows)
+    monkeypatch.setattr(analysis_store, "_build_exercise_meta_index", lambda: meta)
+    monkeypatch.setattr(analysis_service, "_build_exercise_meta_index", lambda: meta)
+    return SimpleNamespace(rows=rows, rng=rng)
+
+
+def _assert_matches_full_computation(rows: list) -> None:
+    incremental = asyncio.run(analysis_store.compute_weak_muscles_incremental(None, "user-1"))
+    full = analysis_service.compute_weak_muscles(rows, relative_by_exercise=True, use_llm=False, use_cache=False)
+
+    assert incremental is not None
+    assert incremental.keys() == full.keys()
+    assert incremental["muscle_strength"] == pytest.approx(full["muscle_strength"], abs=0.011)
+    assert incremental["trend"].keys() == full["trend"].keys()
+    for muscle, trend in full["trend"].items():
+        assert incremental["trend"][muscle] == pytest.approx(trend), muscle
+    assert [m["muscle"] for m in incremental["weak_muscles"]] == [m["muscle"] for m in full["weak_muscles"]]
+
+
+def test_refreshed_states_match_full_computation_after_create_update_delete(store):
+    rows = store.rows
+    _assert_matches_full_computation(rows)
+
+    # create: a first max for a new exercise and another one for an existing exercise
+    rows.append(_row(store.rng, 11, 95.0))
+    rows.append(_row(store.rng, 3, 70.0))
+    asyncio.run(analysis_store.refresh_exercise_states(None, "user-1", [11, 3]))
+    _assert_matches_full_computation(rows)
+
+    # update: new weight on one max, another one moved to a different exercise
+    changed = next(r for r in rows if r.exercise_id == 5)
+    changed.max_weight += 15
+    moved = next(r for r in rows if r.exercise_id == 6)
+    moved.exercise_id = 7
+    asyncio.run(analysis_store.refresh_exercise_states(None, "user-1", [5]))
+    asyncio.run(analysis_store.refresh_exercise_states(None, "user-1", {6, 7}))
+    _assert_matches_full_computation(rows)
+
+    # delete: every max of one exercise
+    rows[:] = [r for r in rows if r.exercise_id != 2]
+    asyncio.run(analysis_store.refresh_exercise_states(None, "user-1", [2]))
+    _assert_matches_full_computation(rows)
@@ -0,0 +1,39 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+from fastapi.concurrency import run_in_threadpool
+from user_max_service.services import exercise_service
+
+
+@pytest.fixture(autouse=True)
+def _cold_meta_cache(monkeypatch):
+    monkeypatch.setattr(exercise_service, "_EX_META_CACHE", None)
+    monkeypatch.setattr(exercise_service, "_EX_META_CACHE_TS", None)
+
+
+def test_concurrent_meta_misses_share_one_upstream_request(monkeypatch):
+    calls = []
+    lock = threading.Lock()
+
+    def fake_get(url, timeout):
+        with lock:
+            calls.append(url)
+        # Long enough for the second caller to arrive while the first request is in flight.
+        time.sleep(0.2)
+        return httpx.Response(200, json=[{"id": 1, "name": "Bench"}], request=httpx.Request("GET", url))
+
+    monkeypatch.setattr(exercise_service.httpx, "get", fake_get)
+
+    async def fire():
+        return await asyncio.gather(
+            run_in_threadpool(exercise_service.get_all_exercises_meta),
+            run_in_threadpool(exercise_service.get_all_exercises_meta),
+        )
+
+    first, second = asyncio.run(fire())
+
+    assert len(calls) == 1
+    assert first == second == [{"id": 1, "name": "Bench"}]
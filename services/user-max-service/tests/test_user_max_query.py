@@ -0,0 +1,101 @@
+from datetime import date, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from user_max_service.database import Base
+from user_max_service.models import UserMax
+from user_max_service.services import user_max_query
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    start = date(2024, 1, 1)
+    for i in range(25):
+        session.add(
+            UserMax(
+                user_id="u1",
+                exercise_id=1 + i % 3,
+                exercise_name=f"ex{1 + i % 3}",
+                max_weight=100 + i,
+                rep_max=1 + i % 5,
+                # Several rows share a date so the id tie-breaker matters.
+                date=start + timedelta(days=i // 4),
+            )
+        )
+    session.add(UserMax(user_id="u2", exercise_id=1, exercise_name="ex1", max_weight=50, rep_max=1, date=start))
+    session.commit()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def _user_query(db, exercise_id=None):
+    q = db.query(UserMax).filter(UserMax.user_id == "u1")
+    if exercise_id is not None:
+        q = q.filter(UserMax.exercise_id == exercise_id)
+    return q
+
+
+@pytest.mark.parametrize("exercise_id", [None, 2])
+def test_keyset_pages_cover_history_once_newest_first(db, exercise_id):
+    expected = sorted(_user_query(db, exercise_id).all(), key=lambda um: (um.date, um.id), reverse=True)
+
+    seen, cursor = [], None
+    while True:
+        rows, cursor = user_max_query.keyset_page(_user_query(db, exercise_id), cursor, 4)
+        assert len(rows) <= 4
+        seen.extend(rows)
+        if cursor is None:
+            break
+
+    assert [um.id for um in seen] == [um.id for um in expected]
+
+
+def test_keyset_page_rejects_malformed_cursor(db):
+    with pytest.raises(HTTPException) as exc:
+        user_max_query.keyset_page(_user_query(db), "not-a-cursor", 10)
+    assert exc.value.status_code == 400
+
+
+def test_iter_user_maxes_streams_oldest_first_for_one_user(db):
+    rows = list(user_max_query.iter_user_maxes(db, "u1", [1, 3], chunk_size=2))
+
+    assert {um.user_id for um in rows} == {"u1"}
+    assert {um.exercise_id for um in rows} == {1, 3}
+    assert [(um.date, um.id) for um in rows] == sorted((um.date, um.id) for um in rows)
+    assert len(rows) == _user_query(db).filter(UserMax.exercise_id.in_([1, 3])).count()
+
+
+def test_analysis_rows_expose_the_columns_the_analysis_reads(db):
+    rows = user_max_query.analysis_rows(db, "u1", [1])
+
+    assert rows and all(row.exercise_id == 1 for row in rows)
+    assert {"date", "max_weight", "rep_max", "true_1rm", "verified_1rm", "exercise_name"} <= set(rows[0]._fields)
+
+
+def test_keyset_page_honours_limits_above_a_thousand_rows(db):
+    start = date(2020, 1, 1)
+    db.add_all(
+        UserMax(user_id="big", exercise_id=1, exercise_name="ex1", max_weight=100, rep_max=1, date=start + timedelta(i))
+        for i in range(1200)
+    )
+    db.commit()
+    query = db.query(UserMax).filter(UserMax.user_id == "big")
+
+    rows, cursor = user_max_query.keyset_page(query, None, 10000)
+    assert len(rows) == 1200
+    assert cursor is None
+
+    rows, cursor = user_max_query.keyset_page(query, None, 1100)
+    assert len(rows) == 1100
+    rest, cursor = user_max_query.keyset_page(query, cursor, 1100)
+    assert len(rest) == 100
+    assert cursor is None
@@ -1,17 +1,23 @@
 import logging
-from datetime import date
 
-from fastapi import APIRouter, Depends, FastAPI, HTTPException, Query, status
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from prometheus_fastapi_instrumentator import Instrumentator
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from . import schemas as schemas
-from .database import get_db
+from .database import SessionLocal, get_db
 from .dependencies import get_current_user_id
 from .models import UserMax, UserMaxDailyAgg
+from .redis_client import close_redis, init_redis
 from .services.analysis_service import aggregate_exercise_strength_from_daily_agg, compute_weak_muscles
-from .services.exercise_service import get_exercise_name_by_id
+from .services.analysis_store import compute_weak_muscles_incremental, refresh_exercise_states
+from .services.daily_agg_service import dialect_insert, recompute_daily_aggs
+from .services.exercise_service import exercise_catalog, get_exercise_name_by_id, get_exercise_names_by_ids
 from .services.true_1rm_service import calculate_true_1rm
+from .services.user_max_query import analysis_rows, iter_user_maxes, keyset_page
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -21,66 +27,21 @@ app = FastAPI(title="user-max-service", version="0.1.0")
 Instrumentator().instrument(app).expose(app, endpoint="/metrics", include_in_schema=False)
 router = APIRouter(prefix="/user-max")
 
+# Rows per INSERT ... ON CONFLICT statement; keeps bind parameters well under driver limits.
+BULK_UPSERT_CHUNK_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
 
-def _recompute_daily_agg_for(db: Session, user_id: str, exercise_id: int, dt: date) -> None:
-    rows = (
-        db.query(UserMax)
-        .filter(
-            UserMax.user_id == user_id,
-            UserMax.exercise_id == exercise_id,
-            UserMax.date == dt,
-        )
-        .all()
-    )
-    if not rows:
-        agg = (
-            db.query(UserMaxDailyAgg)
-            .filter(
-                UserMaxDailyAgg.user_id == user_id,
-                UserMaxDailyAgg.exercise_id == exercise_id,
-                UserMaxDailyAgg.date == dt,
-            )
-            .first()
-        )
-        if agg:
-            db.delete(agg)
-        return
-
-    sum_true_1rm = 0.0
-    cnt = 0
-    for um in rows:
-        val = um.verified_1rm if getattr(um, "verified_1rm", None) is not None else calculate_true_1rm(um)
-        try:
-            v = float(val)
-        except (TypeError, ValueError):
-            continue
-        sum_true_1rm += v
-        cnt += 1
 
-    if cnt <= 0:
-        return
+@app.on_event("startup")
+async def on_startup() -> None:
+    await init_redis()
+    await exercise_catalog.start()
 
-    agg = (
-        db.query(UserMaxDailyAgg)
-        .filter(
-            UserMaxDailyAgg.user_id == user_id,
-            UserMaxDailyAgg.exercise_id == exercise_id,
-            UserMaxDailyAgg.date == dt,
-        )
-        .first()
-    )
-    if not agg:
-        agg = UserMaxDailyAgg(
-            user_id=user_id,
-            exercise_id=exercise_id,
-            date=dt,
-            sum_true_1rm=sum_true_1rm,
-            cnt=cnt,
-        )
-        db.add(agg)
-    else:
-        agg.sum_true_1rm = sum_true_1rm
-        agg.cnt = cnt
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    await exercise_catalog.stop()
+    await close_redis()
 
 
 def get_user_max_or_404(
@@ -92,6 +53,17 @@ def get_user_max_or_404(
     return user_max
 
 
+def _paginate(q, response: Response, skip: int, limit: int, cursor: str | None) -> list[UserMax]:
+    # Newest first by (date, id). Offset paging stays for old clients; cursor paging is used otherwise
+    # and the next page's cursor is returned in X-Next-Cursor (absent on the last page).
+    if skip and not cursor:
+        return q.order_by(UserMax.date.desc(), UserMax.id.desc()).offset(skip).limit(limit).all()
+    rows, next_cursor = keyset_page(q, cursor, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return rows
+
+
 @app.get("/health")
 async def health():
     logger.info("Healthcheck called")
@@ -105,7 +77,7 @@ async def create_user_max(
     db: Session = Depends(get_db),
 ):
     try:
-        exercise_name = get_exercise_name_by_id(user_max.exercise_id)
+        exercise_name = await run_in_threadpool(get_exercise_name_by_id, user_max.exercise_id)
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -137,9 +109,11 @@ async def create_user_max(
             existing.verified_1rm = user_max.verified_1rm
         if user_max.source is not None:
             existing.source = user_max.source
-        _recompute_daily_agg_for(db, user_id, existing.exercise_id, existing.date)
+        db.flush()
+        recompute_daily_aggs(db, user_id, [(existing.exercise_id, existing.date)])
         db.commit()
         db.refresh(existing)
+        await refresh_exercise_states(db, user_id, [existing.exercise_id])
         return existing
 
     db_user_max = UserMax(
@@ -154,52 +128,59 @@ async def create_user_max(
         source=user_max.source,
     )
     db.add(db_user_max)
-    _recompute_daily_agg_for(db, user_id, db_user_max.exercise_id, db_user_max.date)
+    db.flush()
+    recompute_daily_aggs(db, user_id, [(db_user_max.exercise_id, db_user_max.date)])
     db.commit()
     db.refresh(db_user_max)
+    await refresh_exercise_states(db, user_id, [db_user_max.exercise_id])
     return db_user_max
 
 
 @router.get("/", response_model=list[schemas.UserMaxResponse])
 async def list_user_maxes(
+    response: Response,
     exercise_id: int | None = None,
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
     user_id: str = Depends(get_current_user_id),
     db: Session = Depends(get_db),
 ):
     q = db.query(UserMax).filter(UserMax.user_id == user_id)
     if exercise_id is not None:
         q = q.filter(UserMax.exercise_id == exercise_id)
-    return q.offset(skip).limit(limit).all()
+    return _paginate(q, response, skip, limit, cursor)
 
 
 @router.get("/by_exercise/{exercise_id}", response_model=list[schemas.UserMaxResponse])
 async def get_by_exercise(
+    response: Response,
     exercise_id: int,
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
     user_id: str = Depends(get_current_user_id),
     db: Session = Depends(get_db),
 ):
-    return (
-        db.query(UserMax)
-        .filter(UserMax.user_id == user_id, UserMax.exercise_id == exercise_id)
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+    q = db.query(UserMax).filter(UserMax.user_id == user_id, UserMax.exercise_id == exercise_id)
+    return _paginate(q, response, skip, limit, cursor)
 
 
 @router.get("/by-exercises", response_model=list[schemas.UserMaxResponse])
 async def get_user_maxes_by_exercises(
+    response: Response,
     exercise_ids: list[int],
+    limit: int | None = None,
+    cursor: str | None = None,
     user_id: str = Depends(get_current_user_id),
     db: Session = Depends(get_db),
 ):
     if not all(isinstance(id, int) for id in exercise_ids):
         raise HTTPException(400, "Некорректные ID упражнений")
-    return db.query(UserMax).filter(UserMax.user_id == user_id, UserMax.exercise_id.in_(exercise_ids)).all()
+    q = db.query(UserMax).filter(UserMax.user_id == user_id, UserMax.exercise_id.in_(exercise_ids))
+    if limit is None and cursor is None:
+        return list(iter_user_maxes(db, user_id, exercise_ids))
+    return _paginate(q, response, 0, limit or 100, cursor)
 
 
 @router.get("/by-ids", response_model=list[schemas.UserMaxResponse])
@@ -220,6 +201,25 @@ async def get_user_maxes_by_ids(
     return ordered
 
 
+@router.get("/export")
+async def export_user_maxes(
+    exercise_ids: list[int] | None = Query(None),
+    user_id: str = Depends(get_current_user_id),
+):
+    """Stream the whole history as NDJSON, oldest first, one ``UserMaxResponse`` per line."""
+
+    def lines():
+        # The request session is closed before a streamed body is sent, so the export owns its own.
+        db = SessionLocal()
+        try:
+            for um in iter_user_maxes(db, user_id, exercise_ids):
+                yield schemas.UserMaxResponse.model_validate(um).model_dump_json() + "\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @router.get("/{user_max_id}", response_model=schemas.UserMaxResponse)
 async def get_user_max(user_max: UserMax = Depends(get_user_max_or_404)):
     return user_max
@@ -239,11 +239,11 @@ async def update_user_max(
             raise HTTPException(status_code=400, detail="date field is not allowed to update")
         if k in allowed_fields:
             setattr(user_max, k, v)
-    _recompute_daily_agg_for(db, user_max.user_id, old_exercise_id, old_date)
-    if user_max.exercise_id != old_exercise_id or user_max.date != old_date:
-        _recompute_daily_agg_for(db, user_max.user_id, user_max.exercise_id, user_max.date)
+    db.flush()
+    recompute_daily_aggs(db, user_max.user_id, {(old_exercise_id, old_date), (user_max.exercise_id, user_max.date)})
     db.commit()
     db.refresh(user_max)
+    await refresh_exercise_states(db, user_max.user_id, {old_exercise_id, user_max.exercise_id})
     return user_max
 
 
@@ -253,8 +253,10 @@ async def delete_user_max(user_max: UserMax = Depends(get_user_max_or_404), db:
     exercise_id = user_max.exercise_id
     dt = user_max.date
     db.delete(user_max)
-    _recompute_daily_agg_for(db, user_id, exercise_id, dt)
+    db.flush()
+    recompute_daily_aggs(db, user_id, [(exercise_id, dt)])
     db.commit()
+    await refresh_exercise_states(db, user_id, [exercise_id])
     return None
 
 
@@ -270,8 +272,11 @@ async def verify_1rm(
     db: Session = Depends(get_db),
 ):
     user_max.verified_1rm = verified_1rm
+    db.flush()
+    recompute_daily_aggs(db, user_max.user_id, [(user_max.exercise_id, user_max.date)])
     db.commit()
     db.refresh(user_max)
+    await refresh_exercise_states(db, user_max.user_id, [user_max.exercise_id])
     return user_max
 
 
@@ -283,22 +288,6 @@ async def create_bulk_user_max(
 ):
     logger.info(f"Received bulk create request with {len(user_maxes)} items for user {user_id}")
 
-    exercise_ids = [um.exercise_id for um in user_maxes]
-
-    exercise_names: dict[int, str] = {}
-    for exercise_id in exercise_ids:
-        try:
-            exercise_names[exercise_id] = get_exercise_name_by_id(exercise_id)
-        except HTTPException as e:
-            if e.status_code == 503:
-                logger.error(f"Exercises-service unavailable for ID {exercise_id}: {e.detail}")
-                exercise_names[exercise_id] = "Unknown"
-            else:
-                raise
-        except Exception as e:
-            logger.error(f"Unexpected error fetching exercise name for ID {exercise_id}: {str(e)}")
-            exercise_names[exercise_id] = "Unknown"
-
     merged: dict[tuple, schemas.UserMaxCreate] = {}
     for um in user_maxes:
         key = (um.exercise_id, um.rep_max, um.date)
@@ -307,74 +296,62 @@ async def create_bulk_user_max(
                 merged[key] = um
         else:
             merged[key] = um
+    if not merged:
+        return []
 
-    results: list[UserMax] = []
-    touched_pairs: set[tuple[int, date]] = set()
-    for (exercise_id, rep_max, dt), um in merged.items():
-        logger.info(
-            "Upserting UserMax user_id=%s exercise_id=%s rep_max=%s date=%s",
-            user_id,
-            exercise_id,
-            rep_max,
-            dt,
-        )
-        existing = (
-            db.query(UserMax)
-            .filter(
-                UserMax.user_id == user_id,
-                UserMax.exercise_id == exercise_id,
-                UserMax.rep_max == rep_max,
-                UserMax.date == dt,
-            )
-            .first()
+    exercise_ids = sorted({exercise_id for exercise_id, _, _ in merged})
+    try:
+        exercise_names = await run_in_threadpool(get_exercise_names_by_ids, exercise_ids)
+    except HTTPException as e:
+        if e.status_code != 503:
+            raise
+        logger.error(f"Exercises-service unavailable for IDs {exercise_ids}: {e.detail}")
+        exercise_names = {}
+
+    values = [
+        {
+            "user_id": user_id,
+            "exercise_id": exercise_id,
+            "exercise_name": exercise_names.get(exercise_id, "Unknown"),
+            "max_weight": um.max_weight,
+            "rep_max": rep_max,
+            "date": dt,
+            "true_1rm": um.true_1rm,
+            "verified_1rm": um.verified_1rm,
+            "source": um.source,
+        }
+        for (exercise_id, rep_max, dt), um in merged.items()
+    ]
+    greatest = func.greatest if db.get_bind().dialect.name == "postgresql" else func.max
+    rows: dict[tuple, UserMax] = {}
+    for start in range(0, len(values), BULK_UPSERT_CHUNK_SIZE):
+        stmt = dialect_insert(db, UserMax).values(values[start : start + BULK_UPSERT_CHUNK_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "exercise_id", "rep_max", "date"],
+            set_={
+                "max_weight": greatest(UserMax.max_weight, stmt.excluded.max_weight),
+                "exercise_name": stmt.excluded.exercise_name,
+                "true_1rm": func.coalesce(stmt.excluded.true_1rm, UserMax.true_1rm),
+                "verified_1rm": func.coalesce(stmt.excluded.verified_1rm, UserMax.verified_1rm),
+                "source": func.coalesce(stmt.excluded.source, UserMax.source),
+            },
         )
-        if existing:
-            try:
-                if float(um.max_weight) > float(existing.max_weight or 0):
-                    existing.max_weight = um.max_weight
-            except Exception:
-                pass
-            ex_name = exercise_names.get(exercise_id, "Unknown")
-            if ex_name and existing.exercise_name != ex_name:
-                existing.exercise_name = ex_name
-            if um.true_1rm is not None:
-                existing.true_1rm = um.true_1rm
-            if um.verified_1rm is not None:
-                existing.verified_1rm = um.verified_1rm
-            if um.source is not None:
-                existing.source = um.source
-            results.append(existing)
-        else:
-            db_um = UserMax(
-                user_id=user_id,
-                exercise_id=exercise_id,
-                exercise_name=exercise_names.get(exercise_id, "Unknown"),
-                max_weight=um.max_weight,
-                rep_max=rep_max,
-                date=dt,
-                true_1rm=um.true_1rm,
-                verified_1rm=um.verified_1rm,
-                source=um.source,
-            )
-            db.add(db_um)
-            results.append(db_um)
-
-        touched_pairs.add((exercise_id, dt))
-
-    for exercise_id, dt in touched_pairs:
-        _recompute_daily_agg_for(db, user_id, exercise_id, dt)
+        stmt = stmt.returning(UserMax).execution_options(populate_existing=True)
+        for row in db.scalars(stmt):
+            rows[(row.exercise_id, row.rep_max, row.date)] = row
 
+    recompute_daily_aggs(db, user_id, {(exercise_id, dt) for exercise_id, _, dt in merged})
     db.commit()
-    for um in results:
-        db.refresh(um)
-    return results
+    logger.info(f"Bulk upserted {len(rows)} user maxes for user {user_id}")
+    await refresh_exercise_states(db, user_id, exercise_ids)
+    return [rows[key] for key in merged if key in rows]
 
 
 app.include_router(router)
 
 
 @app.get("/user-max/analysis/weak-muscles")
-def get_weak_muscles(
+async def get_weak_muscles(
     recent_days: int = 180,
     min_records: int = 1,
     synergist_weight: float = 0.25,
@@ -392,27 +369,50 @@ def get_weak_muscles(
     db: Session = Depends(get_db),
 ):
     try:
-        user_maxes = db.query(UserMax).filter(UserMax.user_id == user_id).all()
-        daily_rows = db.query(UserMaxDailyAgg).filter(UserMaxDailyAgg.user_id == user_id).all()
-        precomputed_ex_strength = aggregate_exercise_strength_from_daily_agg(daily_rows) if daily_rows else None
-        profile = compute_weak_muscles(
-            user_maxes=user_maxes,
-            recent_days=recent_days,
-            min_records=min_records,
-            synergist_weight=synergist_weight,
-            use_llm=use_llm,
-            use_cache=not fresh,
-            relative_by_exercise=relative_by_exercise,
-            robust=robust,
-            quantile_mode=quantile_mode,
-            quantile_p=quantile_p,
-            iqr_floor=iqr_floor,
-            sigma_floor=sigma_floor,
-            k_shrink=k_shrink,
-            z_clip=z_clip,
-            precomputed_ex_strength=precomputed_ex_strength,
-        )
-        return profile
+        if relative_by_exercise and not use_llm:
+            profile = await compute_weak_muscles_incremental(
+                db,
+                user_id,
+                recent_days=recent_days,
+                min_records=min_records,
+                synergist_weight=synergist_weight,
+                robust=robust,
+                quantile_mode=quantile_mode,
+                quantile_p=quantile_p,
+                iqr_floor=iqr_floor,
+                sigma_floor=sigma_floor,
+                k_shrink=k_shrink,
+                z_clip=z_clip,
+                fresh=fresh,
+            )
+            if profile is not None:
+                return profile
+
+        def compute_full_profile() -> dict:
+            user_maxes = analysis_rows(db, user_id)
+            daily_rows = db.query(UserMaxDailyAgg).filter(UserMaxDailyAgg.user_id == user_id).all()
+            precomputed_ex_strength = aggregate_exercise_strength_from_daily_agg(daily_rows) if daily_rows else None
+            return compute_weak_muscles(
+                user_maxes=user_maxes,
+                recent_days=recent_days,
+                min_records=min_records,
+                synergist_weight=synergist_weight,
+                use_llm=use_llm,
+                use_cache=not fresh,
+                relative_by_exercise=relative_by_exercise,
+                robust=robust,
+                quantile_mode=quantile_mode,
+                quantile_p=quantile_p,
+                iqr_floor=iqr_floor,
+                sigma_floor=sigma_floor,
+                k_shrink=k_shrink,
+                z_clip=z_clip,
+                precomputed_ex_strength=precomputed_ex_strength,
+                user_id=user_id,
+            )
+
+        # Session queries, metadata HTTP and the analysis itself are blocking; keep them off the event loop.
+        return await run_in_threadpool(compute_full_profile)
     except HTTPException:
         raise
     except Exception as e:
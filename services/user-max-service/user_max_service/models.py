@@ -23,6 +23,8 @@ class UserMax(Base):
         Index("idx_exercise_id", "exercise_id"),
         Index("ix_user_maxes_user_id", "user_id"),
         Index("ix_user_maxes_unique_entry", "user_id", "exercise_id", "rep_max", "date", unique=True),
+        Index("ix_user_maxes_user_date_id", "user_id", "date", "id"),
+        Index("ix_user_maxes_user_ex_date_id", "user_id", "exercise_id", "date", "id"),
     )
 
     def __str__(self):
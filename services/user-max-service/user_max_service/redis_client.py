@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import logging
+import os
+
+from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+redis_client: Redis | None = None
+
+USER_MAX_REDIS_HOST = os.getenv("USER_MAX_REDIS_HOST", "redis")
+USER_MAX_REDIS_PORT = int(os.getenv("USER_MAX_REDIS_PORT", "6379"))
+USER_MAX_REDIS_DB = int(os.getenv("USER_MAX_REDIS_DB", "0"))
+USER_MAX_REDIS_PASSWORD = os.getenv("USER_MAX_REDIS_PASSWORD") or None
+
+WEAK_MUSCLES_STATE_TTL_SECONDS = 7 * 24 * 60 * 60
+
+
+def weak_muscles_states_key(user_id: str, params_key: str) -> str:
+    return f"user-max:weak:{user_id}:states:{params_key}"
+
+
+def weak_muscles_params_key(user_id: str) -> str:
+    return f"user-max:weak:{user_id}:params"
+
+
+async def init_redis() -> None:
+    global redis_client
+
+    try:
+        redis_client = Redis(
+            host=USER_MAX_REDIS_HOST,
+            port=USER_MAX_REDIS_PORT,
+            db=USER_MAX_REDIS_DB,
+            password=USER_MAX_REDIS_PASSWORD,
+            encoding="utf-8",
+            decode_responses=True,
+            health_check_interval=30,
+        )
+        await redis_client.ping()
+        logger.info(
+            "Redis connection established host=%s port=%s db=%s",
+            USER_MAX_REDIS_HOST,
+            USER_MAX_REDIS_PORT,
+            USER_MAX_REDIS_DB,
+        )
+    except Exception:
+        logger.error("Failed to connect to user-max redis", exc_info=True)
+        redis_client = None
+
+
+async def get_redis() -> Redis | None:
+    return redis_client
+
+
+async def close_redis() -> None:
+    global redis_client
+
+    if redis_client is None:
+        return
+
+    try:
+        await redis_client.close()
+        await redis_client.connection_pool.disconnect()
+        logger.info("Redis connection closed")
+    except Exception:
+        logger.warning("Failed to close user-max redis connection", exc_info=True)
+    finally:
+        redis_client = None
@@ -0,0 +1,36 @@
+"""
+Rebuild ``user_max_daily_agg`` from ``user_maxes`` (backfill after a migration or to repair drift)::
+
+    python -m user_max_service.scripts.rebuild_daily_agg
+    python -m user_max_service.scripts.rebuild_daily_agg --user-id <user_id>
+"""
+
+import argparse
+import logging
+
+from ..database import SessionLocal
+from ..services.daily_agg_service import rebuild_daily_aggs
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild user-max daily aggregates in the database")
+    parser.add_argument("--user-id", help="Rebuild only this user's aggregates (default: the whole table)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    db = SessionLocal()
+    try:
+        written = rebuild_daily_aggs(db, user_id=args.user_id)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    logger.info("Rebuilt user_max_daily_agg scope=%s rows=%d", args.user_id or "all", written)
+
+
+if __name__ == "__main__":
+    main()
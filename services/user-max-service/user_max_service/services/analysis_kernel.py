@@ -0,0 +1,191 @@
+"""
+Columnar (NumPy) kernel for the relative weak-muscle analysis.
+
+Mirrors ``compute_exercise_state`` and ``_aggregate_muscle_scores_from_ex`` in ``analysis_service``:
+each max is converted to a log value and a recency weight once, and grouped weighted quantiles are
+taken over segments of one sorted array instead of sorting every group in a Python loop.
+"""
+
+import math
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import date, datetime
+
+import numpy as np
+
+from ..models import UserMax
+from .true_1rm_service import calculate_true_1rm
+
+
+@dataclass(frozen=True)
+class MaxColumns:
+    exercise_ids: np.ndarray
+    age_days: np.ndarray
+    log_values: np.ndarray
+    weights: np.ndarray
+
+    @classmethod
+    def from_user_maxes(
+        cls,
+        rows: Sequence[UserMax],
+        half_life_days: float = 90.0,
+        today: date | None = None,
+    ) -> "MaxColumns":
+        today = today or datetime.utcnow().date()
+        n = len(rows)
+        exercise_ids = np.fromiter((um.exercise_id for um in rows), dtype=np.int64, count=n)
+        age_days = np.fromiter(
+            ((today - (getattr(um, "date", None) or today)).days for um in rows),
+            dtype=np.int64,
+            count=n,
+        )
+        raw = np.fromiter(
+            (float(um.verified_1rm if getattr(um, "verified_1rm", None) else calculate_true_1rm(um)) for um in rows),
+            dtype=np.float64,
+            count=n,
+        )
+        lam = math.log(2.0) / max(1e-6, half_life_days)
+        weights = np.where(age_days <= 0, 1.0, np.exp(-lam * np.maximum(age_days, 0)))
+        return cls(exercise_ids, age_days, np.log1p(np.maximum(raw, 0.0)), weights)
+
+
+def grouped_weighted_quantiles(
+    codes: np.ndarray,
+    values: np.ndarray,
+    weights: np.ndarray,
+    qs: Sequence[float],
+    n_groups: int,
+) -> np.ndarray:
+    """
+    Weighted quantiles of every group, shape ``(len(qs), n_groups)``.
+
+    ``codes`` must map each value to a group in ``range(n_groups)`` and every group must be
+    non-empty. Picks the same element as ``_weighted_quantile``: the first value, in ascending
+    order, whose cumulative weight reaches ``q * total``; the plain median if the total is zero.
+    """
+    order = np.lexsort((values, codes))
+    g = codes[order]
+    v = values[order]
+    w = np.maximum(weights[order], 0.0)
+
+    counts = np.bincount(g, minlength=n_groups)
+    ends = np.cumsum(counts)
+    starts = ends - counts
+    csum_all = np.cumsum(w)
+    csum = csum_all - np.concatenate(([0.0], csum_all))[starts][g]
+    totals = csum[ends - 1]
+
+    mid = starts + counts // 2
+    median = np.where(counts % 2 == 1, v[mid], 0.5 * (v[mid - 1] + v[mid]))
+
+    out = np.empty((len(qs), n_groups), dtype=np.float64)
+    for i, q in enumerate(qs):
+        target = max(0.0, min(1.0, float(q))) * totals
+        # Cumulative weights are non-decreasing within a group, so the count below target is the offset.
+        below = np.bincount(g, weights=csum < target[g], minlength=n_groups).astype(np.int64)
+        idx = np.minimum(starts + below, ends - 1)
+        out[i] = np.where(totals > 0.0, v[idx], median)
+    return out
+
+
+def exercise_states(
+    cols: MaxColumns,
+    recent_days: int,
+    iqr_floor: float,
+    sigma_floor: float,
+    robust: bool = True,
+) -> dict[int, dict]:
+    """``compute_exercise_state`` for every exercise in ``cols`` at once."""
+    if cols.exercise_ids.size == 0:
+        return {}
+    ex_ids, first_seen, codes = np.unique(cols.exercise_ids, return_index=True, return_inverse=True)
+    n = len(ex_ids)
+    v = cols.log_values
+    w = cols.weights
+
+    counts = np.bincount(codes, minlength=n)
+    wsum = np.bincount(codes, weights=w, minlength=n)
+    mean = np.bincount(codes, weights=v, minlength=n) / counts
+    safe_wsum = np.where(wsum > 0, wsum, 1.0)
+    cur_log = np.where(wsum > 0, np.bincount(codes, weights=v * w, minlength=n) / safe_wsum, mean)
+    if robust:
+        q1, med, q3 = grouped_weighted_quantiles(codes, v, w, (0.25, 0.5, 0.75), n)
+        iqr = np.maximum(q3 - q1, float(iqr_floor))
+        sigma = np.maximum(iqr / 1.349, float(sigma_floor))
+    else:
+        med = cur_log
+        var = np.where(wsum > 0, np.bincount(codes, weights=w * (v - med[codes]) ** 2, minlength=n) / safe_wsum, 0.0)
+        sigma = np.maximum(np.sqrt(var), float(sigma_floor))
+    w2 = np.bincount(codes, weights=w * w, minlength=n)
+    n_eff = np.where(w2 > 0, wsum * wsum / np.where(w2 > 0, w2, 1.0), counts)
+
+    recent = cols.age_days <= recent_days
+    previous = ~recent & (cols.age_days <= 2 * recent_days)
+    rec_n = np.bincount(codes, weights=recent, minlength=n).astype(np.int64)
+    prev_n = np.bincount(codes, weights=previous, minlength=n).astype(np.int64)
+    rec_sum = np.bincount(codes, weights=np.where(recent, v, 0.0), minlength=n)
+    prev_sum = np.bincount(codes, weights=np.where(previous, v, 0.0), minlength=n)
+
+    out: dict[int, dict] = {}
+    # Keep the order exercises first appear in, as the per-exercise loop does; it breaks ties downstream.
+    for i in np.argsort(first_seen, kind="stable").tolist():
+        out[int(ex_ids[i])] = {
+            "median": float(med[i]),
+            "sigma": float(sigma[i]),
+            "n_eff": float(n_eff[i]),
+            "cur_log": float(cur_log[i]),
+            "count": int(counts[i]),
+            "rec_mean": float(rec_sum[i] / rec_n[i]) if rec_n[i] else None,
+            "rec_n": int(rec_n[i]),
+            "prev_mean": float(prev_sum[i] / prev_n[i]) if prev_n[i] else None,
+            "prev_n": int(prev_n[i]),
+        }
+    return out
+
+
+def aggregate_muscle_scores(
+    z_by_ex: dict[int, float],
+    conf_by_ex: dict[int, float],
+    id_to_meta: dict[int, dict],
+    synergist_weight: float,
+    quantile_mode: str,
+    quantile_p: float,
+) -> dict[str, float]:
+    """``_aggregate_muscle_scores_from_ex`` with one grouped quantile over all muscles."""
+    muscles: dict[str, int] = {}
+    codes: list[int] = []
+    vals: list[float] = []
+    ws: list[float] = []
+    for ex_id, z in z_by_ex.items():
+        meta = id_to_meta.get(ex_id)
+        if not isinstance(meta, dict):
+            continue
+        conf = max(0.0, float(conf_by_ex.get(ex_id, 1.0)))
+        for m in meta.get("target_muscles") or []:
+            if isinstance(m, str):
+                codes.append(muscles.setdefault(m, len(muscles)))
+                vals.append(z)
+                ws.append(1.0 * conf)
+        if synergist_weight > 0:
+            for m in meta.get("synergist_muscles") or []:
+                if isinstance(m, str):
+                    codes.append(muscles.setdefault(m, len(muscles)))
+                    vals.append(z)
+                    ws.append(float(synergist_weight) * conf)
+    if not muscles:
+        return {}
+
+    n = len(muscles)
+    g = np.asarray(codes, dtype=np.int64)
+    v = np.asarray(vals, dtype=np.float64)
+    w = np.asarray(ws, dtype=np.float64)
+    if quantile_mode == "p":
+        scores = grouped_weighted_quantiles(g, v, w, (quantile_p,), n)[0]
+    elif quantile_mode == "median":
+        scores = grouped_weighted_quantiles(g, v, w, (0.5,), n)[0]
+    else:
+        wsum = np.bincount(g, weights=w, minlength=n)
+        mean = np.bincount(g, weights=v, minlength=n) / np.bincount(g, minlength=n)
+        weighted = np.bincount(g, weights=v * w, minlength=n) / np.where(wsum > 0, wsum, 1.0)
+        scores = np.where(wsum > 0, weighted, mean)
+    return {m: float(scores[i]) for m, i in muscles.items()}
@@ -8,15 +8,19 @@ from datetime import date, datetime, timedelta
 from google import genai
 
 from ..models import UserMax
+from . import analysis_kernel
 from .exercise_service import get_all_exercises_meta
 from .true_1rm_service import calculate_true_1rm
 
 logger = logging.getLogger(__name__)
 
 
-_CACHE: dict[tuple[int, int, float], tuple[float, dict]] = {}
+_CACHE: dict[tuple, tuple[float, dict]] = {}
 _CACHE_TTL_SECONDS = 300
 
+# "numpy" runs the relative analysis on the columnar kernel; "python" keeps the reference loops.
+ANALYSIS_KERNEL = os.getenv("USER_MAX_ANALYSIS_KERNEL", "numpy").strip().lower()
+
 
 EXERCISE_MOVEMENT_SCALE = {
     "compound": 1.0,
@@ -345,53 +349,109 @@ def _aggregate_muscle_scores_from_ex(
     return out
 
 
-def _compute_relative_trends(
-    by_ex: dict[int, list[UserMax]],
+def compute_exercise_state(
+    rows: list[UserMax],
+    recent_days: int,
+    iqr_floor: float,
+    sigma_floor: float,
+    robust: bool = True,
+) -> dict | None:
+    """
+    Robust stats plus recent/previous window means of one exercise's maxes.
+
+    Exercises are independent in the relative analysis, so this is the unit that can be stored
+    per (user, exercise) and recomputed when only that exercise's maxes change.
+    """
+    if not rows:
+        return None
+    ex_id = rows[0].exercise_id
+    stats = _compute_exercise_robust_stats({ex_id: rows}, iqr_floor=iqr_floor, sigma_floor=sigma_floor, robust=robust)
+    if ex_id not in stats:
+        return None
+
+    today = datetime.utcnow().date()
+    recent_from = today - timedelta(days=recent_days)
+    prev_from = today - timedelta(days=2 * recent_days)
+    rec_vals: list[float] = []
+    prev_vals: list[float] = []
+    for um in rows:
+        d = getattr(um, "date", today)
+        val = um.verified_1rm if getattr(um, "verified_1rm", None) else calculate_true_1rm(um)
+        v = math.log1p(max(0.0, float(val)))
+        if d >= recent_from:
+            rec_vals.append(v)
+        elif d >= prev_from:
+            prev_vals.append(v)
+    return {
+        **stats[ex_id],
+        "count": len(rows),
+        "rec_mean": (sum(rec_vals) / len(rec_vals)) if rec_vals else None,
+        "rec_n": len(rec_vals),
+        "prev_mean": (sum(prev_vals) / len(prev_vals)) if prev_vals else None,
+        "prev_n": len(prev_vals),
+    }
+
+
+def compute_exercise_states(
+    rows: list[UserMax],
     recent_days: int,
+    iqr_floor: float,
+    sigma_floor: float,
+    robust: bool = True,
+) -> dict[int, dict]:
+    """``compute_exercise_state`` for every exercise in ``rows``."""
+    if ANALYSIS_KERNEL == "numpy":
+        cols = analysis_kernel.MaxColumns.from_user_maxes(rows)
+        return analysis_kernel.exercise_states(cols, recent_days, iqr_floor, sigma_floor, robust)
+    by_ex: dict[int, list[UserMax]] = {}
+    for um in rows:
+        by_ex.setdefault(um.exercise_id, []).append(um)
+    out: dict[int, dict] = {}
+    for ex_id, arr in by_ex.items():
+        state = compute_exercise_state(arr, recent_days, iqr_floor, sigma_floor, robust)
+        if state is not None:
+            out[ex_id] = state
+    return out
+
+
+def _aggregate_muscle_scores(
+    z_by_ex: dict[int, float],
+    conf_by_ex: dict[int, float],
     id_to_meta: dict[int, dict],
     synergist_weight: float,
-    ex_stats: dict[int, dict],
     quantile_mode: str,
     quantile_p: float,
-) -> dict[str, dict]:
-    today = datetime.utcnow().date()
-    recent_from = today - timedelta(days=recent_days)
-    prev_from = today - timedelta(days=2 * recent_days)
+) -> dict[str, float]:
+    aggregate = (
+        analysis_kernel.aggregate_muscle_scores if ANALYSIS_KERNEL == "numpy" else _aggregate_muscle_scores_from_ex
+    )
+    return aggregate(z_by_ex, conf_by_ex, id_to_meta, synergist_weight, quantile_mode, quantile_p)
+
 
+def _compute_relative_trends(
+    ex_states: dict[int, dict],
+    id_to_meta: dict[int, dict],
+    synergist_weight: float,
+    quantile_mode: str,
+    quantile_p: float,
+) -> dict[str, dict]:
     rec_z_by_ex: dict[int, float] = {}
     prev_z_by_ex: dict[int, float] = {}
     rec_conf: dict[int, float] = {}
     prev_conf: dict[int, float] = {}
 
-    for ex_id, arr in by_ex.items():
-        rec_vals: list[float] = []
-        prev_vals: list[float] = []
-        for um in arr:
-            d = getattr(um, "date", today)
-            val = um.verified_1rm if getattr(um, "verified_1rm", None) else calculate_true_1rm(um)
-            v = math.log1p(max(0.0, float(val)))
-            if d >= recent_from:
-                rec_vals.append(v)
-            elif d >= prev_from:
-                prev_vals.append(v)
-        stats = ex_stats.get(ex_id)
-        if not stats:
-            continue
+    for ex_id, stats in ex_states.items():
         sigma = float(stats.get("sigma", 0.1)) or 0.1
         med = float(stats.get("median", 0.0))
-        if rec_vals:
-            m = sum(rec_vals) / len(rec_vals)
-            rec_z_by_ex[ex_id] = (m - med) / sigma
-            rec_conf[ex_id] = math.sqrt(len(rec_vals))
-        if prev_vals:
-            m = sum(prev_vals) / len(prev_vals)
-            prev_z_by_ex[ex_id] = (m - med) / sigma
-            prev_conf[ex_id] = math.sqrt(len(prev_vals))
-
-    rec_mus = _aggregate_muscle_scores_from_ex(
-        rec_z_by_ex, rec_conf, id_to_meta, synergist_weight, quantile_mode, quantile_p
-    )
-    prev_mus = _aggregate_muscle_scores_from_ex(
+        if stats.get("rec_mean") is not None:
+            rec_z_by_ex[ex_id] = (float(stats["rec_mean"]) - med) / sigma
+            rec_conf[ex_id] = math.sqrt(int(stats.get("rec_n") or 0))
+        if stats.get("prev_mean") is not None:
+            prev_z_by_ex[ex_id] = (float(stats["prev_mean"]) - med) / sigma
+            prev_conf[ex_id] = math.sqrt(int(stats.get("prev_n") or 0))
+
+    rec_mus = _aggregate_muscle_scores(rec_z_by_ex, rec_conf, id_to_meta, synergist_weight, quantile_mode, quantile_p)
+    prev_mus = _aggregate_muscle_scores(
         prev_z_by_ex, prev_conf, id_to_meta, synergist_weight, quantile_mode, quantile_p
     )
 
@@ -407,6 +467,67 @@ def _compute_relative_trends(
     return out
 
 
+def muscle_scores_from_exercise_states(
+    ex_states: dict[int, dict],
+    id_to_meta: dict[int, dict],
+    synergist_weight: float,
+    quantile_mode: str,
+    quantile_p: float,
+    k_shrink: float,
+    z_clip: float,
+) -> tuple[dict[str, float], dict[str, dict]]:
+    z_by_ex: dict[int, float] = {}
+    conf_by_ex: dict[int, float] = {}
+    for ex_id, st in ex_states.items():
+        cur_log = float(st.get("cur_log", 0.0))
+        med = float(st.get("median", 0.0))
+        sigma = float(st.get("sigma", 0.1)) or 0.1
+        n_eff = max(1e-6, float(st.get("n_eff", 1.0)))
+        z_raw = (cur_log - med) / sigma
+        shrink = math.sqrt(n_eff / (n_eff + float(k_shrink)))
+        z = z_raw * shrink
+        z = max(-float(z_clip), min(float(z_clip), z))
+        z_by_ex[ex_id] = z
+        conf_by_ex[ex_id] = math.sqrt(n_eff)
+
+    muscle_strength = _aggregate_muscle_scores(
+        z_by_ex,
+        conf_by_ex,
+        id_to_meta,
+        synergist_weight,
+        quantile_mode,
+        quantile_p,
+    )
+    trends = _compute_relative_trends(ex_states, id_to_meta, synergist_weight, quantile_mode, quantile_p)
+    return muscle_strength, trends
+
+
+def is_degenerate_muscle_strength(muscle_strength: dict[str, float]) -> bool:
+    """Relative scores that are empty or all near zero; callers fall back to absolute mode."""
+    return not muscle_strength or all(abs(v) < 0.05 for v in muscle_strength.values())
+
+
+def rank_weak_muscles(muscle_strength: dict[str, float], trends: dict[str, dict]) -> list[dict]:
+    vals = list(muscle_strength.values())
+    mean = sum(vals) / len(vals) if vals else 0.0
+    var = sum((v - mean) ** 2 for v in vals) / len(vals) if vals else 0.0
+    std = math.sqrt(var)
+
+    weak = []
+    for m, s in muscle_strength.items():
+        z = 0.0 if std == 0.0 else (s - mean) / std
+        weak.append(
+            {
+                "muscle": m,
+                "z": round(z, 3),
+                "score": round(s, 2),
+                "trend": trends.get(m, {}),
+            }
+        )
+    weak.sort(key=lambda x: x["z"])
+    return weak
+
+
 def _aggregate_exercise_strength(user_maxes: list[UserMax]) -> dict[int, float]:
     by_ex: dict[int, list[tuple[float, float]]] = {}
     for um in user_maxes:
@@ -564,6 +685,7 @@ def compute_weak_muscles(
     use_llm: bool = False,
     use_cache: bool = True,
     precomputed_ex_strength: dict[int, float] | None = None,
+    user_id: str | None = None,
 ) -> dict:
     logger.info(
         "compute_weak_muscles: received user_maxes=%d unique_exercises=%d " "recent_days=%d min_records=%d use_llm=%s",
@@ -575,6 +697,7 @@ def compute_weak_muscles(
     )
 
     cache_key = (
+        user_id,
         recent_days,
         min_records,
         float(synergist_weight),
@@ -633,54 +756,24 @@ def compute_weak_muscles(
     if relative_by_exercise:
         id_to_meta = _build_exercise_meta_index()
 
-        by_ex: dict[int, list[UserMax]] = {}
-        for um in filtered:
-            by_ex.setdefault(um.exercise_id, []).append(um)
-        ex_stats = _compute_exercise_robust_stats(
-            by_ex,
-            iqr_floor=iqr_floor,
-            sigma_floor=sigma_floor,
-            robust=robust,
-        )
+        ex_states = compute_exercise_states(filtered, recent_days, iqr_floor, sigma_floor, robust)
 
-        z_by_ex: dict[int, float] = {}
-        conf_by_ex: dict[int, float] = {}
-        for ex_id, st in ex_stats.items():
-            cur_log = float(st.get("cur_log", 0.0))
-            med = float(st.get("median", 0.0))
-            sigma = float(st.get("sigma", 0.1)) or 0.1
-            n_eff = max(1e-6, float(st.get("n_eff", 1.0)))
-            z_raw = (cur_log - med) / sigma
-            shrink = math.sqrt(n_eff / (n_eff + float(k_shrink)))
-            z = z_raw * shrink
-            z = max(-float(z_clip), min(float(z_clip), z))
-            z_by_ex[ex_id] = z
-            conf_by_ex[ex_id] = math.sqrt(n_eff)
-
-        muscle_strength = _aggregate_muscle_scores_from_ex(
-            z_by_ex,
-            conf_by_ex,
-            id_to_meta,
-            synergist_weight,
-            quantile_mode,
-            quantile_p,
-        )
-        trends = _compute_relative_trends(
-            by_ex,
-            recent_days,
+        muscle_strength, trends = muscle_scores_from_exercise_states(
+            ex_states,
             id_to_meta,
             synergist_weight,
-            ex_stats,
             quantile_mode,
             quantile_p,
+            k_shrink,
+            z_clip,
         )
         logger.info(
             "compute_weak_muscles: relative mode | exercises=%d muscles=%d",
-            len(z_by_ex),
+            len(ex_states),
             len(muscle_strength),
         )
 
-        if not muscle_strength or all(abs(v) < 0.05 for v in muscle_strength.values()):
+        if is_degenerate_muscle_strength(muscle_strength):
             logger.warning(
                 "compute_weak_muscles: relative mode produced empty/near-zero scores; " "falling back to absolute mode"
             )
@@ -699,23 +792,7 @@ def compute_weak_muscles(
         len(trends),
     )
 
-    vals = list(muscle_strength.values())
-    mean = sum(vals) / len(vals) if vals else 0.0
-    var = sum((v - mean) ** 2 for v in vals) / len(vals) if vals else 0.0
-    std = math.sqrt(var)
-
-    weak = []
-    for m, s in muscle_strength.items():
-        z = 0.0 if std == 0.0 else (s - mean) / std
-        weak.append(
-            {
-                "muscle": m,
-                "z": round(z, 3),
-                "score": round(s, 2),
-                "trend": trends.get(m, {}),
-            }
-        )
-    weak.sort(key=lambda x: x["z"])
+    weak = rank_weak_muscles(muscle_strength, trends)
 
     anomalies: list[int] = []
     anomaly_details: list[dict] = []
@@ -778,3 +855,8 @@ def compute_weak_muscles(
         len(anomalies),
     )
     return result
+
+
+def invalidate_weak_muscles_cache(user_id: str) -> None:
+    for key in [k for k in _CACHE if k[0] == user_id]:
+        _CACHE.pop(key, None)
@@ -0,0 +1,202 @@
+"""
+Per-user weak-muscle analysis materialized in Redis.
+
+For every parameter set a user has requested, the robust per-exercise state (see
+``compute_exercise_state``) is kept in one hash keyed by exercise id. Reads assemble muscle scores
+and trends from that hash without touching the database; writes recompute only the exercises they
+touched. The states depend on the current date (recency weights and trend windows), so a hash built
+on an earlier day is rebuilt in full on its next read.
+"""
+
+import json
+import logging
+from collections.abc import Iterable
+from datetime import datetime
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from ..redis_client import (
+    WEAK_MUSCLES_STATE_TTL_SECONDS,
+    get_redis,
+    weak_muscles_params_key,
+    weak_muscles_states_key,
+)
+from .analysis_service import (
+    _build_exercise_meta_index,
+    compute_exercise_states,
+    invalidate_weak_muscles_cache,
+    is_degenerate_muscle_strength,
+    muscle_scores_from_exercise_states,
+    rank_weak_muscles,
+)
+from .user_max_query import analysis_rows
+
+logger = logging.getLogger(__name__)
+
+ASOF_FIELD = "__asof__"
+
+
+def analysis_params_key(recent_days: int, iqr_floor: float, sigma_floor: float, robust: bool) -> str:
+    """Encodes the parameters exercise states depend on; the rest only affect assembly."""
+    return f"{int(recent_days)}:{float(iqr_floor)!r}:{float(sigma_floor)!r}:{int(bool(robust))}"
+
+
+def _parse_params_key(params_key: str) -> tuple[int, float, float, bool] | None:
+    try:
+        recent_days, iqr_floor, sigma_floor, robust = params_key.split(":")
+        return int(recent_days), float(iqr_floor), float(sigma_floor), robust == "1"
+    except ValueError:
+        return None
+
+
+async def load_exercise_states(
+    db: Session,
+    user_id: str,
+    recent_days: int,
+    iqr_floor: float,
+    sigma_floor: float,
+    robust: bool,
+    fresh: bool = False,
+) -> dict[int, dict] | None:
+    """Exercise states for the user, rebuilding the stored hash when it is missing or stale.
+
+    Returns ``None`` when Redis is unavailable so callers can fall back to the full computation.
+    """
+    redis = await get_redis()
+    if redis is None:
+        return None
+    params_key = analysis_params_key(recent_days, iqr_floor, sigma_floor, robust)
+    key = weak_muscles_states_key(user_id, params_key)
+    today = datetime.utcnow().date().isoformat()
+
+    if not fresh:
+        try:
+            raw = await redis.hgetall(key)
+        except Exception:
+            logger.warning("Failed to read weak-muscle states user_id=%s", user_id, exc_info=True)
+            return None
+        if raw.get(ASOF_FIELD) == today:
+            return {int(ex_id): json.loads(state) for ex_id, state in raw.items() if ex_id != ASOF_FIELD}
+
+    rows = await run_in_threadpool(analysis_rows, db, user_id)
+    states = await run_in_threadpool(compute_exercise_states, rows, recent_days, iqr_floor, sigma_floor, robust)
+
+    mapping = {str(ex_id): json.dumps(state) for ex_id, state in states.items()}
+    mapping[ASOF_FIELD] = today
+    params_set = weak_muscles_params_key(user_id)
+    try:
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            pipe.hset(key, mapping=mapping)
+            pipe.expire(key, WEAK_MUSCLES_STATE_TTL_SECONDS)
+            pipe.sadd(params_set, params_key)
+            pipe.expire(params_set, WEAK_MUSCLES_STATE_TTL_SECONDS)
+            await pipe.execute()
+    except Exception:
+        logger.warning("Failed to store weak-muscle states user_id=%s", user_id, exc_info=True)
+    logger.info("Rebuilt weak-muscle states user_id=%s exercises=%d", user_id, len(states))
+    return states
+
+
+async def compute_weak_muscles_incremental(
+    db: Session,
+    user_id: str,
+    recent_days: int = 180,
+    min_records: int = 1,
+    synergist_weight: float = 0.25,
+    robust: bool = True,
+    quantile_mode: str = "p",
+    quantile_p: float = 0.25,
+    iqr_floor: float = 0.08,
+    sigma_floor: float = 0.06,
+    k_shrink: float = 12.0,
+    z_clip: float = 3.0,
+    fresh: bool = False,
+) -> dict | None:
+    """
+    Relative weak-muscle profile assembled from the stored exercise states.
+
+    Matches ``compute_weak_muscles(relative_by_exercise=True, use_llm=False)``. Returns ``None``
+    when the result cannot be served this way (Redis unavailable, or the scores are degenerate and
+    the absolute-mode fallback is needed).
+    """
+    states = await load_exercise_states(db, user_id, recent_days, iqr_floor, sigma_floor, robust, fresh=fresh)
+    if states is None:
+        return None
+    if min_records > 1:
+        states = {ex_id: st for ex_id, st in states.items() if int(st.get("count") or 0) >= min_records}
+    if not states:
+        return {
+            "recent_days": recent_days,
+            "weak_muscles": [],
+            "muscle_strength": {},
+            "trend": {},
+        }
+
+    # The metadata fetch is blocking HTTP; in the threadpool concurrent misses also share one request.
+    id_to_meta = await run_in_threadpool(_build_exercise_meta_index)
+    muscle_strength, trends = muscle_scores_from_exercise_states(
+        states,
+        id_to_meta,
+        synergist_weight,
+        quantile_mode,
+        quantile_p,
+        k_shrink,
+        z_clip,
+    )
+    if is_degenerate_muscle_strength(muscle_strength):
+        return None
+
+    weak = rank_weak_muscles(muscle_strength, trends)
+    return {
+        "recent_days": recent_days,
+        "weak_muscles": weak[:3],
+        "muscle_strength": {k: round(v, 2) for k, v in muscle_strength.items()},
+        "trend": trends,
+        "anomalies": [],
+        "anomaly_details": [],
+        "llm_enabled": False,
+    }
+
+
+async def refresh_exercise_states(db: Session, user_id: str, exercise_ids: Iterable[int]) -> None:
+    """Recompute the stored states of ``exercise_ids`` after the user's maxes for them changed."""
+    invalidate_weak_muscles_cache(user_id)
+    ids = sorted({int(ex_id) for ex_id in exercise_ids if ex_id is not None})
+    redis = await get_redis()
+    if redis is None or not ids:
+        return
+
+    try:
+        params_keys = await redis.smembers(weak_muscles_params_key(user_id))
+        if not params_keys:
+            return
+        today = datetime.utcnow().date().isoformat()
+        rows: list | None = None
+        for params_key in params_keys:
+            params = _parse_params_key(params_key)
+            key = weak_muscles_states_key(user_id, params_key)
+            if params is None or await redis.hget(key, ASOF_FIELD) != today:
+                # Missing or stale hashes are rebuilt in full on their next read.
+                continue
+            if rows is None:
+                rows = await run_in_threadpool(analysis_rows, db, user_id, ids)
+            states = await run_in_threadpool(compute_exercise_states, rows, *params)
+            updates = {str(ex_id): json.dumps(state) for ex_id, state in states.items()}
+            removed = [str(ex_id) for ex_id in ids if ex_id not in states]
+            async with redis.pipeline(transaction=True) as pipe:
+                if updates:
+                    pipe.hset(key, mapping=updates)
+                if removed:
+                    pipe.hdel(key, *removed)
+                await pipe.execute()
+    except Exception:
+        logger.warning("Failed to refresh weak-muscle states user_id=%s exercise_ids=%s", user_id, ids, exc_info=True)
+        try:
+            # Drop the user's states rather than serve ones that miss this write.
+            params_keys = await redis.smembers(weak_muscles_params_key(user_id))
+            if params_keys:
+                await redis.delete(*(weak_muscles_states_key(user_id, pk) for pk in params_keys))
+        except Exception:
+            pass
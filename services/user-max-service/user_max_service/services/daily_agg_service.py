@@ -0,0 +1,105 @@
+from collections.abc import Iterable
+from datetime import date
+
+from sqlalchemy import and_, delete, exists, func, select, text, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from ..models import UserMax, UserMaxDailyAgg
+from .true_1rm_service import true_1rm_sql
+
+
+def dialect_insert(db: Session, model):
+    """``INSERT`` construct with ``on_conflict_do_update`` support for the session's database."""
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
+
+
+def _grouped_daily_aggs():
+    value = true_1rm_sql()
+    return (
+        select(
+            UserMax.user_id,
+            UserMax.exercise_id,
+            UserMax.date,
+            func.sum(value).label("sum_true_1rm"),
+            func.count(value).label("cnt"),
+        )
+        .group_by(UserMax.user_id, UserMax.exercise_id, UserMax.date)
+        .having(func.count(value) > 0)
+    )
+
+
+def _upsert_from(db: Session, grouped) -> None:
+    stmt = dialect_insert(db, UserMaxDailyAgg).from_select(
+        ["user_id", "exercise_id", "date", "sum_true_1rm", "cnt"], grouped
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "exercise_id", "date"],
+        set_={"sum_true_1rm": stmt.excluded.sum_true_1rm, "cnt": stmt.excluded.cnt},
+    )
+    db.execute(stmt)
+
+
+def _lock_user_aggs(db: Session, user_id: str) -> None:
+    # Serializes aggregate writes per user until commit; under READ COMMITTED the waiting writer's
+    # grouped select then sees the rows the other one committed, so the aggregate cannot drift.
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(
+            text("SELECT pg_advisory_xact_lock(hashtextextended(:key, 0))"),
+            {"key": f"user_max_daily_agg:{user_id}"},
+        )
+
+
+def recompute_daily_aggs(db: Session, user_id: str, pairs: Iterable[tuple[int, date]]) -> None:
+    """
+    Recompute the daily aggregates of the touched (exercise_id, date) pairs in the database.
+
+    One grouped ``INSERT ... SELECT ... ON CONFLICT DO UPDATE`` rewrites every pair that still has
+    maxes and one ``DELETE`` drops the pairs that no longer have any.
+    """
+    keys = sorted({(int(ex_id), dt) for ex_id, dt in pairs})
+    if not keys:
+        return
+    _lock_user_aggs(db, user_id)
+    _upsert_from(
+        db,
+        _grouped_daily_aggs().where(UserMax.user_id == user_id, tuple_(UserMax.exercise_id, UserMax.date).in_(keys)),
+    )
+
+    has_maxes = exists().where(
+        and_(
+            UserMax.user_id == UserMaxDailyAgg.user_id,
+            UserMax.exercise_id == UserMaxDailyAgg.exercise_id,
+            UserMax.date == UserMaxDailyAgg.date,
+        )
+    )
+    db.execute(
+        delete(UserMaxDailyAgg)
+        .where(
+            UserMaxDailyAgg.user_id == user_id,
+            tuple_(UserMaxDailyAgg.exercise_id, UserMaxDailyAgg.date).in_(keys),
+            ~has_maxes,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def rebuild_daily_aggs(db: Session, user_id: str | None = None) -> int:
+    """
+    Rebuild ``user_max_daily_agg`` from ``user_maxes`` for one user, or the whole table.
+
+    Runs in the caller's transaction; returns the number of aggregate rows written.
+    """
+    if user_id is not None:
+        _lock_user_aggs(db, user_id)
+        db.execute(delete(UserMaxDailyAgg).where(UserMaxDailyAgg.user_id == user_id))
+        grouped = _grouped_daily_aggs().where(UserMax.user_id == user_id)
+        _upsert_from(db, grouped)
+        return db.scalar(select(func.count()).select_from(UserMaxDailyAgg).where(UserMaxDailyAgg.user_id == user_id))
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("LOCK TABLE user_max_daily_agg IN EXCLUSIVE MODE"))
+    db.execute(delete(UserMaxDailyAgg))
+    _upsert_from(db, _grouped_daily_aggs())
+    return db.scalar(select(func.count()).select_from(UserMaxDailyAgg))
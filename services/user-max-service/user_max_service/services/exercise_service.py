@@ -3,8 +3,12 @@ import os
 import time
 
 import httpx
+from backend_common.exercise_catalog import ExerciseCatalogReplica
+from backend_common.singleflight import SyncSingleFlight
 from fastapi import HTTPException
 
+from ..redis_client import get_redis
+
 logger = logging.getLogger(__name__)
 
 EXERCISES_SERVICE_URL = os.getenv("EXERCISES_SERVICE_URL") or os.getenv("GATEWAY_URL")
@@ -17,18 +21,30 @@ if not EXERCISES_SERVICE_URL.startswith(("http://", "https://")):
 _EX_META_CACHE: list | None = None
 _EX_META_CACHE_TS: float | None = None
 _EX_META_TTL_SECONDS: float = float(os.getenv("EX_META_TTL_SECONDS", "1800"))
+# Threads that miss the cache together share a single request to exercises-service.
+_EX_META_FLIGHT = SyncSingleFlight()
 
+# Local copy of the catalog published by exercises-service; lookups fall back to HTTP until it loads.
+exercise_catalog = ExerciseCatalogReplica(
+    get_redis, poll_interval=float(os.getenv("EXERCISE_CATALOG_POLL_SECONDS", "30"))
+)
 
-def get_exercise_name_by_id(exercise_id: int, max_retries: int = 3, retry_delay: float = 1.0) -> str:
-    url = f"{EXERCISES_SERVICE_URL}/exercises/definitions/{exercise_id}"
-    logger.info(f"Fetching exercise name from: {url}")
 
+def _get_json_with_retries(
+    url: str,
+    what: str,
+    *,
+    params: dict | None = None,
+    timeout: float = 5.0,
+    max_retries: int = 3,
+    retry_delay: float = 1.0,
+):
+    """GET ``url`` and return its JSON, retrying 5xx and connection errors; failures map to HTTPException."""
     for attempt in range(max_retries):
         try:
-            response = httpx.get(url, timeout=3.0)
+            response = httpx.get(url, params=params, timeout=timeout)
             response.raise_for_status()
-            exercise = response.json()
-            return exercise["name"]
+            return response.json()
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error: {e.response.status_code} for URL {url}")
             if e.response.status_code >= 500 and attempt < max_retries - 1:
@@ -46,13 +62,62 @@ def get_exercise_name_by_id(exercise_id: int, max_retries: int = 3, retry_delay:
             raise HTTPException(status_code=503, detail=f"Cannot connect to exercises-service: {str(e)}")
         except Exception as e:
             logger.error(f"Unexpected error: {str(e)}")
-            raise HTTPException(status_code=500, detail=f"Unexpected error fetching exercise name: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Unexpected error fetching {what}: {str(e)}")
+
+    raise HTTPException(status_code=503, detail=f"Failed to fetch {what} after retries")
+
+
+def get_exercise_name_by_id(exercise_id: int, max_retries: int = 3, retry_delay: float = 1.0) -> str:
+    name = exercise_catalog.name(exercise_id)
+    if name is not None:
+        return name
+
+    url = f"{EXERCISES_SERVICE_URL}/exercises/definitions/{exercise_id}"
+    logger.info(f"Fetching exercise name from: {url}")
+    exercise = _get_json_with_retries(
+        url, "exercise name", timeout=3.0, max_retries=max_retries, retry_delay=retry_delay
+    )
+    try:
+        return exercise["name"]
+    except (KeyError, TypeError) as e:
+        logger.error(f"Unexpected error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Unexpected error fetching exercise name: {str(e)}")
 
-    raise HTTPException(status_code=503, detail="Failed to fetch exercise name after retries")
+
+def get_exercise_names_by_ids(
+    exercise_ids: list[int], max_retries: int = 3, retry_delay: float = 1.0
+) -> dict[int, str]:
+    """Resolve many exercise names with a single definitions request."""
+    ids = sorted({int(ex_id) for ex_id in exercise_ids})
+    if not ids:
+        return {}
+    names = {ex_id: exercise_catalog.name(ex_id) for ex_id in ids}
+    if all(name is not None for name in names.values()):
+        return names
+
+    url = f"{EXERCISES_SERVICE_URL}/exercises/definitions/"
+    params = {"ids": ",".join(str(ex_id) for ex_id in ids)}
+    logger.info(f"Fetching {len(ids)} exercise names from: {url}")
+    data = _get_json_with_retries(
+        url, "exercise names", params=params, max_retries=max_retries, retry_delay=retry_delay
+    )
+
+    names: dict[int, str] = {}
+    for item in data if isinstance(data, list) else []:
+        try:
+            names[int(item["id"])] = item["name"]
+        except (KeyError, TypeError, ValueError):
+            continue
+    missing = [ex_id for ex_id in ids if ex_id not in names]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Exercise definitions not found: {missing}")
+    return names
 
 
 def get_all_exercises_meta(max_retries: int = 3, retry_delay: float = 1.0) -> list:
-    global _EX_META_CACHE, _EX_META_CACHE_TS
+    if exercise_catalog.loaded:
+        return exercise_catalog.values()
+
     now = time.time()
 
     if _EX_META_CACHE is not None and _EX_META_CACHE_TS is not None:
@@ -60,6 +125,11 @@ def get_all_exercises_meta(max_retries: int = 3, retry_delay: float = 1.0) -> li
             logger.info("Using cached exercises meta")
             return _EX_META_CACHE
 
+    return _EX_META_FLIGHT.do("all", lambda: _fetch_all_exercises_meta(now, max_retries, retry_delay))
+
+
+def _fetch_all_exercises_meta(now: float, max_retries: int, retry_delay: float) -> list:
+    global _EX_META_CACHE, _EX_META_CACHE_TS
     url = f"{EXERCISES_SERVICE_URL}/exercises/definitions/"
     logger.info(f"Fetching all exercises meta from: {url}")
     for attempt in range(max_retries):
@@ -1,6 +1,21 @@
+from sqlalchemy import case
+
+from ..models import UserMax
+
+
 def calculate_true_1rm(user_max):
     if user_max.true_1rm:
         return user_max.true_1rm
     if user_max.rep_max and user_max.rep_max > 0:
         return user_max.max_weight * (1 + user_max.rep_max / 30.0)
     return user_max.max_weight
+
+
+def true_1rm_sql():
+    """SQL counterpart of ``verified_1rm`` falling back to ``calculate_true_1rm`` for a ``UserMax`` row."""
+    return case(
+        (UserMax.verified_1rm.is_not(None), UserMax.verified_1rm),
+        ((UserMax.true_1rm.is_not(None)) & (UserMax.true_1rm != 0), UserMax.true_1rm),
+        (UserMax.rep_max > 0, UserMax.max_weight * (1 + UserMax.rep_max / 30.0)),
+        else_=UserMax.max_weight,
+    )
@@ -0,0 +1,83 @@
+import base64
+import binascii
+from collections.abc import Iterable, Iterator
+from datetime import date
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Query, Session
+
+from ..models import UserMax
+
+# Rows fetched per round trip when streaming; the ORM buffers no more than this at a time.
+STREAM_CHUNK_SIZE = 1000
+
+
+def encode_cursor(row_date: date, row_id: int) -> str:
+    """Opaque keyset cursor pointing at the last row of a page."""
+    return base64.urlsafe_b64encode(f"{row_date.isoformat()}|{row_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[date, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        row_date, row_id = raw.split("|", 1)
+        return date.fromisoformat(row_date), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Некорректный курсор пагинации")
+
+
+def keyset_page(query: Query, cursor: str | None, limit: int) -> tuple[list[UserMax], str | None]:
+    """
+    One page of ``query`` ordered newest first by ``(date, id)``, plus the cursor of the next page.
+
+    Seeks past the cursor instead of using ``OFFSET``, so every page costs the same index range scan
+    on ``(user_id, [exercise_id,] date, id)`` however deep the client is.
+    """
+    # Not capped: existing callers (the gateway asks for limit=10000) expect one page to hold the whole history.
+    limit = max(1, int(limit))
+    if cursor:
+        after_date, after_id = decode_cursor(cursor)
+        query = query.filter(or_(UserMax.date < after_date, and_(UserMax.date == after_date, UserMax.id < after_id)))
+    rows = query.order_by(UserMax.date.desc(), UserMax.id.desc()).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].date, rows[-1].id)
+
+
+def iter_user_maxes(
+    db: Session,
+    user_id: str,
+    exercise_ids: Iterable[int] | None = None,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> Iterator[UserMax]:
+    """Yield a user's maxes oldest first, fetched through a server-side cursor ``chunk_size`` rows at a time."""
+    stmt = select(UserMax).where(UserMax.user_id == user_id)
+    if exercise_ids is not None:
+        stmt = stmt.where(UserMax.exercise_id.in_(list(exercise_ids)))
+    stmt = stmt.order_by(UserMax.date, UserMax.id).execution_options(yield_per=chunk_size)
+    for user_max in db.scalars(stmt):
+        yield user_max
+        # Detach streamed rows so the identity map does not grow with the history.
+        db.expunge(user_max)
+
+
+def analysis_rows(db: Session, user_id: str, exercise_ids: Iterable[int] | None = None) -> list:
+    """
+    The columns the weak-muscle analysis reads, as plain rows rather than ORM instances.
+
+    Skips identity-map bookkeeping and instance construction for the whole history.
+    """
+    stmt = select(
+        UserMax.exercise_id,
+        UserMax.exercise_name,
+        UserMax.date,
+        UserMax.max_weight,
+        UserMax.rep_max,
+        UserMax.true_1rm,
+        UserMax.verified_1rm,
+    ).where(UserMax.user_id == user_id)
+    if exercise_ids is not None:
+        stmt = stmt.where(UserMax.exercise_id.in_(list(exercise_ids)))
+    return list(db.execute(stmt.execution_options(yield_per=STREAM_CHUNK_SIZE)))
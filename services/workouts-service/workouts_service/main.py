@@ -1,5 +1,6 @@
 import structlog
 from backend_common.fastapi_app import create_service_app
+from backend_common.http_client import close_http_clients
 from fastapi.responses import JSONResponse
 
 from .exceptions import NotFoundException
@@ -41,6 +42,7 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     await close_redis()
+    await close_http_clients()
 
 
 app.include_router(workouts_router, prefix="/workouts")
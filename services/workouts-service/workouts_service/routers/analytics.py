@@ -1,10 +1,10 @@
-import asyncio
 import logging
 import os
 from datetime import datetime, timedelta
 from typing import Any
 
 import httpx
+from backend_common.http_client import INSTANCES_BY_WORKOUTS_BATCH_SIZE, borrow_http_client
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -19,20 +19,33 @@ router = APIRouter(prefix="/analytics")
 logger = logging.getLogger(__name__)
 
 
-async def _fetch_workout_instances(workout_id: int, user_id: str) -> list[dict[str, Any]]:
+async def _fetch_instances_by_workouts(workout_ids: list[int], user_id: str) -> dict[int, list[dict[str, Any]]]:
+    if not workout_ids:
+        return {}
     base_url = os.getenv("EXERCISES_SERVICE_URL", "http://exercises-service:8002").rstrip("/")
-    url = f"{base_url}/exercises/instances/workouts/{workout_id}/instances"
+    url = f"{base_url}/exercises/instances/by-workouts"
     headers = {"X-User-Id": user_id}
+    out: dict[int, list[dict[str, Any]]] = {}
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            resp = await client.get(url, headers=headers)
-            if resp.status_code == 200:
+        async with borrow_http_client("exercises") as client:
+            for start in range(0, len(workout_ids), INSTANCES_BY_WORKOUTS_BATCH_SIZE):
+                batch = workout_ids[start : start + INSTANCES_BY_WORKOUTS_BATCH_SIZE]
+                resp = await client.post(
+                    url,
+                    headers=headers,
+                    # _compute_actual_metrics reads muscle groups and names from the embedded definitions.
+                    json={"workout_ids": batch, "include_definition": True},
+                    timeout=10.0,
+                )
+                if resp.status_code != 200:
+                    logger.warning(f"Failed to fetch instances for {len(batch)} workouts: HTTP {resp.status_code}")
+                    continue
                 data = resp.json()
-                if isinstance(data, list):
-                    return data
+                if isinstance(data, dict):
+                    out.update({int(wid): items for wid, items in data.items() if isinstance(items, list)})
     except (httpx.RequestError, httpx.HTTPStatusError, ValueError) as e:
-        logger.warning(f"Failed to fetch instances for workout {workout_id}: {e}")
-    return []
+        logger.warning(f"Failed to fetch instances for {len(workout_ids)} workouts: {e}")
+    return out
 
 
 def _build_set_volume_index(instances: list[dict[str, Any]]) -> tuple[dict[int, float], float]:
@@ -220,17 +233,11 @@ async def get_profile_aggregates(
     wid_to_index: dict[int, dict[int, float]] = {}
     wid_to_total: dict[int, float] = {}
 
-    sem = asyncio.Semaphore(6)
-
-    async def _build_for_wid(wid: int) -> None:
-        async with sem:
-            instances = await _fetch_workout_instances(wid, user_id)
-            set_idx, total = _build_set_volume_index(instances)
-            wid_to_index[wid] = set_idx
-            wid_to_total[wid] = total
-
-    if unique_wids:
-        await asyncio.gather(*[_build_for_wid(wid) for wid in unique_wids])
+    instances_by_wid = await _fetch_instances_by_workouts(unique_wids, user_id)
+    for wid in unique_wids:
+        set_idx, total = _build_set_volume_index(instances_by_wid.get(wid, []))
+        wid_to_index[wid] = set_idx
+        wid_to_total[wid] = total
 
     activity_map: dict[str, dict[str, float]] = {}
     total_volume = 0.0
@@ -480,13 +487,7 @@ async def get_plan_analytics(
         sessions_by_wid = {s.workout_id: s for s in sessions}
 
         if sessions_by_wid:
-            fetch_tasks = []
-            wids_to_fetch = list(sessions_by_wid.keys())
-            for wid in wids_to_fetch:
-                fetch_tasks.append(_fetch_workout_instances(wid, user_id))
-
-            fetched_results = await asyncio.gather(*fetch_tasks)
-            instances_by_wid = dict(zip(wids_to_fetch, fetched_results))
+            instances_by_wid = await _fetch_instances_by_workouts(list(sessions_by_wid.keys()), user_id)
 
     for w in workouts:
         wid = int(w.id)
@@ -1,5 +1,6 @@
 import os
 from datetime import datetime
+from typing import Any
 
 import structlog
 from backend_common.celery_utils import build_task_status_response, enqueue_task
@@ -216,6 +217,14 @@ async def debug_cleanup_user(
     }
 
 
+@router.post("/by-ids", response_model=list[dict[str, Any]])
+async def get_workouts_by_ids(
+    payload: schemas.workout.WorkoutsByIdsRequest,
+    workout_service: WorkoutService = Depends(get_workout_service),
+):
+    return await workout_service.get_workouts_by_ids(payload.ids, payload.fields)
+
+
 @router.post("/by-microcycles", response_model=list[schemas.workout.WorkoutListResponse])
 async def get_workouts_by_microcycles(
     microcycle_ids: list[int] = Body(..., embed=True),
@@ -393,6 +402,8 @@ async def applied_plan_mass_edit_sets(
             sets_modified=result.sets_modified,
         )
         return result
+    except HTTPException:
+        raise
     except Exception as e:
         logger.exception(
             "applied_plan_mass_edit_error",
@@ -165,6 +165,10 @@ class AppliedPlanMassEditResult(BaseModel):
         default_factory=list,
         description="Optional per-workout change summary (best effort)",
     )
+    skipped_sets: list[dict] = Field(
+        default_factory=list,
+        description="Sets not updated because the edited values are out of range (workout/instance/set ids, errors)",
+    )
 
 
 class AppliedPlanScheduleShiftCommand(BaseModel):
@@ -82,6 +82,13 @@ class WorkoutResponse(WorkoutBase):
         extra = "ignore"
 
 
+class WorkoutsByIdsRequest(BaseModel):
+    ids: list[int] = Field(..., max_length=1000)
+    fields: list[str] | None = Field(
+        None, description="Return only these WorkoutResponse fields (id is always included); all when omitted"
+    )
+
+
 class WorkoutSummaryResponse(BaseModel):
     id: int
     name: str
@@ -2,6 +2,7 @@ import logging
 import os
 
 import httpx
+from backend_common.http_client import borrow_http_client
 from fastapi import HTTPException
 
 logger = logging.getLogger(__name__)
@@ -16,7 +17,7 @@ async def get_exercise_by_id(exercise_id: int):
         base_url = "https://" + base_url
     url = f"{base_url}/exercises/{exercise_id}"
     try:
-        async with httpx.AsyncClient() as client:
+        async with borrow_http_client("exercises") as client:
             response = await client.get(url, timeout=5.0)
             response.raise_for_status()
             return response.json()
@@ -44,7 +45,7 @@ class PlansServiceRPC:
         try:
             url = f"{self.base_url}/plans/calendar-plans/{calendar_plan_id}"
             logger.debug(f"Fetching calendar plan from: {url}")
-            async with httpx.AsyncClient() as client:
+            async with borrow_http_client("plans") as client:
                 response = await client.get(url, timeout=30.0)
                 response.raise_for_status()
                 return response.json()
@@ -57,7 +58,7 @@ class PlansServiceRPC:
 
     async def validate_microcycle_ids(self, microcycle_ids: list[int]) -> list[int]:
         try:
-            async with httpx.AsyncClient() as client:
+            async with borrow_http_client("plans") as client:
                 response = await client.post(
                     f"{self.base_url}/microcycles/validate",
                     json={"microcycle_ids": microcycle_ids},
@@ -107,6 +108,28 @@ class RpeServiceRPC:
             "rounding_step": rounding_step,
             "rounding_mode": rounding_mode,
         }
+        return await self._post("/rpe/compute", payload, headers=headers, user_id=user_id)
+
+    async def compute_batch(
+        self,
+        items: list[dict],
+        *,
+        headers: dict[str, str] | None = None,
+        user_id: str | None = None,
+    ) -> list[dict]:
+        if not items:
+            return []
+        data = await self._post("/rpe/compute/batch", {"items": items}, headers=headers, user_id=user_id)
+        return data.get("results") or []
+
+    async def _post(
+        self,
+        path: str,
+        payload: dict,
+        *,
+        headers: dict[str, str] | None,
+        user_id: str | None,
+    ) -> dict:
         try:
             target_base = self.base_url
             if headers and headers.get("Authorization"):
@@ -124,9 +147,9 @@ class RpeServiceRPC:
 
             if user_id and not send_headers.get("X-User-Id"):
                 send_headers["X-User-Id"] = user_id
-            async with httpx.AsyncClient() as client:
+            async with borrow_http_client("rpe") as client:
                 resp = await client.post(
-                    f"{target_base}/rpe/compute",
+                    f"{target_base}{path}",
                     json=payload,
                     headers=send_headers,
                     timeout=10.0,
@@ -4,7 +4,7 @@ from datetime import UTC, datetime
 import httpx
 import structlog
 from backend_common.cache import CacheHelper, CacheMetrics
-from backend_common.http_client import ServiceClient
+from backend_common.http_client import ServiceClient, borrow_http_client
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
@@ -258,9 +258,9 @@ class SessionService:
         }
 
         timeout = httpx.Timeout(3.0, connect=1.0)
-        async with httpx.AsyncClient(timeout=timeout) as client:
+        async with borrow_http_client("social") as client:
             try:
-                await client.post(url, headers=headers, json=payload)
+                await client.post(url, headers=headers, json=payload, timeout=timeout)
             except httpx.RequestError as exc:
                 logger.warning(
                     "_post_social_workout_completion: request failed | workout_id=%s session_id=%s error=%s",
@@ -381,12 +381,15 @@ class SessionService:
         )
         return payload
 
-    async def _compute_macro_suggestion(self, applied_plan_id: int) -> dict | None:
+    async def _compute_macro_suggestion(self, applied_plan_id: int, workout_id: int | None = None) -> dict | None:
         base_url = os.getenv("PLANS_SERVICE_URL", "http://plans-service:8005").rstrip("/")
         url = f"{base_url}/plans/applied-plans/{applied_plan_id}/run-macros"
+        if workout_id is not None:
+            # Lets plans-service store this workout's metric snapshot before evaluating macros.
+            url = f"{url}?workout_id={workout_id}"
         headers = {"X-User-Id": self.user_id}
 
-        async with ServiceClient(timeout=6.0) as client:
+        async with ServiceClient(timeout=6.0, service="plans") as client:
             resp = await client.post(url, headers=headers, expected_status=200, applied_plan_id=applied_plan_id)
         if not resp.success:
             return None
@@ -495,6 +498,6 @@ class SessionService:
         base_url = base_url.rstrip("/")
         url = f"{base_url}/exercises/instances/workouts/{workout_id}/instances"
         headers = {"X-User-Id": self.user_id}
-        async with ServiceClient(timeout=5.0) as client:
+        async with ServiceClient(timeout=5.0, service="exercises") as client:
             data = await client.get_json(url, headers=headers, default=[], workout_id=workout_id)
         return data if isinstance(data, list) else []
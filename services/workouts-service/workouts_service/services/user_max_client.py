@@ -4,6 +4,7 @@ from collections.abc import Iterable
 from datetime import date
 
 import httpx
+from backend_common.http_client import borrow_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -31,9 +32,9 @@ class UserMaxClient:
             "UserMaxClient.push_entries payload=%s",
             payload,
         )
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with borrow_http_client("user-max") as client:
             try:
-                response = await client.post(url, json=payload, headers=headers)
+                response = await client.post(url, json=payload, headers=headers, timeout=self.timeout)
                 response.raise_for_status()
                 logger.info(
                     "UserMaxClient.push_entries: success | status=%d",
@@ -5,12 +5,14 @@ from datetime import UTC, datetime, timedelta
 from typing import Any
 
 import httpx
+import numpy as np
 import pytz
 import structlog
 from backend_common.cache import CacheHelper, CacheMetrics
-from backend_common.http_client import ServiceClient
+from backend_common.http_client import INSTANCES_BY_WORKOUTS_BATCH_SIZE, ServiceClient, borrow_http_client
+from backend_common.rpe_grid import as_float_array, get_rpe_grid, to_python
 from fastapi import HTTPException
-from sqlalchemy import or_, select
+from sqlalchemy import insert, or_, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
@@ -38,6 +40,30 @@ from ..workout_calculation import WorkoutCalculator
 from .rpc_client import PlansServiceRPC, RpeServiceRPC
 
 logger = structlog.get_logger(__name__)
+# Mirrors ExerciseSetBatchUpdateRequest.items max_length in exercises-service.
+SETS_BATCH_UPDATE_SIZE = 5000
+
+
+def _set_patch_violations(patch: dict[str, Any]) -> list[str]:
+    """Fields of ``patch`` that exercises-service's ``ExerciseSetUpdate`` would reject; empty when it is valid."""
+
+    def integral(value: Any) -> bool:
+        return isinstance(value, int | float) and float(value).is_integer()
+
+    violations: list[str] = []
+    volume = patch.get("volume")
+    if volume is not None and (not integral(volume) or volume < 1):
+        violations.append("volume must be an integer >= 1")
+    reps = patch.get("reps")
+    if reps is not None and (not integral(reps) or reps < 0):
+        violations.append("reps must be an integer >= 0")
+    weight = patch.get("weight")
+    if weight is not None and weight < 0:
+        violations.append("weight must be >= 0")
+    effort = patch.get("effort")
+    if effort is not None and (not integral(effort) or not 4 <= effort <= 10):
+        violations.append("effort must be an integer between 4 and 10")
+    return violations
 
 
 class WorkoutService:
@@ -149,22 +175,9 @@ class WorkoutService:
 
         return WorkoutResponse.model_validate(workout_dict)
 
-    async def get_workout(self, workout_id: int) -> schemas.workout.WorkoutResponse:
-        cached = await self._get_cached_workout(workout_id)
-        if cached:
-            return schemas.workout.WorkoutResponse.model_validate(cached)
-
-        result = await self.db.execute(
-            select(models.Workout)
-            .options(selectinload(models.Workout.exercises).selectinload(models.WorkoutExercise.sets))
-            .where(models.Workout.id == workout_id)
-            .where(models.Workout.user_id == self.user_id)
-        )
-        workout = result.scalars().first()
-        if not workout:
-            raise WorkoutNotFoundException(workout_id)
-
-        workout_dict = {
+    @staticmethod
+    def _workout_detail_dict(workout: models.Workout) -> dict:
+        return {
             "id": workout.id,
             "name": workout.name,
             "applied_plan_id": workout.applied_plan_id,
@@ -199,9 +212,60 @@ class WorkoutService:
             ],
         }
 
+    async def get_workout(self, workout_id: int) -> schemas.workout.WorkoutResponse:
+        cached = await self._get_cached_workout(workout_id)
+        if cached:
+            return schemas.workout.WorkoutResponse.model_validate(cached)
+
+        result = await self.db.execute(
+            select(models.Workout)
+            .options(selectinload(models.Workout.exercises).selectinload(models.WorkoutExercise.sets))
+            .where(models.Workout.id == workout_id)
+            .where(models.Workout.user_id == self.user_id)
+        )
+        workout = result.scalars().first()
+        if not workout:
+            raise WorkoutNotFoundException(workout_id)
+
+        workout_dict = self._workout_detail_dict(workout)
         await self._set_cached_workout(workout_id, workout_dict)
         return schemas.workout.WorkoutResponse.model_validate(workout_dict)
 
+    async def get_workouts_by_ids(self, workout_ids: list[int], fields: list[str] | None = None) -> list[dict]:
+        if fields:
+            unknown = set(fields) - set(WorkoutResponse.model_fields)
+            if unknown:
+                raise HTTPException(status_code=400, detail=f"Unknown workout fields: {', '.join(sorted(unknown))}")
+
+        workout_ids = list(dict.fromkeys(workout_ids))
+        cached = await self._cache.get_many([workout_detail_key(self.user_id, wid) for wid in workout_ids])
+        by_id: dict[int, dict] = {
+            wid: payload for wid, payload in zip(workout_ids, cached, strict=True) if payload is not None
+        }
+
+        missing = [wid for wid in workout_ids if wid not in by_id]
+        if missing:
+            result = await self.db.execute(
+                select(models.Workout)
+                .options(selectinload(models.Workout.exercises).selectinload(models.WorkoutExercise.sets))
+                .where(models.Workout.id.in_(missing))
+                .where(models.Workout.user_id == self.user_id)
+            )
+            fetched = {
+                workout.id: self._serialize_for_cache(self._workout_detail_dict(workout))
+                for workout in result.scalars().all()
+            }
+            await self._cache.set_many(
+                {workout_detail_key(self.user_id, wid): payload for wid, payload in fetched.items()}
+            )
+            by_id.update(fetched)
+
+        details = [by_id[wid] for wid in workout_ids if wid in by_id]
+        if not fields:
+            return details
+        projected = ["id", *(f for f in fields if f != "id")]
+        return [{field: detail.get(field) for field in projected} for detail in details]
+
     async def list_workouts(
         self,
         skip: int = 0,
@@ -441,6 +505,145 @@ class WorkoutService:
             working_weight=working_weight,
         )
 
+    async def _resolve_generated_sets(
+        self,
+        request: WorkoutGenerationRequest,
+        user_max_by_ex: dict[int, dict],
+    ) -> dict[tuple[int, int, int], list]:
+        compute_weights = bool(getattr(request, "compute_weights", False))
+        resolved: dict[tuple[int, int, int], list] = {}
+        weight_items: list[dict] = []
+        weight_keys: list[tuple[int, int, int]] = []
+
+        rows: list[tuple[tuple[int, int, int], int | None, Any]] = []
+        for w_idx, workout_item in enumerate(request.workouts):
+            for ex_idx, exercise in enumerate(workout_item.exercises):
+                um = user_max_by_ex.get(int(exercise.exercise_id))
+                user_max_id = int(um.get("id")) if um and um.get("id") is not None else None
+                for set_idx, set_data in enumerate(exercise.sets):
+                    rows.append(((w_idx, ex_idx, set_idx), user_max_id, set_data))
+
+        # Sets with exactly one of intensity/effort/volume missing are filled in one vectorized pass.
+        intensity = as_float_array(set_data.intensity for _, _, set_data in rows)
+        effort = as_float_array(set_data.effort for _, _, set_data in rows)
+        volume = as_float_array(set_data.volume for _, _, set_data in rows)
+        need_core_fill = (np.isnan(intensity) + np.isnan(effort) + np.isnan(volume)) == 1
+        filled_i, filled_e, filled_v = get_rpe_grid().fill(intensity, effort, volume)
+
+        for k, (key, user_max_id, set_data) in enumerate(rows):
+            if need_core_fill[k]:
+                values = [to_python(filled_i[k]), to_python(filled_e[k]), to_python(filled_v[k])]
+            else:
+                values = [set_data.intensity, set_data.effort, set_data.volume]
+            working_weight = set_data.working_weight
+            resolved[key] = [*values, working_weight]
+            if compute_weights and working_weight is None:
+                weight_keys.append(key)
+                weight_items.append(
+                    {
+                        "intensity": values[0],
+                        "effort": values[1],
+                        "volume": values[2],
+                        "user_max_id": user_max_id,
+                        "rounding_step": getattr(request, "rounding_step", 2.5),
+                        "rounding_mode": getattr(request, "rounding_mode", "nearest"),
+                    }
+                )
+
+        if self.rpe_rpc and weight_items:
+            try:
+                results = await self.rpe_rpc.compute_batch(
+                    weight_items,
+                    headers=self.request_headers,
+                    user_id=self.user_id,
+                )
+            except Exception:
+                logger.warning(
+                    "[WORKOUT_SERVICE] RPE batch compute failed, proceeding with provided values",
+                    exc_info=True,
+                )
+                results = []
+            for item in results:
+                compute_res = item.get("result")
+                index = item.get("index")
+                if compute_res is None or index is None or not 0 <= index < len(weight_keys):
+                    continue
+                values = resolved[weight_keys[index]]
+                values[0] = compute_res.get("intensity", values[0])
+                values[1] = compute_res.get("effort", values[1])
+                values[2] = compute_res.get("volume", values[2])
+                ww = compute_res.get("weight")
+                if ww is not None:
+                    values[3] = ww
+
+        return resolved
+
+    async def _insert_returning_ids(self, model: type, rows: list[dict]) -> list[int]:
+        if not rows:
+            return []
+        result = await self.db.execute(insert(model).returning(model.id, sort_by_parameter_order=True), rows)
+        return list(result.scalars().all())
+
+    async def _bulk_insert_generated(
+        self,
+        request: WorkoutGenerationRequest,
+        resolved_sets: dict[tuple[int, int, int], list],
+    ) -> list[int]:
+        """Insert generated workouts, their exercises and sets with one multi-row INSERT per table."""
+        workout_rows: list[dict] = []
+        for workout_item in request.workouts:
+            scheduled_for = workout_item.scheduled_for
+            if isinstance(scheduled_for, str):
+                scheduled_for = datetime.fromisoformat(scheduled_for)
+            workout_rows.append(
+                {
+                    "name": workout_item.name,
+                    "scheduled_for": scheduled_for,
+                    "plan_order_index": workout_item.plan_order_index,
+                    "applied_plan_id": request.applied_plan_id,
+                    "workout_type": "generated",
+                    "user_id": self.user_id,
+                }
+            )
+        workout_ids = await self._insert_returning_ids(models.Workout, workout_rows)
+
+        exercise_rows: list[dict] = []
+        exercise_keys: list[tuple[int, int]] = []
+        for idx, workout_item in enumerate(request.workouts):
+            for ex_idx, exercise in enumerate(workout_item.exercises):
+                exercise_rows.append(
+                    {
+                        "workout_id": workout_ids[idx],
+                        "exercise_id": exercise.exercise_id,
+                        "user_id": self.user_id,
+                    }
+                )
+                exercise_keys.append((idx, ex_idx))
+        exercise_ids = await self._insert_returning_ids(models.WorkoutExercise, exercise_rows)
+
+        set_rows: list[dict] = []
+        for (idx, ex_idx), workout_exercise_id in zip(exercise_keys, exercise_ids, strict=True):
+            for set_idx in range(len(request.workouts[idx].exercises[ex_idx].sets)):
+                intensity, effort, volume, working_weight = resolved_sets[(idx, ex_idx, set_idx)]
+                set_rows.append(
+                    {
+                        "exercise_id": workout_exercise_id,
+                        "intensity": intensity,
+                        "effort": effort,
+                        "volume": volume,
+                        "working_weight": working_weight,
+                    }
+                )
+        await self._insert_returning_ids(models.WorkoutSet, set_rows)
+
+        logger.debug(
+            "[WORKOUT_SERVICE] Bulk inserted %s workouts, %s exercises, %s sets",
+            len(workout_ids),
+            len(exercise_ids),
+            len(set_rows),
+        )
+        return workout_ids
+
     async def generate_workouts(self, request: WorkoutGenerationRequest) -> tuple[list[int], int, int]:
         workout_ids: list[int] = []
 
@@ -465,93 +668,8 @@ class WorkoutService:
                     user_max_by_ex[int(um.get("exercise_id"))] = um
                 except (TypeError, ValueError):
                     continue
-            for idx, workout_item in enumerate(request.workouts):
-                scheduled_for = workout_item.scheduled_for
-                if isinstance(scheduled_for, str):
-                    scheduled_for = datetime.fromisoformat(scheduled_for)
-
-                logger.debug(
-                    "[WORKOUT_SERVICE] Creating workout %s/%s: %s",
-                    idx + 1,
-                    len(request.workouts),
-                    workout_item.name,
-                )
-
-                workout = models.Workout(
-                    name=workout_item.name,
-                    scheduled_for=scheduled_for,
-                    plan_order_index=workout_item.plan_order_index,
-                    applied_plan_id=request.applied_plan_id,
-                    workout_type="generated",
-                    user_id=self.user_id,
-                )
-                self.db.add(workout)
-                await self.db.flush()
-                logger.debug(f"[WORKOUT_SERVICE] Created workout id={workout.id}")
-
-                for ex_idx, exercise in enumerate(workout_item.exercises):
-                    workout_exercise = models.WorkoutExercise(
-                        workout_id=workout.id,
-                        exercise_id=exercise.exercise_id,
-                        user_id=self.user_id,
-                    )
-                    self.db.add(workout_exercise)
-                    await self.db.flush()
-                    logger.debug(
-                        "[WORKOUT_SERVICE] Created workout_exercise id=%s for exercise_id=%s",
-                        workout_exercise.id,
-                        exercise.exercise_id,
-                    )
-
-                    for set_idx, set_data in enumerate(exercise.sets):
-                        intensity = set_data.intensity
-                        effort = set_data.effort
-                        volume = set_data.volume
-                        working_weight = set_data.working_weight
-
-                        need_core_fill = sum(v is not None for v in (intensity, effort, volume)) >= 2 and (
-                            intensity is None or effort is None or volume is None
-                        )
-                        need_weight = bool(getattr(request, "compute_weights", False)) and (working_weight is None)
-
-                        if self.rpe_rpc and (need_core_fill or need_weight):
-                            try:
-                                um = user_max_by_ex.get(int(exercise.exercise_id))
-                                user_max_id = int(um.get("id")) if um and um.get("id") is not None else None
-                                compute_res = await self.rpe_rpc.compute(
-                                    intensity=intensity,
-                                    effort=effort,
-                                    volume=volume,
-                                    user_max_id=user_max_id,
-                                    rounding_step=getattr(request, "rounding_step", 2.5),
-                                    rounding_mode=getattr(request, "rounding_mode", "nearest"),
-                                    headers=self.request_headers,
-                                    user_id=self.user_id,
-                                )
-                                intensity = compute_res.get("intensity", intensity)
-                                effort = compute_res.get("effort", effort)
-                                volume = compute_res.get("volume", volume)
-                                if need_weight:
-                                    ww = compute_res.get("weight")
-                                    if ww is not None:
-                                        working_weight = ww
-                            except Exception:
-                                logger.warning(
-                                    "[WORKOUT_SERVICE] RPE compute failed, proceeding with provided values",
-                                    exc_info=True,
-                                )
-
-                        workout_set = models.WorkoutSet(
-                            exercise_id=workout_exercise.id,
-                            intensity=intensity,
-                            effort=effort,
-                            volume=volume,
-                            working_weight=working_weight,
-                        )
-                        self.db.add(workout_set)
-                        await self.db.flush()
-
-                workout_ids.append(workout.id)
+            resolved_sets = await self._resolve_generated_sets(request, user_max_by_ex)
+            workout_ids = await self._bulk_insert_generated(request, resolved_sets)
 
             logger.info(
                 "[WORKOUT_SERVICE] Committing transaction with %s workouts",
@@ -1089,7 +1207,7 @@ class WorkoutService:
             if spec.order is not None:
                 body["order"] = spec.order
 
-            async with ServiceClient(timeout=5.0) as client:
+            async with ServiceClient(timeout=5.0, service="exercises") as client:
                 resp = await client.post(
                     url,
                     headers=headers,
@@ -1101,17 +1219,29 @@ class WorkoutService:
                 return resp.data
             return None
 
-        async def fetch_instances_for_workout(workout_id: int) -> list[dict]:
+        async def fetch_instances_for_workouts(workout_ids: list[int]) -> dict[int, list[dict]]:
             base_url = os.getenv("EXERCISES_SERVICE_URL")
             if not base_url:
                 logger.warning("EXERCISES_SERVICE_URL is not set; cannot fetch instances")
-                return []
+                return {}
             base_url = base_url.rstrip("/")
-            url = f"{base_url}/exercises/instances/workouts/{workout_id}/instances"
+            url = f"{base_url}/exercises/instances/by-workouts"
             headers = {"X-User-Id": self.user_id}
-            async with ServiceClient(timeout=5.0) as client:
-                data = await client.get_json(url, headers=headers, default=[], workout_id=workout_id)
-            return data if isinstance(data, list) else []
+            out: dict[int, list[dict]] = {}
+            async with ServiceClient(timeout=10.0, service="exercises") as client:
+                for start in range(0, len(workout_ids), INSTANCES_BY_WORKOUTS_BATCH_SIZE):
+                    batch = workout_ids[start : start + INSTANCES_BY_WORKOUTS_BATCH_SIZE]
+                    resp = await client.post(
+                        url,
+                        headers=headers,
+                        json={"workout_ids": batch},
+                        expected_status=200,
+                        workouts_count=len(batch),
+                    )
+                    data = resp.json_or({})
+                    if isinstance(data, dict):
+                        out.update({int(wid): items for wid, items in data.items() if isinstance(items, list)})
+            return out
 
         async def replace_exercise_instance(inst: dict, new_ex_def_id: int, new_ex_name: str | None = None) -> bool:
             instance_id = inst.get("id")
@@ -1155,8 +1285,8 @@ class WorkoutService:
                 body["exercise_name"] = new_ex_name
 
             try:
-                async with httpx.AsyncClient(timeout=5.0) as client:
-                    res = await client.put(url, headers=headers, json=body)
+                async with borrow_http_client("exercises") as client:
+                    res = await client.put(url, headers=headers, json=body, timeout=5.0)
                     if res.status_code in (200, 201):
                         inst["exercise_list_id"] = new_ex_def_id
                         return True
@@ -1173,35 +1303,50 @@ class WorkoutService:
                 )
             return False
 
-        async def update_set(instance_id: int, set_id: int, payload: dict) -> bool:
-            if not payload:
-                return False
+        async def update_sets_batch(items: list[dict]) -> list[tuple[int, int]]:
+            if not items:
+                return []
             base_url = os.getenv("EXERCISES_SERVICE_URL")
             if not base_url:
-                logger.warning("EXERCISES_SERVICE_URL is not set; cannot update set")
-                return False
+                logger.warning("EXERCISES_SERVICE_URL is not set; cannot update sets")
+                raise HTTPException(status_code=503, detail="Exercises service URL not configured")
             base_url = base_url.rstrip("/")
-            url = f"{base_url}/exercises/instances/{instance_id}/sets/{set_id}"
+            url = f"{base_url}/exercises/instances/sets/batch-update"
             headers = {"X-User-Id": self.user_id}
-            try:
-                async with httpx.AsyncClient(timeout=5.0) as client:
-                    res = await client.put(url, headers=headers, json=payload)
-                    if res.status_code in (200, 201):
-                        return True
-                    logger.warning(
-                        "applied_mass_edit_update_set_non_2xx",
-                        status_code=res.status_code,
-                        body=res.text,
-                        instance_id=instance_id,
-                        set_id=set_id,
+            updated: list[tuple[int, int]] = []
+            async with ServiceClient(timeout=15.0, service="exercises") as client:
+                for start in range(0, len(items), SETS_BATCH_UPDATE_SIZE):
+                    batch = items[start : start + SETS_BATCH_UPDATE_SIZE]
+                    resp = await client.post(
+                        url,
+                        headers=headers,
+                        json={"items": batch},
+                        expected_status=200,
+                        sets_count=len(batch),
                     )
-            except httpx.HTTPError:
-                logger.exception(
-                    "applied_mass_edit_update_set_failed",
-                    instance_id=instance_id,
-                    set_id=set_id,
-                )
-            return False
+                    data = resp.json_or(None)
+                    if not resp.success or not isinstance(data, dict):
+                        logger.error(
+                            "applied_mass_edit_update_sets_failed",
+                            applied_plan_id=applied_plan_id,
+                            status_code=resp.status_code,
+                            error=resp.error,
+                            sets_sent=start,
+                            sets_updated=len(updated),
+                            sets_total=len(items),
+                        )
+                        raise HTTPException(
+                            status_code=502,
+                            detail=(
+                                f"exercises-service rejected set updates {start}-{start + len(batch)} "
+                                f"of {len(items)}; {len(updated)} set(s) were already updated"
+                            ),
+                        )
+                    for ref in data.get("updated") or []:
+                        if not isinstance(ref, dict) or ref.get("instance_id") is None or ref.get("set_id") is None:
+                            continue
+                        updated.append((int(ref["instance_id"]), int(ref["set_id"])))
+            return updated
 
         def _as_float(value: Any) -> float | None:
             try:
@@ -1369,9 +1514,13 @@ class WorkoutService:
         sets_matched = 0
         sets_modified = 0
         details: list[dict] = []
+        pending_set_updates: list[dict] = []
+        workout_by_instance: dict[int, int] = {}
+        skipped_sets: list[dict] = []
 
+        instances_by_workout = await fetch_instances_for_workouts([int(w.id) for w in workouts])
         for w in workouts:
-            instances = await fetch_instances_for_workout(int(w.id))
+            instances = instances_by_workout.get(int(w.id), [])
 
             for inst in instances:
                 if not isinstance(inst, dict):
@@ -1396,7 +1545,6 @@ class WorkoutService:
                 sets = inst.get("sets") or []
 
                 instance_sets_matched = 0
-                instance_sets_modified = 0
 
                 for s in sets:
                     if not isinstance(s, dict):
@@ -1411,13 +1559,24 @@ class WorkoutService:
                         payload = build_set_update_payload(s)
                         if not payload:
                             continue
-                        if await update_set(instance_id, set_id, payload):
-                            instance_sets_modified += 1
+                        violations = _set_patch_violations(payload)
+                        if violations:
+                            # Sent as-is these would fail the whole batch; report them instead of coercing the edit.
+                            skipped_sets.append(
+                                {
+                                    "workout_id": int(w.id),
+                                    "instance_id": instance_id,
+                                    "set_id": set_id,
+                                    "errors": violations,
+                                }
+                            )
+                            continue
+                        pending_set_updates.append({"instance_id": instance_id, "set_id": set_id, "patch": payload})
+                        workout_by_instance[instance_id] = int(w.id)
 
                 if instance_sets_matched:
                     workout_instances_matched += 1
                     workout_sets_matched += instance_sets_matched
-                    workout_sets_modified += instance_sets_modified
 
                 if actions.replace_exercise_definition_id_to is not None:
                     target_ids = flt.exercise_definition_ids or []
@@ -1492,6 +1651,15 @@ class WorkoutService:
                     }
                 )
 
+        if pending_set_updates:
+            details_by_workout = {detail["workout_id"]: detail for detail in details}
+            for instance_id, _set_id in await update_sets_batch(pending_set_updates):
+                detail = details_by_workout.get(workout_by_instance.get(instance_id))
+                if detail is None:
+                    continue
+                detail["sets_modified"] += 1
+                sets_modified += 1
+
         return schemas.AppliedPlanMassEditResult(
             mode=cmd.mode,
             workouts_matched=workouts_matched,
@@ -1499,6 +1667,7 @@ class WorkoutService:
             sets_matched=sets_matched,
             sets_modified=sets_modified,
             details=details,
+            skipped_sets=skipped_sets,
         )
 
     async def get_plan_details_with_exercises(
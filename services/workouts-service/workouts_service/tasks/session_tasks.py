@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-import asyncio
 import os
 from datetime import UTC, datetime
 from typing import Any
 
-import httpx
+from backend_common.celery_utils import run_async
+from backend_common.http_client import borrow_http_client
 from celery import shared_task
 from celery.utils.log import get_task_logger
 from sqlalchemy import select
@@ -20,7 +20,7 @@ logger = get_task_logger(__name__)
 
 
 def _run_async(coro):
-    return asyncio.run(coro)
+    return run_async(coro)
 
 
 async def _finish_session_postprocess_async(session_id: int, user_id: str) -> dict[str, Any]:
@@ -80,7 +80,7 @@ async def _finish_session_postprocess_async(session_id: int, user_id: str) -> di
         suggestion: dict[str, Any] | None = None
         if applied_plan_id:
             try:
-                suggestion = await service._compute_macro_suggestion(applied_plan_id)
+                suggestion = await service._compute_macro_suggestion(applied_plan_id, workout_id)
                 session.macro_suggestion = suggestion
                 await db.commit()
                 await db.refresh(session)
@@ -91,8 +91,8 @@ async def _finish_session_postprocess_async(session_id: int, user_id: str) -> di
                     base_url = base_url.rstrip("/")
                     adv_url = f"{base_url}/plans/applied-plans/{applied_plan_id}/advance-index?by=1"
                     headers = {"X-User-Id": user_id}
-                    async with httpx.AsyncClient(timeout=4.0) as client:
-                        resp = await client.post(adv_url, headers=headers)
+                    async with borrow_http_client("plans") as client:
+                        resp = await client.post(adv_url, headers=headers, timeout=4.0)
                         if resp.status_code >= 400:
                             logger.warning(
                                 "finish_session_postprocess_advance_index_non_2xx",
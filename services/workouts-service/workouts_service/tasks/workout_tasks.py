@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-import asyncio
 from datetime import datetime
 from typing import Any
 
+from backend_common.celery_utils import run_async
 from celery import shared_task
 from celery.utils.log import get_task_logger
 
@@ -17,7 +17,7 @@ logger = get_task_logger(__name__)
 
 
 def _run_async(coro):
-    return asyncio.run(coro)
+    return run_async(coro)
 
 
 def _parse_baseline_date(value: str | None) -> datetime | None:
@@ -1,7 +1,7 @@
 import logging
 import os
 
-import httpx
+from backend_common.http_client import borrow_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -44,12 +44,12 @@ class WorkoutCalculator:
             headers["Authorization"] = f"Bearer {svc_token}"
         bases = await self._get_base_candidates()
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with borrow_http_client("user-max") as client:
             for base in bases:
                 try:
                     url = f"{base}/user-max/bulk"
                     payload = [{"exercise_id": ex_id} for ex_id in exercise_ids]
-                    response = await client.post(url, json=payload, headers=headers)
+                    response = await client.post(url, json=payload, headers=headers, timeout=10.0)
                     response.raise_for_status()
                     data = response.json()
                     if isinstance(data, list) and data:
@@ -82,14 +82,14 @@ class WorkoutCalculator:
         if gw_env:
             bases.append(gw_env.rstrip("/"))
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with borrow_http_client("exercises") as client:
             for ex_id in exercise_ids:
                 found = False
                 for base in bases:
                     try:
                         url = f"{base}/exercises/definitions/{ex_id}"
                         headers = {"Content-Type": "application/json"}
-                        response = await client.get(url, headers=headers)
+                        response = await client.get(url, headers=headers, timeout=10.0)
                         if response.status_code == 200:
                             found = True
                             break
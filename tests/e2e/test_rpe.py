@@ -0,0 +1,29 @@
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_rpe_compute_batch_returns_per_item_results(base_url, http_client, internal_secret_headers):
+    payload = {
+        "items": [
+            {"intensity": 80, "effort": 8},
+            {"volume": 6, "effort": 8},
+            {"intensity": 72.5, "effort": 8},
+        ]
+    }
+
+    resp = await http_client.post(
+        f"{base_url}/api/v1/rpe/compute/batch",
+        headers=internal_secret_headers,
+        json=payload,
+    )
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+    assert [r["index"] for r in results] == [0, 1, 2]
+
+    assert results[0]["error"] is None
+    assert isinstance(results[0]["result"]["volume"], int)
+    assert results[1]["error"] is None
+    assert isinstance(results[1]["result"]["intensity"], int)
+
+    assert results[2]["result"] is None
+    assert results[2]["error"]["error"] == "VALIDATION_ERROR"